@@ -0,0 +1,52 @@
+"""initial schema: bookings
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'bookings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('customer_name', sa.String(), nullable=False),
+        sa.Column('customer_email', sa.String(), nullable=False),
+        sa.Column('customer_phone', sa.String(), nullable=False),
+        sa.Column('from_district', sa.String(), nullable=False),
+        sa.Column('to_district', sa.String(), nullable=False),
+        sa.Column('provider', sa.String(), nullable=False),
+        sa.Column('travel_date', sa.Date(), nullable=False),
+        sa.Column('num_seats', sa.Integer(), nullable=False),
+        sa.Column('dropping_point', sa.String(), nullable=True),
+        sa.Column('total_fare', sa.Integer(), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'CONFIRMED', 'CANCELLED', name='bookingstatus'), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_bookings_customer_email'), 'bookings', ['customer_email'], unique=False)
+    op.create_index(op.f('ix_bookings_customer_phone'), 'bookings', ['customer_phone'], unique=False)
+    op.create_index(op.f('ix_bookings_id'), 'bookings', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_bookings_id'), table_name='bookings')
+    op.drop_index(op.f('ix_bookings_customer_phone'), table_name='bookings')
+    op.drop_index(op.f('ix_bookings_customer_email'), table_name='bookings')
+    op.drop_table('bookings')
+    sa.Enum(name='bookingstatus').drop(op.get_bind(), checkfirst=True)
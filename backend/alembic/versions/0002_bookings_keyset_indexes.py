@@ -0,0 +1,42 @@
+"""composite indexes for keyset pagination of bookings
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The composite indexes serve both the equality filter and the
+    # (created_at DESC, id DESC) keyset sort, so the single-column ones go away
+    op.create_index(
+        'ix_bookings_email_created_id', 'bookings',
+        ['customer_email', sa.text('created_at DESC'), sa.text('id DESC')], unique=False
+    )
+    op.create_index(
+        'ix_bookings_phone_created_id', 'bookings',
+        ['customer_phone', sa.text('created_at DESC'), sa.text('id DESC')], unique=False
+    )
+    op.drop_index('ix_bookings_customer_email', table_name='bookings')
+    op.drop_index('ix_bookings_customer_phone', table_name='bookings')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_bookings_customer_phone', 'bookings', ['customer_phone'], unique=False)
+    op.create_index('ix_bookings_customer_email', 'bookings', ['customer_email'], unique=False)
+    op.drop_index('ix_bookings_phone_created_id', table_name='bookings')
+    op.drop_index('ix_bookings_email_created_id', table_name='bookings')
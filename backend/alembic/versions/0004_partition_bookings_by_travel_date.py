@@ -0,0 +1,135 @@
+"""range-partition bookings by travel_date (PostgreSQL)
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Monthly partitions created ahead of the current month during the migration;
+# afterwards scripts/manage_partitions.py keeps the window rolling
+MONTHS_AHEAD = 3
+
+COLUMNS = (
+    "id, customer_name, customer_email, customer_phone, from_district, to_district, "
+    "provider, travel_date, num_seats, dropping_point, total_fare, status, created_at, updated_at"
+)
+
+
+def _add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def _create_indexes(table: str, prefix: str) -> None:
+    op.execute(f"CREATE INDEX {prefix}_id ON {table} (id)")
+    op.execute(f"CREATE INDEX {prefix}_email_created_id ON {table} (customer_email, created_at DESC, id DESC)")
+    op.execute(f"CREATE INDEX {prefix}_phone_created_id ON {table} (customer_phone, created_at DESC, id DESC)")
+
+
+def _rename_indexes(old_prefix: str, new_prefix: str) -> None:
+    for suffix in ("id", "email_created_id", "phone_created_id"):
+        op.execute(f"ALTER INDEX {old_prefix}_{suffix} RENAME TO {new_prefix}_{suffix}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        # Partitioning is PostgreSQL-only; other databases keep the plain table
+        return
+
+    op.execute("ALTER TABLE bookings RENAME TO bookings_unpartitioned")
+    op.execute("ALTER TABLE bookings_unpartitioned RENAME CONSTRAINT bookings_pkey TO bookings_unpartitioned_pkey")
+    _rename_indexes("ix_bookings", "ix_bookings_unpartitioned")
+    op.execute("ALTER SEQUENCE bookings_id_seq OWNED BY NONE")
+
+    # Partitioned tables need the partition key in every unique constraint
+    op.execute("""
+        CREATE TABLE bookings (
+            id INTEGER NOT NULL DEFAULT nextval('bookings_id_seq'),
+            customer_name VARCHAR NOT NULL,
+            customer_email VARCHAR NOT NULL,
+            customer_phone VARCHAR NOT NULL,
+            from_district VARCHAR NOT NULL,
+            to_district VARCHAR NOT NULL,
+            provider VARCHAR NOT NULL,
+            travel_date DATE NOT NULL,
+            num_seats INTEGER NOT NULL,
+            dropping_point VARCHAR,
+            total_fare INTEGER NOT NULL,
+            status bookingstatus,
+            created_at TIMESTAMP WITHOUT TIME ZONE,
+            updated_at TIMESTAMP WITHOUT TIME ZONE,
+            CONSTRAINT bookings_pkey PRIMARY KEY (id, travel_date)
+        ) PARTITION BY RANGE (travel_date)
+    """)
+    op.execute("ALTER SEQUENCE bookings_id_seq OWNED BY bookings.id")
+    op.execute("CREATE TABLE bookings_default PARTITION OF bookings DEFAULT")
+
+    # Monthly partitions from the oldest existing booking through MONTHS_AHEAD
+    oldest = op.get_bind().execute(sa.text("SELECT min(travel_date) FROM bookings_unpartitioned")).scalar()
+    today = date.today()
+    month = _add_months(min(oldest or today, today), 0)
+    last = _add_months(today, MONTHS_AHEAD + 1)
+    while month < last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE bookings_p{month:%Y_%m} PARTITION OF bookings "
+            f"FOR VALUES FROM ('{month}') TO ('{upper}')"
+        )
+        month = upper
+
+    # Indexes on the parent cascade to every current and future partition
+    _create_indexes("bookings", "ix_bookings")
+
+    op.execute(f"INSERT INTO bookings ({COLUMNS}) SELECT {COLUMNS} FROM bookings_unpartitioned")
+    op.execute("DROP TABLE bookings_unpartitioned")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE bookings RENAME TO bookings_partitioned")
+    op.execute("ALTER TABLE bookings_partitioned RENAME CONSTRAINT bookings_pkey TO bookings_partitioned_pkey")
+    _rename_indexes("ix_bookings", "ix_bookings_partitioned")
+    op.execute("ALTER SEQUENCE bookings_id_seq OWNED BY NONE")
+
+    op.execute("""
+        CREATE TABLE bookings (
+            id INTEGER NOT NULL DEFAULT nextval('bookings_id_seq'),
+            customer_name VARCHAR NOT NULL,
+            customer_email VARCHAR NOT NULL,
+            customer_phone VARCHAR NOT NULL,
+            from_district VARCHAR NOT NULL,
+            to_district VARCHAR NOT NULL,
+            provider VARCHAR NOT NULL,
+            travel_date DATE NOT NULL,
+            num_seats INTEGER NOT NULL,
+            dropping_point VARCHAR,
+            total_fare INTEGER NOT NULL,
+            status bookingstatus,
+            created_at TIMESTAMP WITHOUT TIME ZONE,
+            updated_at TIMESTAMP WITHOUT TIME ZONE,
+            CONSTRAINT bookings_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute("ALTER SEQUENCE bookings_id_seq OWNED BY bookings.id")
+    _create_indexes("bookings", "ix_bookings")
+
+    op.execute(f"INSERT INTO bookings ({COLUMNS}) SELECT {COLUMNS} FROM bookings_partitioned")
+    # Dropping the parent drops every attached partition with it
+    op.execute("DROP TABLE bookings_partitioned")
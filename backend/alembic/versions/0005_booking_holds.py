@@ -0,0 +1,35 @@
+"""pending booking holds: expires_at and partial index
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('bookings', sa.Column('expires_at', sa.DateTime(), nullable=True))
+    # Only pending rows are indexed, so the sweeper's cost tracks open holds, not table size
+    op.create_index(
+        'ix_bookings_pending_expires_at', 'bookings', ['expires_at'], unique=False,
+        postgresql_where=sa.text("status = 'PENDING'"),
+        sqlite_where=sa.text("status = 'PENDING'")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bookings_pending_expires_at', table_name='bookings')
+    op.drop_column('bookings', 'expires_at')
@@ -0,0 +1,56 @@
+"""route occupancy aggregates
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'route_occupancy',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('provider', sa.String(), nullable=False),
+        sa.Column('from_district', sa.String(), nullable=False),
+        sa.Column('to_district', sa.String(), nullable=False),
+        sa.Column('travel_date', sa.Date(), nullable=False),
+        sa.Column('seats_sold', sa.Integer(), nullable=False),
+        sa.Column('bookings_count', sa.Integer(), nullable=False),
+        sa.Column('revenue', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('provider', 'from_district', 'to_district', 'travel_date', name='uq_route_occupancy_trip')
+    )
+    op.create_index(op.f('ix_route_occupancy_id'), 'route_occupancy', ['id'], unique=False)
+    op.create_index(op.f('ix_route_occupancy_travel_date'), 'route_occupancy', ['travel_date'], unique=False)
+
+    # Backfill from existing confirmed bookings; later changes are incremental
+    op.execute("""
+        INSERT INTO route_occupancy
+            (provider, from_district, to_district, travel_date, seats_sold, bookings_count, revenue, updated_at)
+        SELECT provider, from_district, to_district, travel_date,
+               SUM(num_seats), COUNT(*), SUM(total_fare), CURRENT_TIMESTAMP
+        FROM bookings
+        WHERE status = 'CONFIRMED'
+        GROUP BY provider, from_district, to_district, travel_date
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_route_occupancy_travel_date'), table_name='route_occupancy')
+    op.drop_index(op.f('ix_route_occupancy_id'), table_name='route_occupancy')
+    op.drop_table('route_occupancy')
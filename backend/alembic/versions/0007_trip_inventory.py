@@ -0,0 +1,62 @@
+"""per-trip seat inventory
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if sa.inspect(op.get_bind()).has_table('trip_inventory'):
+        # Created by an earlier draft of revision 0001; its counters are already live
+        return
+
+    op.create_table(
+        'trip_inventory',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('provider', sa.String(), nullable=False),
+        sa.Column('from_district', sa.String(), nullable=False),
+        sa.Column('to_district', sa.String(), nullable=False),
+        sa.Column('travel_date', sa.Date(), nullable=False),
+        sa.Column('capacity', sa.Integer(), nullable=False),
+        sa.Column('seats_available', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.CheckConstraint('seats_available >= 0', name='ck_trip_inventory_seats_non_negative'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('provider', 'from_district', 'to_district', 'travel_date', name='uq_trip_inventory_trip')
+    )
+    op.create_index(op.f('ix_trip_inventory_id'), 'trip_inventory', ['id'], unique=False)
+
+    # Backfill from pending and confirmed bookings so booked trips cannot be oversold
+    op.get_bind().execute(sa.text("""
+        INSERT INTO trip_inventory
+            (provider, from_district, to_district, travel_date, capacity, seats_available, created_at, updated_at)
+        SELECT provider, from_district, to_district, travel_date, :capacity,
+               CASE WHEN SUM(num_seats) >= :capacity THEN 0 ELSE :capacity - SUM(num_seats) END,
+               CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+        FROM bookings
+        WHERE status != 'CANCELLED'
+        GROUP BY provider, from_district, to_district, travel_date
+    """), {"capacity": settings.DEFAULT_TRIP_CAPACITY})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_trip_inventory_id'), table_name='trip_inventory')
+    op.drop_table('trip_inventory')
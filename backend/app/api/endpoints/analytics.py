@@ -0,0 +1,73 @@
+"""Read-only analytics endpoints backed by the route occupancy aggregates."""
+from typing import Optional
+from datetime import date
+from fastapi import APIRouter, HTTPException, Query, Depends, status
+from sqlalchemy.orm import Session
+
+from app.schemas.analytics import (
+    OccupancyListResponse,
+    RevenueListResponse
+)
+from app.services.occupancy_service import get_occupancy_service, OccupancyService
+from app.core.database import get_db
+from app.core.logging import logger
+
+router = APIRouter()
+
+
+@router.get("/analytics/occupancy", response_model=OccupancyListResponse)
+async def get_occupancy(
+    provider: Optional[str] = Query(None, description="Filter by provider"),
+    from_district: Optional[str] = Query(None, description="Filter by departure district"),
+    to_district: Optional[str] = Query(None, description="Filter by destination district"),
+    start_date: Optional[date] = Query(None, description="First travel date"),
+    end_date: Optional[date] = Query(None, description="Last travel date"),
+    limit: int = Query(500, ge=1, le=5000, description="Maximum number of trips to return"),
+    db: Session = Depends(get_db),
+    occupancy: OccupancyService = Depends(get_occupancy_service)
+):
+    """
+    Get seats sold, bookings and revenue per trip (provider, route and travel date).
+    
+    - **provider**: Optional provider filter
+    - **from_district** / **to_district**: Optional route filters
+    - **start_date** / **end_date**: Optional travel date range
+    """
+    try:
+        trips = occupancy.get_occupancy(db, provider, from_district, to_district, start_date, end_date, limit)
+        return OccupancyListResponse(
+            trips=trips,
+            total_trips=len(trips)
+        )
+    except Exception as e:
+        logger.error(f"Error getting occupancy: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while fetching occupancy"
+        )
+
+
+@router.get("/analytics/revenue", response_model=RevenueListResponse)
+async def get_revenue(
+    start_date: Optional[date] = Query(None, description="First travel date"),
+    end_date: Optional[date] = Query(None, description="Last travel date"),
+    db: Session = Depends(get_db),
+    occupancy: OccupancyService = Depends(get_occupancy_service)
+):
+    """
+    Get seats sold, bookings and revenue per provider.
+    
+    - **start_date** / **end_date**: Optional travel date range
+    """
+    try:
+        providers = occupancy.get_revenue_by_provider(db, start_date, end_date)
+        return RevenueListResponse(
+            providers=providers,
+            total_revenue=sum(p["revenue"] for p in providers)
+        )
+    except Exception as e:
+        logger.error(f"Error getting revenue: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while fetching revenue"
+        )
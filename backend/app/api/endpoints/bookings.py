@@ -1,25 +1,96 @@
 """API endpoints for booking operations."""
 from typing import Optional
-from fastapi import APIRouter, HTTPException, Query, Depends, status
+from collections import defaultdict
+from datetime import datetime, timedelta
+from fastapi import APIRouter, HTTPException, Query, Header, Depends, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import tuple_, insert, update
 from sqlalchemy.orm import Session
 
 from app.schemas.booking import (
     BookingCreateRequest,
     BookingResponse,
     BookingListResponse,
-    BookingStatus
+    BookingStatus,
+    BulkBookingCreateRequest,
+    BulkBookingResponse
 )
 from app.models.booking import Booking
+from app.services.inventory_service import (
+    get_inventory_service,
+    InventoryService,
+    SeatsUnavailableError
+)
+from app.services.pricing_service import (
+    get_pricing_service,
+    PricingService,
+    InvalidRouteError
+)
+from app.services.idempotency_service import (
+    get_idempotency_service,
+    IdempotencyService,
+    IdempotencyConflictError
+)
+from app.services.cache import get_booking_cache, BookingCache
+from app.services.occupancy_service import get_occupancy_service, OccupancyService
 from app.core.database import get_db
+from app.core.config import settings
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.responses import model_response, json_response
 from app.core.logging import logger
 
 router = APIRouter()
 
 
+def _add_booking(
+    db: Session,
+    booking_request: BookingCreateRequest,
+    inventory: InventoryService,
+    pricing: PricingService,
+    booking_status: BookingStatus,
+    expires_at: Optional[datetime] = None
+) -> Booking:
+    """Price a booking, reserve its seats and flush it in the current transaction."""
+    # Validate the route and compute the fare from the in-memory pricing index
+    total_fare = pricing.quote(
+        booking_request.provider,
+        booking_request.from_district,
+        booking_request.to_district,
+        booking_request.dropping_point,
+        booking_request.num_seats
+    )
+    
+    # Take the seats in the same transaction as the booking row
+    inventory.reserve_seats(
+        db,
+        booking_request.provider,
+        booking_request.from_district,
+        booking_request.to_district,
+        booking_request.travel_date,
+        booking_request.num_seats
+    )
+    
+    booking = Booking(
+        **booking_request.model_dump(),
+        total_fare=total_fare,
+        status=booking_status,
+        expires_at=expires_at
+    )
+    db.add(booking)
+    db.flush()
+    return booking
+
+
 @router.post("/bookings", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
 async def create_booking(
     booking_request: BookingCreateRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    inventory: InventoryService = Depends(get_inventory_service),
+    pricing: PricingService = Depends(get_pricing_service),
+    idempotency: IdempotencyService = Depends(get_idempotency_service),
+    booking_cache: BookingCache = Depends(get_booking_cache),
+    occupancy: OccupancyService = Depends(get_occupancy_service),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255)
 ):
     """
     Create a new bus ticket booking.
@@ -32,35 +103,56 @@ async def create_booking(
     - **provider**: Bus provider name
     - **travel_date**: Date of travel
     - **num_seats**: Number of seats to book (1-10)
-    - **dropping_point**: Optional dropping point
+    - **dropping_point**: Optional dropping point (cheapest fare is used if omitted)
+    
+    Send an **Idempotency-Key** header to make retries safe: a repeated request
+    with the same key returns the original response without booking again.
     """
     try:
-        # Calculate total fare (simplified - in production, get from pricing service)
-        base_fare_per_seat = 500
-        total_fare = base_fare_per_seat * booking_request.num_seats
-        
-        # Create booking
-        booking = Booking(
-            customer_name=booking_request.customer_name,
-            customer_email=booking_request.customer_email,
-            customer_phone=booking_request.customer_phone,
-            from_district=booking_request.from_district,
-            to_district=booking_request.to_district,
-            provider=booking_request.provider,
-            travel_date=booking_request.travel_date,
-            num_seats=booking_request.num_seats,
-            dropping_point=booking_request.dropping_point,
-            total_fare=total_fare,
-            status=BookingStatus.CONFIRMED
-        )
-        
-        db.add(booking)
+        if idempotency_key:
+            request_hash = idempotency.fingerprint(booking_request.model_dump(mode="json"))
+            stored = idempotency.claim(db, idempotency_key, request_hash)
+            if stored:
+                db.rollback()
+                stored_status, stored_body = stored
+                return ORJSONResponse(
+                    status_code=stored_status,
+                    content=stored_body,
+                    headers={"Idempotent-Replayed": "true"}
+                )
+        
+        booking = _add_booking(db, booking_request, inventory, pricing, BookingStatus.CONFIRMED)
+        occupancy.record_booking(db, booking)
+        response = BookingResponse.model_validate(booking)
+        
+        if idempotency_key:
+            idempotency.complete(
+                db, idempotency_key, status.HTTP_201_CREATED, response.model_dump(mode="json")
+            )
         db.commit()
-        db.refresh(booking)
+        await booking_cache.run(booking_cache.invalidate, email=response.customer_email, phone=response.customer_phone)
         
-        logger.info(f"Created booking {booking.id} for {booking.customer_name}")
-        return booking
+        logger.info(f"Created booking {response.id} for {response.customer_name}")
+        return model_response(response, status.HTTP_201_CREATED)
         
+    except IdempotencyConflictError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    except InvalidRouteError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except SeatsUnavailableError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     except Exception as e:
         db.rollback()
         logger.error(f"Error creating booking: {str(e)}")
@@ -70,17 +162,217 @@ async def create_booking(
         )
 
 
+@router.post("/bookings/holds", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
+async def create_booking_hold(
+    booking_request: BookingCreateRequest,
+    db: Session = Depends(get_db),
+    inventory: InventoryService = Depends(get_inventory_service),
+    pricing: PricingService = Depends(get_pricing_service),
+    booking_cache: BookingCache = Depends(get_booking_cache)
+):
+    """
+    Hold seats as a pending booking until payment completes.
+    
+    Takes the same fields as a booking. The seats are reserved until
+    **expires_at**; confirm with `POST /bookings/{id}/confirm` before then or
+    the hold is cancelled and the seats are released.
+    """
+    try:
+        expires_at = datetime.utcnow() + timedelta(seconds=settings.BOOKING_HOLD_TTL_SECONDS)
+        booking = _add_booking(db, booking_request, inventory, pricing, BookingStatus.PENDING, expires_at)
+        response = BookingResponse.model_validate(booking)
+        db.commit()
+        await booking_cache.run(booking_cache.invalidate, email=response.customer_email, phone=response.customer_phone)
+        
+        logger.info(f"Created hold {response.id} for {response.customer_name} until {expires_at}")
+        return model_response(response, status.HTTP_201_CREATED)
+        
+    except InvalidRouteError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except SeatsUnavailableError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error creating booking hold: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while holding the seats"
+        )
+
+
+@router.post("/bookings/{booking_id}/confirm", response_model=BookingResponse)
+async def confirm_booking(
+    booking_id: int,
+    db: Session = Depends(get_db),
+    booking_cache: BookingCache = Depends(get_booking_cache),
+    occupancy: OccupancyService = Depends(get_occupancy_service)
+):
+    """
+    Confirm a pending booking whose hold has not expired.
+    
+    - **booking_id**: ID of the pending booking
+    """
+    try:
+        # Lock the row so the expiry sweeper skips it while we confirm
+        booking = db.query(Booking).filter(Booking.id == booking_id).with_for_update().first()
+        
+        if not booking:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Booking with ID {booking_id} not found"
+            )
+        
+        if booking.status != BookingStatus.PENDING:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Booking is {booking.status.value}, only pending bookings can be confirmed"
+            )
+        
+        if booking.expires_at and booking.expires_at <= datetime.utcnow():
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="The hold on this booking has expired"
+            )
+        
+        booking.status = BookingStatus.CONFIRMED
+        booking.expires_at = None
+        occupancy.record_booking(db, booking)
+        db.flush()
+        response = BookingResponse.model_validate(booking)
+        db.commit()
+        await booking_cache.run(booking_cache.invalidate, booking_id=booking_id, email=response.customer_email, phone=response.customer_phone)
+        
+        logger.info(f"Confirmed booking {booking_id}")
+        return model_response(response)
+        
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error confirming booking: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while confirming the booking"
+        )
+
+
+@router.post("/bookings/bulk", response_model=BulkBookingResponse, status_code=status.HTTP_201_CREATED)
+async def create_bulk_booking(
+    bulk_request: BulkBookingCreateRequest,
+    db: Session = Depends(get_db),
+    inventory: InventoryService = Depends(get_inventory_service),
+    pricing: PricingService = Depends(get_pricing_service),
+    booking_cache: BookingCache = Depends(get_booking_cache),
+    occupancy: OccupancyService = Depends(get_occupancy_service)
+):
+    """
+    Create bookings for a group of passengers in one all-or-nothing transaction.
+    
+    - **bookings**: List of 1-100 booking requests, each with the same fields as a single booking
+    """
+    try:
+        rows = []
+        seats_by_trip = defaultdict(int)
+        revenue_by_trip = defaultdict(int)
+        bookings_by_trip = defaultdict(int)
+        
+        for position, booking_request in enumerate(bulk_request.bookings):
+            try:
+                total_fare = pricing.quote(
+                    booking_request.provider,
+                    booking_request.from_district,
+                    booking_request.to_district,
+                    booking_request.dropping_point,
+                    booking_request.num_seats
+                )
+            except InvalidRouteError as e:
+                raise InvalidRouteError(f"Booking {position}: {e}")
+            
+            rows.append({
+                **booking_request.model_dump(),
+                "total_fare": total_fare,
+                "status": BookingStatus.CONFIRMED
+            })
+            trip = (
+                booking_request.provider,
+                booking_request.from_district,
+                booking_request.to_district,
+                booking_request.travel_date
+            )
+            seats_by_trip[trip] += booking_request.num_seats
+            revenue_by_trip[trip] += total_fare
+            bookings_by_trip[trip] += 1
+        
+        # One reservation per distinct trip, taken in a fixed order so that
+        # concurrent group bookings lock inventory rows consistently
+        for trip in sorted(seats_by_trip):
+            inventory.reserve_seats(db, *trip, seats_by_trip[trip])
+            occupancy.apply_delta(db, *trip, seats_by_trip[trip], bookings_by_trip[trip], revenue_by_trip[trip])
+        
+        # Batched INSERT ... RETURNING instead of one round trip per passenger
+        bookings = db.scalars(
+            insert(Booking).returning(Booking, sort_by_parameter_order=True),
+            rows
+        ).all()
+        
+        # Serialize before commit expires the returned objects
+        response = BulkBookingResponse(
+            bookings=bookings,
+            total_bookings=len(bookings),
+            total_fare=sum(row["total_fare"] for row in rows)
+        )
+        db.commit()
+        for customer_email, customer_phone in {(row["customer_email"], row["customer_phone"]) for row in rows}:
+            await booking_cache.run(booking_cache.invalidate, email=customer_email, phone=customer_phone)
+        
+        logger.info(f"Created {len(bookings)} bookings in one group booking")
+        return model_response(response, status.HTTP_201_CREATED)
+        
+    except InvalidRouteError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except SeatsUnavailableError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error creating group booking: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while creating the group booking"
+        )
+
+
 @router.get("/bookings", response_model=BookingListResponse)
 async def list_bookings(
     customer_email: Optional[str] = Query(None, description="Filter by customer email"),
     customer_phone: Optional[str] = Query(None, description="Filter by customer phone"),
-    db: Session = Depends(get_db)
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of bookings to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    db: Session = Depends(get_db),
+    booking_cache: BookingCache = Depends(get_booking_cache)
 ):
     """
-    Get list of bookings filtered by customer email or phone.
+    Get a page of bookings filtered by customer email or phone, newest first.
     
     - **customer_email**: Filter bookings by customer email
     - **customer_phone**: Filter bookings by customer phone
+    - **limit**: Page size (1-100)
+    - **cursor**: Opaque cursor to continue after the previous page
     """
     if not customer_email and not customer_phone:
         raise HTTPException(
@@ -88,7 +380,17 @@ async def list_bookings(
             detail="Either customer_email or customer_phone must be provided"
         )
     
-    try:
+    last_key = None
+    if cursor:
+        try:
+            last_key = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    
+    def load_page() -> dict:
         query = db.query(Booking)
         
         if customer_email:
@@ -96,12 +398,31 @@ async def list_bookings(
         elif customer_phone:
             query = query.filter(Booking.customer_phone == customer_phone)
         
-        bookings = query.order_by(Booking.created_at.desc()).all()
+        if last_key:
+            query = query.filter(tuple_(Booking.created_at, Booking.id) < tuple_(*last_key))
+        
+        # Fetch one extra row to learn whether another page exists
+        rows = query.order_by(Booking.created_at.desc(), Booking.id.desc()).limit(limit + 1).all()
+        bookings = rows[:limit]
+        
+        next_cursor = None
+        if len(rows) > limit:
+            last = bookings[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
         
         return BookingListResponse(
             bookings=bookings,
-            total_bookings=len(bookings)
-        )
+            total_bookings=len(bookings),
+            next_cursor=next_cursor
+        ).model_dump(mode="json")
+    
+    try:
+        if customer_email:
+            page = await booking_cache.run(booking_cache.get_page, "email", customer_email, limit, cursor, load_page)
+        else:
+            page = await booking_cache.run(booking_cache.get_page, "phone", customer_phone, limit, cursor, load_page)
+        # Cached pages are model dumps already; skip response_model validation
+        return json_response(page)
         
     except Exception as e:
         logger.error(f"Error listing bookings: {str(e)}")
@@ -114,15 +435,20 @@ async def list_bookings(
 @router.get("/bookings/{booking_id}", response_model=BookingResponse)
 async def get_booking(
     booking_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    booking_cache: BookingCache = Depends(get_booking_cache)
 ):
     """
     Get details of a specific booking by ID.
     
     - **booking_id**: Booking ID
     """
-    try:
+    def load_booking() -> Optional[dict]:
         booking = db.query(Booking).filter(Booking.id == booking_id).first()
+        return BookingResponse.model_validate(booking).model_dump(mode="json") if booking else None
+    
+    try:
+        booking = await booking_cache.run(booking_cache.get_booking, booking_id, load_booking)
         
         if not booking:
             raise HTTPException(
@@ -130,7 +456,7 @@ async def get_booking(
                 detail=f"Booking with ID {booking_id} not found"
             )
         
-        return booking
+        return json_response(booking)
         
     except HTTPException:
         raise
@@ -145,7 +471,10 @@ async def get_booking(
 @router.delete("/bookings/{booking_id}")
 async def cancel_booking(
     booking_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    inventory: InventoryService = Depends(get_inventory_service),
+    booking_cache: BookingCache = Depends(get_booking_cache),
+    occupancy: OccupancyService = Depends(get_occupancy_service)
 ):
     """
     Cancel a booking by ID.
@@ -153,7 +482,9 @@ async def cancel_booking(
     - **booking_id**: Booking ID to cancel
     """
     try:
-        booking = db.query(Booking).filter(Booking.id == booking_id).first()
+        # Lock the row like confirm does: a concurrent cancel waits here and then sees
+        # the new status, and the expiry sweeper skips the row, so seats are released once
+        booking = db.query(Booking).filter(Booking.id == booking_id).with_for_update().first()
         
         if not booking:
             raise HTTPException(
@@ -167,13 +498,40 @@ async def cancel_booking(
                 detail="Booking is already cancelled"
             )
         
-        booking.status = BookingStatus.CANCELLED
+        customer_email, customer_phone = booking.customer_email, booking.customer_phone
+        previous_status = booking.status
+        # Only the request whose update changes the status applies the occupancy and seat
+        # deltas, so the aggregates cannot be decremented twice for one booking
+        changed = db.execute(
+            update(Booking)
+            .where(Booking.id == booking_id, Booking.status == previous_status)
+            .values(status=BookingStatus.CANCELLED)
+            .returning(Booking.id)
+        ).first()
+        if changed is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Booking was changed by another request, please retry"
+            )
+        
+        if previous_status == BookingStatus.CONFIRMED:
+            occupancy.record_booking(db, booking, sign=-1)
+        inventory.release_seats(
+            db,
+            booking.provider,
+            booking.from_district,
+            booking.to_district,
+            booking.travel_date,
+            booking.num_seats
+        )
         db.commit()
+        await booking_cache.run(booking_cache.invalidate, booking_id=booking_id, email=customer_email, phone=customer_phone)
         
         logger.info(f"Cancelled booking {booking_id}")
         return {"message": f"Booking {booking_id} cancelled successfully"}
         
     except HTTPException:
+        db.rollback()
         raise
     except Exception as e:
         db.rollback()
@@ -1,15 +1,23 @@
 """API endpoints for bus-related operations."""
 from typing import Optional
+from datetime import date
+import time
 from fastapi import APIRouter, HTTPException, Query, Depends, status
+from sqlalchemy.orm import Session
 
 from app.schemas.bus import (
     BusSearchResponse,
     RouteResponse,
     BusProvidersListResponse,
-    BusProviderResponse
+    BusProviderResponse,
+    TripAvailabilityResponse
 )
 from app.services.bus_service import get_bus_service, BusService
+from app.services.inventory_service import get_inventory_service, InventoryService
+from app.core.database import get_db
 from app.core.logging import logger
+from app.core.query_log import query_log
+from app.utils.responses import model_response
 
 router = APIRouter()
 
@@ -28,13 +36,19 @@ async def search_buses(
     - **to_district**: Destination district name
     - **provider**: Optional provider name filter
     """
+    started = time.time()
+    status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    routes = []
     try:
         routes = await bus_service.search_buses(from_district, to_district, provider)
-        return BusSearchResponse(
+        status_code = status.HTTP_200_OK
+        # Routes are built from the validated pricing index; serialize without re-validating
+        return model_response(BusSearchResponse.model_construct(
             routes=routes,
             total_results=len(routes)
-        )
+        ))
     except ValueError as e:
+        status_code = status.HTTP_400_BAD_REQUEST
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
@@ -45,6 +59,47 @@ async def search_buses(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred while searching for buses"
         )
+    finally:
+        query_log.record(
+            "search", started, status_code,
+            params={"from_district": from_district, "to_district": to_district, "provider": provider},
+            results=len(routes),
+            providers=[route.provider for route in routes]
+        )
+
+
+@router.get("/buses/availability", response_model=TripAvailabilityResponse)
+async def get_availability(
+    provider: str = Query(..., description="Bus provider name"),
+    from_district: str = Query(..., description="Departure district"),
+    to_district: str = Query(..., description="Destination district"),
+    travel_date: date = Query(..., description="Date of travel"),
+    db: Session = Depends(get_db),
+    inventory: InventoryService = Depends(get_inventory_service)
+):
+    """
+    Get the number of seats left on a trip.
+    
+    - **provider**: Bus provider name
+    - **from_district**: Departure district name
+    - **to_district**: Destination district name
+    - **travel_date**: Date of travel
+    """
+    try:
+        availability = inventory.get_availability(db, provider, from_district, to_district, travel_date)
+        return TripAvailabilityResponse(
+            provider=provider,
+            from_district=from_district,
+            to_district=to_district,
+            travel_date=travel_date,
+            **availability
+        )
+    except Exception as e:
+        logger.error(f"Error getting availability: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while fetching seat availability"
+        )
 
 
 @router.get("/buses/providers", response_model=BusProvidersListResponse)
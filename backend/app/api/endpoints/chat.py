@@ -2,6 +2,9 @@ from fastapi import APIRouter, HTTPException, Depends
 from app.schemas.chat import ChatRequest, ChatResponse
 from app.services.rag_service import get_rag_service, RAGService
 from app.core.logging import logger
+from app.core.tracing import span
+from app.core.query_log import query_log
+import time
 import uuid
 
 router = APIRouter()
@@ -15,6 +18,9 @@ async def chat_endpoint(
     Chat endpoint for the Bus Ticket Booking AI.
     Accepts a user message and returns an AI response with sources.
     """
+    started = time.time()
+    status_code = 500
+    result = None
     try:
         # Generate a conversation ID if not provided
         conversation_id = request.conversation_id or str(uuid.uuid4())
@@ -23,17 +29,28 @@ async def chat_endpoint(
         user_message = request.message
         
         # Get answer from RAG service
-        result = await rag_service.get_answer(user_message)
+        with span("chat.endpoint", conversation_id=conversation_id):
+            result = await rag_service.get_answer(user_message)
         
         # Construct response
         response = ChatResponse(
             response=result["answer"],
             conversation_id=conversation_id,
-            sources=result["sources"]
+            sources=result["sources"],
+            degraded=result.get("degraded", False)
         )
         
+        status_code = 200
         return response
         
     except Exception as e:
         logger.error(f"Error in chat endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error processing chat request")
+    finally:
+        query_log.record(
+            "chat", started, status_code,
+            query=request.message,
+            answer_chars=len(result["answer"]) if result else 0,
+            sources=len(result["sources"]) if result else 0,
+            degraded=result.get("degraded", False) if result else False
+        )
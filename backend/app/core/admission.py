@@ -0,0 +1,241 @@
+"""Admission control: per-group concurrency limits with a priority queue."""
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+import asyncio
+import math
+import time
+
+from app.core.config import settings
+from app.core.metrics import registry, gauge, Counter, Histogram
+
+# Path prefix -> admission group; anything else under /api falls into "default"
+ROUTE_GROUPS = (
+    ("/api/v1/bookings", "bookings"),
+    ("/api/v1/buses", "search"),
+    ("/api/v1/chat", "chat"),
+)
+DEFAULT_GROUP = "default"
+
+# Lower runs first when slots free up: revenue-critical bookings before search before chat
+GROUP_PRIORITIES = {"bookings": 0, "search": 1, DEFAULT_GROUP: 2, "chat": 3}
+
+# Health, readiness and metrics must answer even when the API is saturated
+EXEMPT_PREFIXES = ("/health", "/ready", "/metrics", "/docs", "/openapi.json")
+
+# Weight of the latest request in the moving average of service time
+SERVICE_TIME_ALPHA = 0.2
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, group: str, reason: str, retry_after: int):
+        """Initialize with the group, reason (queue_full or timeout) and Retry-After seconds."""
+        super().__init__(f"{group} request rejected: {reason}")
+        self.group = group
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionGroup:
+    """Slots, waiters and statistics for one group of routes."""
+
+    def __init__(self, name: str, limit: int, priority: int, max_wait: float, max_queue: int):
+        """Initialize an idle group."""
+        self.name = name
+        self.limit = limit
+        self.priority = priority
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self.active = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.rejected = {"queue_full": 0, "timeout": 0}
+        self.avg_service_seconds = 0.0
+
+    def record_service_time(self, seconds: float) -> None:
+        """Update the moving average used for Retry-After estimates."""
+        if self.avg_service_seconds == 0.0:
+            self.avg_service_seconds = seconds
+        else:
+            self.avg_service_seconds += SERVICE_TIME_ALPHA * (seconds - self.avg_service_seconds)
+
+
+class AdmissionController:
+    """
+    Admit requests under per-group and global concurrency limits.
+
+    A request runs immediately when both its group and the process have a
+    free slot; otherwise it waits in its group's FIFO queue for at most the
+    group's max_wait. Whenever a slot is released, queued requests are
+    admitted in group priority order, so a burst of chat requests can hold
+    at most its own slots and never delays bookings waiting for global
+    capacity. Requests that find the queue full or wait too long are
+    rejected with a Retry-After estimate.
+
+    All state is touched only from the event loop, so no locks are needed.
+    """
+
+    def __init__(self, global_limit: int, groups: Dict[str, AdmissionGroup]):
+        """Initialize the controller."""
+        self.global_limit = global_limit
+        self.active = 0
+        self.groups = groups
+        self._by_priority = sorted(groups.values(), key=lambda g: g.priority)
+
+    def group_for_path(self, path: str) -> Optional[str]:
+        """Map a request path to its group, or None if it bypasses admission."""
+        if path.startswith(EXEMPT_PREFIXES) or not path.startswith("/api/"):
+            return None
+        for prefix, group in ROUTE_GROUPS:
+            if path == prefix or path.startswith(prefix + "/"):
+                return group
+        return DEFAULT_GROUP
+
+    def _has_slot(self, group: AdmissionGroup) -> bool:
+        return group.active < group.limit and self.active < self.global_limit
+
+    def _admit(self, group: AdmissionGroup) -> None:
+        group.active += 1
+        group.admitted += 1
+        self.active += 1
+
+    def _dispatch(self) -> None:
+        """Hand free slots to queued requests, highest priority group first."""
+        for group in self._by_priority:
+            while group.waiters and self._has_slot(group):
+                waiter = group.waiters.popleft()
+                if waiter.done():
+                    continue
+                self._admit(group)
+                waiter.set_result(True)
+            if self.active >= self.global_limit:
+                return
+
+    def retry_after(self, group: AdmissionGroup) -> int:
+        """Seconds until the queue ahead is likely to have drained (at least 1)."""
+        backlog = (len(group.waiters) + group.active) / max(group.limit, 1)
+        return max(1, math.ceil(backlog * group.avg_service_seconds))
+
+    def _reject(self, group: AdmissionGroup, reason: str) -> AdmissionRejected:
+        group.rejected[reason] += 1
+        admission_rejections_total.inc(group=group.name, reason=reason)
+        return AdmissionRejected(group.name, reason, self.retry_after(group))
+
+    async def acquire(self, name: str) -> None:
+        """
+        Wait for a slot in a group.
+
+        Args:
+            name: Group name from group_for_path
+
+        Raises:
+            AdmissionRejected: If the queue is full or no slot frees up within max_wait
+        """
+        group = self.groups[name]
+        if self._has_slot(group) and not group.waiters:
+            self._admit(group)
+            admission_wait_seconds.observe(0.0, group=name)
+            return
+        if len(group.waiters) >= group.max_queue:
+            raise self._reject(group, "queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        group.waiters.append(waiter)
+        start = time.perf_counter()
+        try:
+            await asyncio.wait({waiter}, timeout=group.max_wait)
+        except asyncio.CancelledError:
+            # Client went away while queued; give back a slot granted in the meantime
+            if waiter.done() and not waiter.cancelled():
+                self.release(name, 0.0)
+            else:
+                waiter.cancel()
+                self._discard(group, waiter)
+            raise
+        admission_wait_seconds.observe(time.perf_counter() - start, group=name)
+        if not waiter.done():
+            waiter.cancel()
+            self._discard(group, waiter)
+            raise self._reject(group, "timeout")
+
+    def _discard(self, group: AdmissionGroup, waiter: asyncio.Future) -> None:
+        try:
+            group.waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def release(self, name: str, service_seconds: float) -> None:
+        """Free a slot taken by acquire and admit the next queued requests."""
+        group = self.groups[name]
+        group.active -= 1
+        self.active -= 1
+        if service_seconds > 0:
+            group.record_service_time(service_seconds)
+        self._dispatch()
+
+    def stats(self) -> Dict[str, Any]:
+        """Slots in use, queue depth and rejection counts per group."""
+        return {
+            "global_limit": self.global_limit,
+            "active": self.active,
+            "groups": {
+                group.name: {
+                    "priority": group.priority,
+                    "limit": group.limit,
+                    "active": group.active,
+                    "queued": len(group.waiters),
+                    "admitted": group.admitted,
+                    "rejected": dict(group.rejected),
+                    "avg_service_ms": round(group.avg_service_seconds * 1000, 1),
+                }
+                for group in self._by_priority
+            },
+        }
+
+
+admission_rejections_total = registry.register(Counter(
+    "admission_rejections_total", "Requests shed by admission control, by group and reason",
+    ("group", "reason")
+))
+admission_wait_seconds = registry.register(Histogram(
+    "admission_wait_seconds", "Time requests spent queued for an admission slot",
+    ("group",)
+))
+
+
+# Global instance
+_admission_controller = None
+
+def get_admission_controller() -> AdmissionController:
+    """Get or create the global admission controller from settings."""
+    global _admission_controller
+    if _admission_controller is None:
+        groups = {
+            name: AdmissionGroup(
+                name,
+                limit=settings.ADMISSION_GROUP_LIMITS.get(name, settings.ADMISSION_GLOBAL_LIMIT),
+                priority=priority,
+                max_wait=settings.ADMISSION_MAX_WAIT_SECONDS.get(name, 1.0),
+                max_queue=settings.ADMISSION_MAX_QUEUE
+            )
+            for name, priority in GROUP_PRIORITIES.items()
+        }
+        _admission_controller = AdmissionController(settings.ADMISSION_GLOBAL_LIMIT, groups)
+    return _admission_controller
+
+
+def _collect_admission_metrics():
+    """Expose slots in use and queue depth per group at scrape time."""
+    if _admission_controller is None:
+        return []
+    groups = _admission_controller.groups.values()
+    return [
+        gauge("admission_in_flight", "Admitted requests currently running, by group",
+              [({"group": g.name}, g.active) for g in groups]),
+        gauge("admission_queue_depth", "Requests waiting for an admission slot, by group",
+              [({"group": g.name}, len(g.waiters)) for g in groups]),
+    ]
+
+
+registry.register_collector(_collect_admission_metrics)
@@ -1,4 +1,5 @@
 """Core configuration settings using Pydantic Settings."""
+from typing import Dict
 from pathlib import Path
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -9,13 +10,123 @@ class Settings(BaseSettings):
     # Application
     APP_NAME: str = "Bus Ticket Booking AI Chatbot"
     DEBUG: bool = True
+    # Which routers this process serves: "all", "chat", "catalog" (bus search) or "bookings"
+    SERVICE_ROLE: str = "all"
     
     # Database
     DATABASE_URL: str
+    DB_ECHO: bool = False  # Echo every SQL statement (very noisy, keep off outside local debugging)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection before failing
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a pooled connection is replaced (-1 disables)
+    DB_POOL_PRE_PING: bool = True
+    DB_SLOW_QUERY_MS: float = 200.0  # Statements slower than this are logged as warnings
+    
+    # Seat inventory
+    DEFAULT_TRIP_CAPACITY: int = 40  # Seats per trip when no inventory row exists yet
+    
+    # Bookings partitioning (PostgreSQL): monthly travel_date partitions
+    BOOKING_PARTITION_MONTHS_AHEAD: int = 3
+    BOOKING_RETENTION_MONTHS: int = 0  # Months of past partitions to keep attached (0 keeps everything)
+    BOOKING_RETENTION_ACTION: str = "detach"  # "detach" keeps expired partitions as tables, "drop" deletes them
+    BOOKING_PARTITION_MAINTENANCE_INTERVAL_SECONDS: int = 86400
+    
+    # Pending-booking seat holds
+    BOOKING_HOLD_TTL_SECONDS: int = 600  # How long a pending booking keeps its seats without payment
+    HOLD_SWEEP_INTERVAL_SECONDS: int = 30
+    HOLD_SWEEP_BATCH_SIZE: int = 500
+    
+    # Idempotency keys for booking creation
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: int = 3600
+    
+    # Booking read cache ("memory", "redis" or "none")
+    BOOKING_CACHE_BACKEND: str = "memory"
+    BOOKING_CACHE_MAX_ENTRIES: int = 10000
+    BOOKING_CACHE_TTL_SECONDS: int = 300
+    REDIS_URL: str = "redis://localhost:6379/0"
+    
+    # RAG caches: query embeddings, retrieved documents and chat answers ("memory", "redis" or "none")
+    RAG_CACHE_BACKEND: str = "memory"
+    RAG_CACHE_MAX_ENTRIES: int = 5000
+    RAG_CACHE_TTL_SECONDS: int = 3600  # Documents and answers; embeddings never expire
+    
+    # Background cache warmup after startup, from WARMUP_QUERIES_FILE then the query log's most frequent queries
+    WARMUP_ENABLED: bool = True
+    WARMUP_QUERIES_FILE: str = ""  # One chat query per line, most important first
+    WARMUP_MAX_QUERIES: int = 50
+    WARMUP_ANSWERS: bool = True  # Also precompute chat answers (one agent run, i.e. LLM calls, per query)
+    WARMUP_CONCURRENCY: int = 2
+    WARMUP_TIME_BUDGET_SECONDS: float = 120.0
+    
+    # Logging (records go through a bounded queue to a background writer thread)
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True  # One JSON object per line; False for the plain text format
+    LOG_QUEUE_SIZE: int = 10000  # Records beyond this are dropped and counted instead of blocking
+    LOG_MAX_BYTES: int = 10_000_000
+    LOG_BACKUP_COUNT: int = 5
+    LOG_SAMPLE_RATES: Dict[str, float] = {}  # e.g. {"bus_service": 0.1} keeps 10% of its INFO/DEBUG records
+    
+    # Admission control: concurrent requests per route group (bookings, search, chat, default)
+    ADMISSION_ENABLED: bool = True
+    # Requests running at once across all groups. Priority between groups only comes into play when
+    # this binds, so keep it below the sum of the group limits (120 by default)
+    ADMISSION_GLOBAL_LIMIT: int = 96
+    ADMISSION_GROUP_LIMITS: Dict[str, int] = {"bookings": 64, "search": 32, "chat": 8, "default": 16}
+    ADMISSION_MAX_WAIT_SECONDS: Dict[str, float] = {"bookings": 5.0, "search": 2.0, "chat": 1.0, "default": 2.0}
+    ADMISSION_MAX_QUEUE: int = 200  # Queued requests per group before new ones are shed immediately
+    
+    # Local tracing (spans written to TRACE_DIR/traces.jsonl)
+    TRACING_ENABLED: bool = True
+    TRACE_SAMPLE_RATE: float = 0.1  # Fraction of traces kept
+    TRACE_SLOW_MS: float = 2000.0  # Traces slower than this are always kept (0 disables)
+    TRACE_DIR: str = str(Path(__file__).parent.parent.parent / "traces")
+    TRACE_MAX_BYTES: int = 50_000_000
+    TRACE_BACKUP_COUNT: int = 5
+    
+    # Query log of chat and search requests for replay (scripts/replay_queries.py); off by default
+    QUERY_LOG_ENABLED: bool = False
+    QUERY_LOG_SAMPLE_RATE: float = 1.0  # Fraction of requests recorded
+    QUERY_LOG_DIR: str = str(Path(__file__).parent.parent.parent / "query_logs")
+    QUERY_LOG_MAX_BYTES: int = 50_000_000
+    QUERY_LOG_BACKUP_COUNT: int = 5
     
     # Google Gemini API
     GOOGLE_API_KEY: str
     
+    # Chat model: "gemini" or "fake" (local model for load tests, no API calls)
+    LLM_PROVIDER: str = "gemini"
+    LLM_TIMEOUT_SECONDS: float = 20.0  # Per model call
+    LLM_MAX_RETRIES: int = 1  # Client-side retries inside one call
+    AGENT_TIMEOUT_SECONDS: float = 45.0  # Whole agent run (model calls plus retrieval)
+    LLM_MAX_CONCURRENCY: int = 8  # Model calls in flight per process
+    LLM_QUEUE_TIMEOUT_SECONDS: float = 5.0  # Wait for a free slot before answering from retrieval only
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5  # Consecutive failures that open the circuit
+    LLM_CIRCUIT_RESET_SECONDS: float = 30.0  # Open time before a trial call is allowed
+    FAKE_LLM_LATENCY_MS: float = 200.0
+    FAKE_LLM_ERROR_RATE: float = 0.0  # Fraction of fake model calls that raise
+    
+    # Source data (data.json and provider attachments)
+    CONTEXT_DIR: str = str(Path(__file__).parent.parent.parent.parent / "context")
+    
+    # Response compression (brotli when the optional package is installed, else gzip)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_BYTES: int = 1024  # Smaller bodies are sent uncompressed
+    COMPRESSION_GZIP_LEVEL: int = 5
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 0-11; above ~5 costs far more CPU for little gain on JSON
+    
+    # On-demand request profiling (X-Profile header or ?__profile= with this token; empty disables)
+    PROFILE_TOKEN: str = ""
+    PROFILE_DIR: str = str(Path(__file__).parent.parent.parent / "profiles")
+    PROFILE_INTERVAL_MS: float = 5.0
+    
+    # Embeddings: "huggingface" (PyTorch) or "onnx" (export with scripts/export_onnx_embeddings.py)
+    EMBEDDING_BACKEND: str = "huggingface"
+    ONNX_MODEL_DIR: str = str(Path(__file__).parent.parent.parent / "models" / "all-MiniLM-L6-v2-onnx")
+    ONNX_QUANTIZED: bool = True  # int8 dynamic quantization; False uses the float32 export
+    ONNX_INTRA_OP_THREADS: int = 0  # 0 lets ONNX Runtime pick; set to 1-2 per worker when pre-forking
+    
     # ChromaDB
     CHROMA_PERSIST_DIR: str = str(Path(__file__).parent.parent.parent / "chroma_data")
     
@@ -0,0 +1,168 @@
+"""Connection pool and SQL statement instrumentation using SQLAlchemy events."""
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.tracing import start_span, finish_span
+from app.core.metrics import (
+    registry,
+    gauge,
+    db_query_duration_seconds,
+    db_pool_checkout_wait_seconds
+)
+
+# Statement types reported as their own metric label; anything else is 'other'
+SQL_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+
+class PoolStats:
+    """Thread-safe accumulator for pool checkout and statement timings."""
+
+    def __init__(self):
+        """Initialize all counters to zero."""
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.statements = 0
+        self.statement_time_total = 0.0
+        self.statement_time_max = 0.0
+        self.slow_queries = 0
+
+    def record_checkout_wait(self, seconds: float):
+        """Record how long a caller waited to obtain a connection."""
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_wait_total += seconds
+            self.checkout_wait_max = max(self.checkout_wait_max, seconds)
+
+    def record_checkout(self):
+        """Track a connection leaving the pool."""
+        with self._lock:
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def record_checkin(self):
+        """Track a connection returning to the pool."""
+        with self._lock:
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def record_statement(self, seconds: float, slow: bool):
+        """Record the latency of a single executed statement."""
+        with self._lock:
+            self.statements += 1
+            self.statement_time_total += seconds
+            self.statement_time_max = max(self.statement_time_max, seconds)
+            if slow:
+                self.slow_queries += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a consistent copy of the current counters."""
+        with self._lock:
+            capacity = settings.DB_POOL_SIZE + max(settings.DB_MAX_OVERFLOW, 0)
+            return {
+                "pool_size": settings.DB_POOL_SIZE,
+                "max_overflow": settings.DB_MAX_OVERFLOW,
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "saturation": round(self.checked_out / capacity, 3) if capacity else 0.0,
+                "peak_saturation": round(self.peak_checked_out / capacity, 3) if capacity else 0.0,
+                "checkouts": self.checkouts,
+                "checkout_wait_avg_ms": round(
+                    self.checkout_wait_total / self.checkouts * 1000, 3
+                ) if self.checkouts else 0.0,
+                "checkout_wait_max_ms": round(self.checkout_wait_max * 1000, 3),
+                "statements": self.statements,
+                "statement_avg_ms": round(
+                    self.statement_time_total / self.statements * 1000, 3
+                ) if self.statements else 0.0,
+                "statement_max_ms": round(self.statement_time_max * 1000, 3),
+                "slow_queries": self.slow_queries,
+                "slow_query_threshold_ms": settings.DB_SLOW_QUERY_MS,
+            }
+
+
+# Global stats instance shared by the pool and engine listeners
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that measures how long callers wait for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            pool_stats.record_checkout_wait(waited)
+            db_pool_checkout_wait_seconds.observe(waited)
+
+
+def _sql_operation(statement: str) -> str:
+    """Classify a statement by its leading keyword for metric labels."""
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return keyword.lower() if keyword in SQL_OPERATIONS else "other"
+
+
+def instrument_engine(engine: Engine):
+    """Attach pool and statement timing listeners to an engine."""
+    slow_threshold = settings.DB_SLOW_QUERY_MS / 1000
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_stats.record_checkout()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        pool_stats.record_checkin()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_start_time = time.perf_counter()
+        context._query_span = start_span(
+            "db.query", operation=_sql_operation(statement), statement=statement[:200]
+        )
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_start_time
+        finish_span(context._query_span)
+        slow = elapsed >= slow_threshold
+        pool_stats.record_statement(elapsed, slow)
+        db_query_duration_seconds.observe(elapsed, operation=_sql_operation(statement))
+        if slow:
+            logger.warning(f"Slow query ({elapsed * 1000:.1f} ms): {statement[:500]}")
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(exception_context):
+        context = exception_context.execution_context
+        finish_span(getattr(context, "_query_span", None), exception_context.original_exception)
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Get a snapshot of pool and statement statistics."""
+    return pool_stats.snapshot()
+
+
+
+def _collect_pool_metrics():
+    """Expose pool occupancy as gauges at scrape time."""
+    stats = pool_stats.snapshot()
+    return [
+        gauge("db_pool_size", "Configured connection pool size", [({}, stats["pool_size"])]),
+        gauge("db_pool_checked_out", "Connections currently checked out of the pool", [({}, stats["checked_out"])]),
+        gauge("db_pool_peak_checked_out", "Highest number of connections checked out at once", [({}, stats["peak_checked_out"])]),
+        ("db_slow_queries_total", "counter", "Statements slower than DB_SLOW_QUERY_MS", [({}, stats["slow_queries"])]),
+    ]
+
+
+registry.register_collector(_collect_pool_metrics)
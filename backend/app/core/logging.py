@@ -1,7 +1,24 @@
-"""Logging configuration for the application."""
+"""Logging configuration for the application.
+
+Log calls only put records on a bounded in-memory queue; a QueueListener thread
+formats them and writes to stdout and a rotating file. Hot paths on the event
+loop therefore never block on console or disk I/O.
+"""
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
+import os
+import random
 import sys
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
 
 # Create logs directory if it doesn't exist
 LOG_DIR = Path(__file__).parent.parent.parent / "logs"
@@ -11,18 +28,213 @@ LOG_DIR.mkdir(exist_ok=True)
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
-# Configure root logger
-logging.basicConfig(
-    level=logging.INFO,
-    format=LOG_FORMAT,
-    datefmt=DATE_FORMAT,
-    handlers=[
-        # Console handler
-        logging.StreamHandler(sys.stdout),
-        # File handler
-        logging.FileHandler(LOG_DIR / "app.log")
-    ]
-)
+# Renders tracebacks on the calling thread, before the record loses its exc_info
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+# Attributes every LogRecord has; anything else was passed via extra= and is emitted as a field
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "line": record.lineno,
+            "message": record.getMessage(),
+            "process": record.process,
+            "thread": record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of DEBUG/INFO records from high-volume sources.
+
+    Rates are keyed by logger name (matching dotted children too) or by the
+    module that emitted the record, e.g. {"bus_service": 0.1}. Warnings and
+    errors are never sampled out.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        """Initialize with per-source keep rates between 0 and 1."""
+        super().__init__()
+        self.rates = dict(rates)
+        self.sampled_out = 0
+
+    def _rate(self, record: logging.LogRecord) -> Optional[float]:
+        rate = self.rates.get(record.module)
+        if rate is not None:
+            return rate
+        name = record.name
+        while name:
+            rate = self.rates.get(name)
+            if rate is not None:
+                return rate
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not self.rates or record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record)
+        if rate is None or rate >= 1 or random.random() < rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that drops records instead of blocking when the queue is full.
+
+    Once space frees up, a single warning reporting how many records were lost
+    is queued ahead of the next record.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        """Initialize the handler on a bounded queue."""
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._unreported = 0
+        self._lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Make a picklable copy with the message and traceback rendered.
+
+        The stock prepare() formats the whole record into msg and clears the
+        exception, so tracebacks ended up inside the message. The traceback
+        is kept in exc_text instead, where JsonFormatter emits it as the
+        exception field and the plain formatter appends it as usual.
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _TRACEBACK_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self._unreported:
+            with self._lock:
+                unreported, self._unreported = self._unreported, 0
+            if unreported:
+                notice = logging.makeLogRecord({
+                    "name": __name__,
+                    "module": "logging",
+                    "levelno": logging.WARNING,
+                    "levelname": "WARNING",
+                    "msg": f"Logging queue full: dropped {unreported} log records",
+                })
+                try:
+                    self.queue.put_nowait(notice)
+                except queue.Full:
+                    with self._lock:
+                        self._unreported += unreported
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                self._unreported += 1
+
+
+def _build_output_handlers(log_file: str = "app.log") -> list:
+    """Create the handlers the listener thread writes to."""
+    if settings.LOG_JSON:
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT)
+
+    # Console handler
+    console = logging.StreamHandler(sys.stdout)
+    # File handler, rotated by size
+    file_handler = logging.handlers.RotatingFileHandler(
+        LOG_DIR / log_file,
+        maxBytes=settings.LOG_MAX_BYTES,
+        backupCount=settings.LOG_BACKUP_COUNT,
+        encoding="utf-8"
+    )
+    for handler in (console, file_handler):
+        handler.setFormatter(formatter)
+    return [console, file_handler]
+
+
+_log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+_queue_handler = BoundedQueueHandler(_log_queue)
+_sampling_filter = SamplingFilter(settings.LOG_SAMPLE_RATES)
+_queue_handler.addFilter(_sampling_filter)
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_pid: Optional[int] = None
+
+
+def start_logging(log_file: str = "app.log") -> None:
+    """
+    Start the listener thread (again, e.g. in a forked worker whose thread did not survive the fork).
+
+    Forked workers pass their own log_file, since several processes rotating
+    one file would lose records.
+    """
+    global _listener, _listener_pid, _log_queue
+    if _listener is not None and _listener_pid == os.getpid():
+        return
+    if _listener is not None:
+        # The thread belonged to the parent process; records queued there are not ours to write
+        _log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+        _queue_handler.queue = _log_queue
+    _listener = logging.handlers.QueueListener(_log_queue, *_build_output_handlers(log_file), respect_handler_level=True)
+    _listener.start()
+    _listener_pid = os.getpid()
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is None or _listener_pid != os.getpid():
+        return
+    try:
+        _listener.stop()
+    except queue.Full:
+        pass  # Could not queue the stop sentinel; the daemon thread dies with the process
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    """Queue depth and drop/sampling counters."""
+    return {
+        "queued": _log_queue.qsize(),
+        "capacity": settings.LOG_QUEUE_SIZE,
+        "dropped": _queue_handler.dropped,
+        "sampled_out": _sampling_filter.sampled_out,
+    }
+
+
+# Configure root logger: the queue handler is the only handler on the hot path
+root_logger = logging.getLogger()
+for existing in list(root_logger.handlers):
+    root_logger.removeHandler(existing)
+root_logger.addHandler(_queue_handler)
+root_logger.setLevel(settings.LOG_LEVEL)
+start_logging()
+atexit.register(stop_logging)
 
 # Get logger instance
 logger = logging.getLogger(__name__)
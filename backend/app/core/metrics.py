@@ -0,0 +1,243 @@
+"""In-process metrics registry with Prometheus text exposition."""
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+from app.core.logging import get_logging_stats
+from app.core.tracing import span
+
+# Latency buckets in seconds, wide enough for both SQL statements and LLM calls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# (metric name, type, help text, [(labels, value), ...])
+MetricFamily = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """Render a label set as {a="1",b="2"}, or an empty string."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value, keeping integers free of a trailing .0."""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonically increasing counter with optional labels."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        """Initialize an empty counter."""
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Increase the counter for a label set."""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def collect(self) -> List[MetricFamily]:
+        """Return the current samples."""
+        with self._lock:
+            samples = [
+                (dict(zip(self.labelnames, key)), value)
+                for key, value in self._values.items()
+            ]
+        return [(self.name, "counter", self.help, samples)]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        """Initialize an empty histogram."""
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation for a label set."""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def collect(self) -> List[MetricFamily]:
+        """Return bucket, sum and count samples."""
+        samples = []
+        with self._lock:
+            items = [(key, list(state[0]), state[1], state[2]) for key, state in self._values.items()]
+        for key, counts, total, count in items:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                samples.append(({**labels, "le": _format_value(bound)}, cumulative, "_bucket"))
+            samples.append((labels, total, "_sum"))
+            samples.append((labels, count, "_count"))
+        return [(self.name, "histogram", self.help, samples)]
+
+
+class MetricsRegistry:
+    """Registry of metrics and collector callbacks rendered on each scrape."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: List = []
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        """Register a Counter or Histogram and return it."""
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        """Register a callback producing gauge families from existing stats at scrape time."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors)
+
+        families: List[MetricFamily] = []
+        for metric in metrics:
+            families.extend(metric.collect())
+        for collector in collectors:
+            try:
+                families.extend(collector())
+            except Exception:
+                # A broken collector must not take the whole scrape down
+                errors_total.inc(component="metrics", stage="collector")
+
+        lines = []
+        for name, kind, help_text, samples in families:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample in samples:
+                labels, value = sample[0], sample[1]
+                suffix = sample[2] if len(sample) > 2 else ""
+                lines.append(f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# Global registry used by the /metrics endpoint
+registry = MetricsRegistry()
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route template and status code",
+    ("method", "route", "status")
+))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ("method", "route")
+))
+stage_duration_seconds = registry.register(Histogram(
+    "stage_duration_seconds", "Time spent in internal stages such as embedding, vector search and LLM calls",
+    ("component", "stage")
+))
+errors_total = registry.register(Counter(
+    "errors_total", "Errors raised inside instrumented stages",
+    ("component", "stage")
+))
+db_query_duration_seconds = registry.register(Histogram(
+    "db_query_duration_seconds", "SQL statement latency by statement type",
+    ("operation",)
+))
+db_pool_checkout_wait_seconds = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled database connection"
+))
+cache_requests_total = registry.register(Counter(
+    "cache_requests_total", "Cache lookups by cache namespace and result",
+    ("cache", "result")
+))
+
+
+def observe_stage(component: str, stage: str, seconds: float, error: bool = False) -> None:
+    """Record the duration (and failure) of a stage measured elsewhere."""
+    stage_duration_seconds.observe(seconds, component=component, stage=stage)
+    if error:
+        errors_total.inc(component=component, stage=stage)
+
+
+@contextmanager
+def timed(component: str, stage: str):
+    """
+    Time a block of code as one stage of a component.
+
+    The block is also recorded as a '<component>.<stage>' tracing span.
+    Exceptions are counted in errors_total and re-raised unchanged.
+
+    Args:
+        component: Owning component, e.g. 'rag' or 'bus_service'
+        stage: Stage within the component, e.g. 'vector_search'
+    """
+    start = time.perf_counter()
+    error = False
+    try:
+        with span(f"{component}.{stage}"):
+            yield
+    except Exception:
+        error = True
+        raise
+    finally:
+        observe_stage(component, stage, time.perf_counter() - start, error)
+
+
+def gauge(name: str, help: str, samples: List[Tuple[Dict[str, str], float]]) -> MetricFamily:
+    """Build a gauge family for use in collectors."""
+    return (name, "gauge", help, samples)
+
+
+def _collect_logging_metrics():
+    """Expose the logging queue counters at scrape time."""
+    stats = get_logging_stats()
+    return [
+        gauge("log_queue_depth", "Log records waiting for the writer thread", [({}, stats["queued"])]),
+        ("log_records_dropped_total", "counter", "Log records dropped because the queue was full", [({}, stats["dropped"])]),
+        ("log_records_sampled_out_total", "counter", "Log records discarded by LOG_SAMPLE_RATES", [({}, stats["sampled_out"])]),
+    ]
+
+
+registry.register_collector(_collect_logging_metrics)
+
+
+def render_metrics() -> str:
+    """Render the global registry."""
+    return registry.render()
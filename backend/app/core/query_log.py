@@ -0,0 +1,109 @@
+"""Opt-in, sampled log of chat and search queries for replay and cache tuning."""
+from typing import Any, Dict, Optional
+import random
+import re
+import time
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.tracing import tracer
+from app.utils.jsonl import JsonlWriter
+
+# Personal data that users type into chat; replaced before anything is queued
+SCRUB_PATTERNS = (
+    (re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+"), "<email>"),
+    # Bangladeshi mobile numbers with optional country code, then any other run of 8+ digits
+    # (IDs, cards) except ISO dates, which replays need
+    (re.compile(r"(?:\+?88)?01[3-9]\d{2}[\s-]?\d{6}\b"), "<phone>"),
+    (re.compile(r"(?<![\d-])(?!\d{4}-\d{2}-\d{2}\b)\+?\d(?:[\s-]?\d){7,}"), "<number>"),
+    # Names can't be told from other words, so everything after a self-introduction
+    # is dropped up to the next punctuation mark ("I am going to Sylhet" goes too)
+    (re.compile(
+        r"\b(my name is|my name's|name is|this is|i am|i'm|i’m|im|call me|myself)[^\S\n]+[^.,!?;:\n]+",
+        re.IGNORECASE
+    ), r"\1 <name>"),
+)
+
+
+def scrub(text: str) -> str:
+    """Replace emails, phone numbers, long digit runs and self-introductions with placeholders."""
+    for pattern, replacement in SCRUB_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+class QueryLog:
+    """
+    Record a sample of chat and bus search requests as JSON lines.
+
+    Each record keeps what a replay needs (the scrubbed query or search
+    parameters and its arrival time) plus how the request went (status,
+    latency, result size). Writing goes through a JsonlWriter, so the request
+    path only pays for scrubbing and an enqueue; nothing is recorded unless
+    QUERY_LOG_ENABLED is set.
+    """
+
+    def __init__(self, enabled: bool, sample_rate: float, writer: JsonlWriter):
+        """Initialize the log."""
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.writer = writer
+
+    def _sampled(self) -> bool:
+        return self.enabled and (self.sample_rate >= 1.0 or random.random() < self.sample_rate)
+
+    def record(
+        self,
+        kind: str,
+        started: float,
+        status: int,
+        query: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        **outcome: Any
+    ) -> None:
+        """
+        Log one request if it is sampled.
+
+        Args:
+            kind: 'chat' or 'search'
+            started: time.time() when the request arrived
+            status: HTTP status returned
+            query: Chat message (scrubbed before logging)
+            params: Search parameters
+            **outcome: Result details, e.g. answer_chars or results
+        """
+        if not self._sampled():
+            return
+        record = {
+            "ts": round(started, 3),
+            "kind": kind,
+            "status": status,
+            "latency_ms": round((time.time() - started) * 1000, 2),
+            "trace_id": tracer.current_trace_id(),
+        }
+        if query is not None:
+            record["query"] = scrub(query)
+        if params is not None:
+            record["params"] = params
+        record.update(outcome)
+        self.writer.write(record)
+
+    def stats(self) -> Dict[str, Any]:
+        """Sampling settings and writer counters."""
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "writer": self.writer.stats(),
+        }
+
+
+# Global query log shared by the chat and search endpoints
+query_log = QueryLog(
+    enabled=settings.QUERY_LOG_ENABLED,
+    sample_rate=settings.QUERY_LOG_SAMPLE_RATE,
+    writer=JsonlWriter(
+        str(Path(settings.QUERY_LOG_DIR) / "queries.jsonl"),
+        max_bytes=settings.QUERY_LOG_MAX_BYTES,
+        backup_count=settings.QUERY_LOG_BACKUP_COUNT
+    )
+)
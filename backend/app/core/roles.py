@@ -0,0 +1,38 @@
+"""Serving roles: which routers and subsystems a process loads."""
+from typing import Tuple
+
+# Router modules under app.api.endpoints loaded by each SERVICE_ROLE
+ROLE_ROUTERS = {
+    "all": ("chat", "buses", "bookings", "analytics"),
+    "chat": ("chat",),
+    "catalog": ("buses",),
+    "bookings": ("bookings", "analytics"),
+}
+
+# Roles whose routers depend on the RAG stack (embeddings, Chroma, LLM)
+RAG_ROLES = {"all", "chat", "catalog"}
+
+# Roles that own the booking maintenance jobs (hold expiry, idempotency purge, partitions)
+BOOKING_ROLES = {"all", "bookings"}
+
+
+def validate_role(role: str) -> str:
+    """Return the role, or raise ValueError if it is not a known role."""
+    if role not in ROLE_ROUTERS:
+        raise ValueError(f"Unknown SERVICE_ROLE '{role}'; expected one of: {', '.join(ROLE_ROUTERS)}")
+    return role
+
+
+def role_routers(role: str) -> Tuple[str, ...]:
+    """Get the router module names a role serves."""
+    return ROLE_ROUTERS[validate_role(role)]
+
+
+def role_needs_rag(role: str) -> bool:
+    """Check whether a role loads the embedding model and vector store."""
+    return validate_role(role) in RAG_ROLES
+
+
+def role_runs_booking_jobs(role: str) -> bool:
+    """Check whether a role runs the booking maintenance jobs."""
+    return validate_role(role) in BOOKING_ROLES
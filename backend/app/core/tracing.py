@@ -0,0 +1,225 @@
+"""Lightweight local tracing: nested spans written to a rotating JSONL file."""
+from typing import Any, Dict, List, Optional
+import os
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from app.core.config import settings
+from app.utils.jsonl import JsonlWriter
+
+# Hard cap on spans kept per trace (e.g. an agent loop issuing hundreds of queries)
+MAX_SPANS_PER_TRACE = 1000
+
+
+class Span:
+    """One timed operation inside a trace."""
+
+    __slots__ = ("trace", "span_id", "parent_id", "name", "start", "end", "attributes", "error")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        """Start a span now."""
+        self.trace = trace
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach a key/value pair to the span."""
+        self.attributes[key] = value
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """End the span, recording an error if one is given."""
+        if self.end is not None:
+            return
+        self.end = time.perf_counter()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"[:500]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize with times in milliseconds relative to the trace start."""
+        end = self.end if self.end is not None else time.perf_counter()
+        record = {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ms": round((self.start - self.trace.start) * 1000, 3),
+            "duration_ms": round((end - self.start) * 1000, 3),
+        }
+        if self.attributes:
+            record["attributes"] = self.attributes
+        if self.error:
+            record["error"] = self.error
+        return record
+
+
+class Trace:
+    """All spans recorded under one root span."""
+
+    def __init__(self, trace_id: Optional[str] = None):
+        """Start a trace now."""
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self.start = time.perf_counter()
+        self.started_at = time.time()
+        self.spans: List[Span] = []
+        self.dropped_spans = 0
+
+    def add(self, span: Span) -> None:
+        """Keep a span unless the trace is already full."""
+        # list.append is atomic, so spans opened in worker threads need no lock
+        if len(self.spans) < MAX_SPANS_PER_TRACE:
+            self.spans.append(span)
+        else:
+            self.dropped_spans += 1
+
+
+class Tracer:
+    """
+    Records spans for every request and keeps a sample of finished traces.
+
+    Sampling is decided when the root span ends: a trace is written if it is
+    selected at TRACE_SAMPLE_RATE, or unconditionally if it took longer than
+    TRACE_SLOW_MS, so slow requests are never lost to sampling. Recording is
+    a few object allocations per span; the file I/O happens on the writer's
+    background thread.
+    """
+
+    def __init__(self, enabled: bool, sample_rate: float, slow_ms: float, writer: JsonlWriter):
+        """Initialize the tracer."""
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.writer = writer
+        self._current: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+        self._traces_kept = 0
+        self._traces_discarded = 0
+        self._lock = threading.Lock()
+
+    def current_span(self) -> Optional[Span]:
+        """Get the innermost open span in this context."""
+        return self._current.get()
+
+    def current_trace_id(self) -> Optional[str]:
+        """Get the trace id of the current context, if any."""
+        current = self._current.get()
+        return current.trace.trace_id if current is not None else None
+
+    def start_span(self, name: str, root: bool = False, **attributes: Any) -> Optional[Span]:
+        """
+        Start a span without making it current, for callback-style APIs.
+
+        Child spans attach to the current span; without one, nothing is
+        recorded unless root=True starts a new trace.
+
+        Args:
+            name: Span name, e.g. 'rag.llm_call'
+            root: Start a new trace when there is no current span
+            attributes: Extra key/value pairs stored on the span
+
+        Returns:
+            The started span, or None when tracing is off or there is no trace
+        """
+        if not self.enabled:
+            return None
+        parent = self._current.get()
+        if parent is None:
+            if not root:
+                return None
+            trace = Trace()
+            parent_id = None
+        else:
+            trace = parent.trace
+            parent_id = parent.span_id
+        span = Span(trace, name, parent_id, attributes)
+        trace.add(span)
+        return span
+
+    def finish_span(self, span: Optional[Span], error: Optional[BaseException] = None) -> None:
+        """End a span from start_span, exporting the trace if it was the root."""
+        if span is None:
+            return
+        span.finish(error)
+        if span.parent_id is None:
+            self._export(span.trace, span)
+
+    @contextmanager
+    def span(self, name: str, root: bool = False, **attributes: Any):
+        """
+        Open a span that is current for the duration of the block.
+
+        Yields the Span (or None when nothing is recorded), so callers can add
+        attributes as they learn them.
+        """
+        span = self.start_span(name, root=root, **attributes)
+        if span is None:
+            yield None
+            return
+        token = self._current.set(span)
+        error = None
+        try:
+            yield span
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._current.reset(token)
+            self.finish_span(span, error)
+
+    def _export(self, trace: Trace, root: Span) -> None:
+        """Write a finished trace if it was sampled or slow."""
+        duration_ms = (root.end - root.start) * 1000
+        keep = (self.slow_ms > 0 and duration_ms >= self.slow_ms) or random.random() < self.sample_rate
+        with self._lock:
+            if keep:
+                self._traces_kept += 1
+            else:
+                self._traces_discarded += 1
+        if not keep:
+            return
+        self.writer.write({
+            "trace_id": trace.trace_id,
+            "name": root.name,
+            "timestamp": trace.started_at,
+            "duration_ms": round(duration_ms, 3),
+            "error": root.error,
+            "pid": os.getpid(),
+            "dropped_spans": trace.dropped_spans,
+            "spans": [span.to_dict() for span in trace.spans],
+        })
+
+    def stats(self) -> Dict[str, Any]:
+        """Sampling and writer counters."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "sample_rate": self.sample_rate,
+                "slow_ms": self.slow_ms,
+                "traces_kept": self._traces_kept,
+                "traces_discarded": self._traces_discarded,
+                "writer": self.writer.stats(),
+            }
+
+
+# Global tracer shared by middleware, services and SQL listeners
+tracer = Tracer(
+    enabled=settings.TRACING_ENABLED,
+    sample_rate=settings.TRACE_SAMPLE_RATE,
+    slow_ms=settings.TRACE_SLOW_MS,
+    writer=JsonlWriter(
+        str(Path(settings.TRACE_DIR) / "traces.jsonl"),
+        max_bytes=settings.TRACE_MAX_BYTES,
+        backup_count=settings.TRACE_BACKUP_COUNT
+    )
+)
+
+span = tracer.span
+start_span = tracer.start_span
+finish_span = tracer.finish_span
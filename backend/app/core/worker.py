@@ -0,0 +1,60 @@
+"""Per-process state reset for workers forked from a preloading master."""
+import sys
+import threading
+
+from app.core.logging import start_logging, logger
+from app.core import db_metrics
+from app.core.database import engine
+from app.core.tracing import tracer
+from app.core.query_log import query_log
+
+# Slot of this process when forked by scripts/serve.py; None when run any other way
+current_worker_id = None
+
+# Lazily created singletons that hold clients which must not cross a fork
+# (Chroma's SQLite handle, the Gemini gRPC channel); module -> (attribute, lock attribute)
+PER_WORKER_SINGLETONS = {
+    "app.services.rag_service": ("rag_service", "_rag_service_lock"),
+    "app.services.bus_service": ("_bus_service", None),
+    "app.services.llm_resilience": ("_llm_guard", None),
+    "app.core.admission": ("_admission_controller", None),
+    "app.services.cache": ("_rag_cache", None),
+}
+
+
+def is_primary_worker() -> bool:
+    """Whether this process runs once-per-deployment jobs (worker 0, or a single process)."""
+    return current_worker_id in (None, 0)
+
+
+def init_worker(worker_id: int) -> None:
+    """
+    Make a freshly forked worker safe to serve requests.
+
+    Threads do not survive fork, so the logging listener is restarted (the
+    tracing and query log writers restart themselves on first use). Each
+    worker slot logs, traces and records queries to its own files so
+    rotation never races between processes. Pooled database connections
+    inherited from the master are abandoned without closing them, since the
+    master still owns the sockets. Singletons holding network or file clients
+    are cleared so each worker builds its own; the embedding model and pricing
+    index loaded by the master stay shared copy-on-write.
+    """
+    global current_worker_id
+    current_worker_id = worker_id
+    start_logging(f"app.worker-{worker_id}.log")
+    tracer.writer.path = tracer.writer.path.with_name(f"traces.worker-{worker_id}.jsonl")
+    query_log.writer.path = query_log.writer.path.with_name(f"queries.worker-{worker_id}.jsonl")
+    engine.dispose(close=False)
+    db_metrics.pool_stats = db_metrics.PoolStats()
+
+    for module_name, (attribute, lock_attribute) in PER_WORKER_SINGLETONS.items():
+        module = sys.modules.get(module_name)
+        if module is None:
+            continue
+        setattr(module, attribute, None)
+        if lock_attribute:
+            # A lock copied while another thread held it would stay locked forever
+            setattr(module, lock_attribute, threading.Lock())
+
+    logger.info(f"Worker {worker_id} initialized after fork")
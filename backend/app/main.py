@@ -1,5 +1,9 @@
 """FastAPI application initialization and configuration."""
+import asyncio
+import importlib
+import time
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
@@ -7,15 +11,41 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from app.core.config import settings
-from app.core.logging import logger
-from app.api.endpoints import chat, buses, bookings
+from app.core.logging import logger, get_logging_stats
+from app.core.db_metrics import get_pool_stats
+from app.core.metrics import render_metrics
+from app.core.tracing import tracer
+from app.core.query_log import query_log
+from app.core.admission import get_admission_controller
+from app.middleware.admission import AdmissionMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.tracing import TracingMiddleware
+from app.core.database import SessionLocal
+from app.core.roles import role_routers, role_needs_rag, role_runs_booking_jobs
+from app.core.worker import is_primary_worker
+from app.services.idempotency_service import get_idempotency_service
+from app.services.llm_resilience import get_llm_guard
+from app.services.cache import get_booking_cache, get_rag_cache
+from app.services.cache_warmup import warm_caches, warmup_stats
+from app.services.partition_service import get_partition_service
+from app.services.hold_service import get_hold_service
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    default_response_class=ORJSONResponse
 )
 
+# Per-route-group concurrency limits and priority queueing; shed requests get 429.
+# Added first so it runs inside CORS and rejections still carry CORS headers.
+app.add_middleware(AdmissionMiddleware)
+
+# Negotiated brotli/gzip for JSON bodies above COMPRESSION_MIN_BYTES
+app.add_middleware(CompressionMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -25,23 +55,125 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# CPU profile of requests flagged with PROFILE_TOKEN, written to PROFILE_DIR
+app.add_middleware(ProfilingMiddleware)
+# Request latency per route template, exposed on /metrics
+app.add_middleware(MetricsMiddleware)
+# Root span per request, written to TRACE_DIR/traces.jsonl when sampled or slow
+app.add_middleware(TracingMiddleware)
+
+
+def purge_idempotency_keys():
+    """Delete expired idempotency keys."""
+    db = SessionLocal()
+    try:
+        deleted = get_idempotency_service().purge_expired(db)
+        if deleted:
+            logger.info(f"Purged {deleted} expired idempotency keys")
+    finally:
+        db.close()
+
+
+def release_expired_holds():
+    """Cancel pending bookings whose hold has expired and free their seats."""
+    released = get_hold_service().release_expired(settings.HOLD_SWEEP_BATCH_SIZE)
+    if released:
+        logger.info(f"Released {released} expired booking holds")
+
+
+def load_rag_stack():
+    """Load the embedding model, vector store and LLM client, and run one embedding."""
+    # Imported here so roles without RAG never import langchain or the model
+    from app.services.rag_service import get_rag_service
+    from app.services.bus_service import get_bus_service
+
+    rag_service = get_rag_service()
+    rag_service.embeddings.embed_query("warmup")
+    get_bus_service()
+
+
+async def warm_up():
+    """Load the RAG stack off the event loop, mark the app ready, then warm the caches."""
+    start = time.perf_counter()
+    try:
+        await asyncio.to_thread(load_rag_stack)
+        app.state.ready = True
+        logger.info(f"RAG stack warmed up in {time.perf_counter() - start:.1f}s")
+    except Exception as e:
+        app.state.warmup_error = str(e)
+        logger.error(f"RAG warmup failed: {str(e)}")
+        return
+
+    if settings.WARMUP_ENABLED:
+        # Already serving: cache warmup only shortens the cold period, it never gates readiness.
+        # Every worker warms its local embeddings and retrieval, but only one spends LLM calls
+        # on answers (other workers share them through RAG_CACHE_BACKEND=redis).
+        try:
+            await warm_caches(
+                chat="chat" in role_routers(settings.SERVICE_ROLE),
+                answers=settings.WARMUP_ANSWERS and is_primary_worker()
+            )
+        except Exception as e:
+            warmup_stats["status"] = "failed"
+            logger.error(f"Cache warmup failed: {str(e)}")
+    else:
+        warmup_stats["status"] = "disabled"
+
+
+async def run_periodically(job, interval: float, name: str):
+    """Run a blocking maintenance job in a worker thread every `interval` seconds."""
+    while True:
+        try:
+            await asyncio.to_thread(job)
+        except Exception as e:
+            logger.error(f"Error in {name}: {str(e)}")
+        await asyncio.sleep(interval)
+
 
 @app.on_event("startup")
 async def startup_event():
     """Run on application startup."""
     logger.info(f"Starting {settings.APP_NAME}")
     logger.info(f"DEBUG: CHROMA_PERSIST_DIR is set to: {settings.CHROMA_PERSIST_DIR}")
+    logger.info(f"Serving role: {settings.SERVICE_ROLE}")
+    app.state.background_tasks = []
+    app.state.warmup_error = None
+    app.state.ready = not role_needs_rag(settings.SERVICE_ROLE)
+    if not app.state.ready:
+        # Served requests wait on the same singleton, so the model is never loaded twice
+        app.state.background_tasks.append(asyncio.create_task(warm_up()))
+
+    # Maintenance jobs are deployment-wide; with pre-forked workers only worker 0 runs them
+    if role_runs_booking_jobs(settings.SERVICE_ROLE) and is_primary_worker():
+        app.state.background_tasks += [
+            asyncio.create_task(run_periodically(
+                purge_idempotency_keys, settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS, "idempotency key purge"
+            )),
+            asyncio.create_task(run_periodically(
+                release_expired_holds, settings.HOLD_SWEEP_INTERVAL_SECONDS, "hold expiry sweeper"
+            ))
+        ]
+        if get_partition_service().is_supported():
+            app.state.background_tasks.append(asyncio.create_task(run_periodically(
+                get_partition_service().run_maintenance,
+                settings.BOOKING_PARTITION_MAINTENANCE_INTERVAL_SECONDS,
+                "partition maintenance"
+            )))
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Run on application shutdown."""
     logger.info(f"Shutting down {settings.APP_NAME}")
+    for task in app.state.background_tasks:
+        task.cancel()
+    tracer.writer.close()
+    query_log.writer.close()
 
-# Register API routers
-app.include_router(chat.router, prefix="/api/v1", tags=["chat"])
-app.include_router(buses.router, prefix="/api/v1", tags=["buses"])
-app.include_router(bookings.router, prefix="/api/v1", tags=["bookings"])
+# Register API routers for this role; routers it doesn't serve (and what they import) are never loaded
+for router_name in role_routers(settings.SERVICE_ROLE):
+    router_module = importlib.import_module(f"app.api.endpoints.{router_name}")
+    app.include_router(router_module.router, prefix="/api/v1", tags=[router_name])
 
 @app.get("/")
 async def root():
@@ -52,6 +184,66 @@ async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 503 until the subsystems of this role are loaded."""
+    if app.state.ready:
+        return {"status": "ready", "role": settings.SERVICE_ROLE}
+    return JSONResponse(
+        status_code=503,
+        content={
+            "status": "failed" if app.state.warmup_error else "warming_up",
+            "role": settings.SERVICE_ROLE,
+            "error": app.state.warmup_error
+        }
+    )
+
+@app.get("/health/db")
+async def database_health():
+    """Connection pool saturation and query latency statistics."""
+    return get_pool_stats()
+
+@app.get("/health/cache")
+async def cache_health():
+    """Booking and RAG cache hit ratios, and progress of the startup cache warmup."""
+    return {
+        "backend": settings.BOOKING_CACHE_BACKEND,
+        "booking": get_booking_cache().stats.snapshot(),
+        "rag_backend": settings.RAG_CACHE_BACKEND,
+        "rag": get_rag_cache().stats.snapshot(),
+        "warmup": warmup_stats
+    }
+
+@app.get("/health/logging")
+async def logging_health():
+    """Logging queue depth and dropped record counts."""
+    return get_logging_stats()
+
+@app.get("/health/tracing")
+async def tracing_health():
+    """Trace sampling and export counters."""
+    return tracer.stats()
+
+@app.get("/health/query-log")
+async def query_log_health():
+    """Query log sampling and write counters."""
+    return query_log.stats()
+
+@app.get("/health/admission")
+async def admission_health():
+    """Admission slots in use, queue depth and rejections per route group."""
+    return {"enabled": settings.ADMISSION_ENABLED, **get_admission_controller().stats()}
+
+@app.get("/health/llm")
+async def llm_health():
+    """LLM circuit breaker state and in-flight model calls."""
+    return {"provider": settings.LLM_PROVIDER, **get_llm_guard().stats()}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus text exposition of request, stage, SQL and cache metrics."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 
 if __name__ == "__main__":
     import uvicorn
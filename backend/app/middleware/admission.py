@@ -0,0 +1,63 @@
+"""ASGI middleware applying admission control before requests reach the app."""
+import json
+import time
+
+from app.core.admission import AdmissionRejected, get_admission_controller
+from app.core.config import settings
+
+
+class AdmissionMiddleware:
+    """
+    Pure ASGI middleware holding each API request to its group's concurrency limit.
+
+    Requests queue for a slot (see AdmissionController) and keep it until the
+    response has been fully sent. Shed requests get 429 with a Retry-After
+    header without touching the app. Health, readiness and metrics endpoints
+    bypass admission entirely.
+    """
+
+    def __init__(self, app):
+        """Wrap an ASGI app."""
+        self.app = app
+        self.enabled = settings.ADMISSION_ENABLED
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        controller = get_admission_controller()
+        group = controller.group_for_path(scope["path"])
+        if group is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await controller.acquire(group)
+        except AdmissionRejected as e:
+            await self._reject(send, e)
+            return
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(group, time.perf_counter() - start)
+
+    async def _reject(self, send, rejection: AdmissionRejected):
+        """Send a 429 response with a Retry-After estimate."""
+        body = json.dumps({
+            "detail": "Server is busy, please retry later",
+            "group": rejection.group,
+            "reason": rejection.reason,
+        }).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(rejection.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
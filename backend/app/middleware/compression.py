@@ -0,0 +1,133 @@
+"""ASGI middleware compressing responses with brotli or gzip as the client accepts."""
+from typing import Optional
+import gzip
+
+from app.core.config import settings
+from app.core.metrics import registry, Counter
+
+try:
+    import brotli
+except ImportError:  # Optional dependency; gzip is always available
+    brotli = None
+
+# Only text-like bodies shrink; images and archives are already compressed
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+http_response_bytes_total = registry.register(Counter(
+    "http_response_bytes_total", "Response body bytes before and after compression",
+    ("encoding", "stage")
+))
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the best encoding the client accepts: brotli if installed, then gzip.
+
+    Args:
+        accept_encoding: Accept-Encoding header value
+
+    Returns:
+        'br', 'gzip' or None
+    """
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a body with the configured level for the encoding."""
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware compressing JSON and text responses.
+
+    The encoding is negotiated from Accept-Encoding (brotli preferred, gzip
+    otherwise) and Vary: Accept-Encoding is always set on compressible
+    responses so caches keep the variants apart. Bodies smaller than
+    COMPRESSION_MIN_BYTES are sent as-is, since headers and CPU would cost
+    more than the bytes saved. Streaming responses (several body chunks) and
+    responses that already carry a Content-Encoding pass through untouched.
+    """
+
+    def __init__(self, app, min_bytes: Optional[int] = None):
+        """Wrap an ASGI app."""
+        self.app = app
+        self.enabled = settings.COMPRESSION_ENABLED
+        self.min_bytes = settings.COMPRESSION_MIN_BYTES if min_bytes is None else min_bytes
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for key, value in scope["headers"]:
+            if key == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = {key.lower(): value for key, value in message.get("headers", [])}
+                content_type = headers.get(b"content-type", b"").decode("latin-1")
+                if b"content-encoding" in headers or not content_type.startswith(COMPRESSIBLE_TYPES):
+                    passthrough = True
+                    await send(message)
+                    return
+                # Held back until the body shows whether compression is worth it
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            passthrough = True
+            body = message.get("body", b"")
+            headers = []
+            vary = [b"Accept-Encoding"]
+            for key, value in start_message.get("headers", []):
+                if key.lower() == b"vary":
+                    vary.insert(0, value)
+                else:
+                    headers.append((key, value))
+            headers.append((b"vary", b", ".join(vary)))
+
+            if message.get("more_body", False) or len(body) < self.min_bytes:
+                await send({**start_message, "headers": headers})
+                await send(message)
+                return
+
+            compressed = compress(body, encoding)
+            headers = [(key, value) for key, value in headers if key.lower() != b"content-length"]
+            http_response_bytes_total.inc(len(body), encoding=encoding, stage="raw")
+            http_response_bytes_total.inc(len(compressed), encoding=encoding, stage="sent")
+            headers += [(b"content-encoding", encoding.encode()), (b"content-length", str(len(compressed)).encode())]
+            await send({**start_message, "headers": headers})
+            await send({**message, "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,45 @@
+"""ASGI middleware recording request counts and latency per route template."""
+import time
+
+from app.core.metrics import http_requests_total, http_request_duration_seconds
+
+# Label used for requests that matched no route (404s, scanners); keeps label cardinality bounded
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware timing every HTTP request.
+
+    Requests are labelled with the route template (e.g. /api/v1/bookings/{booking_id})
+    that FastAPI stores in the scope while routing, never with the raw path.
+    Streaming responses are timed until the last body chunk is sent.
+    """
+
+    def __init__(self, app, skip_paths=("/metrics",)):
+        """Wrap an ASGI app."""
+        self.app = app
+        self.skip_paths = set(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            template = getattr(route, "path", None) or UNMATCHED_ROUTE
+            method = scope["method"]
+            http_request_duration_seconds.observe(time.perf_counter() - start, method=method, route=template)
+            http_requests_total.inc(method=method, route=template, status=str(status_code))
@@ -0,0 +1,101 @@
+"""ASGI middleware profiling individual requests on demand."""
+import asyncio
+import hmac
+import re
+import threading
+import time
+import uuid
+from pathlib import Path
+from urllib.parse import parse_qs
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.tracing import tracer
+from app.utils.profiler import SamplingProfiler
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY_PARAM = "__profile"
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware that samples the CPU stacks of a flagged request.
+
+    A request is profiled when it carries 'X-Profile: <PROFILE_TOKEN>' or
+    '?__profile=<PROFILE_TOKEN>'. The stacks are written to PROFILE_DIR as
+    '<timestamp>_<route>_<request id>.collapsed' and the file name is returned
+    in an X-Profile-File header. With PROFILE_TOKEN unset the middleware is a
+    pass-through; otherwise an unflagged request costs one header scan.
+
+    Samples cover every busy thread (event loop and thread pool), so the
+    profile is only clean when the flagged request is not competing with
+    other traffic. One request is profiled at a time; others are served
+    normally while a profile is in progress.
+    """
+
+    def __init__(self, app):
+        """Wrap an ASGI app."""
+        self.app = app
+        self.token = settings.PROFILE_TOKEN.encode()
+        self.output_dir = Path(settings.PROFILE_DIR)
+        self.interval = settings.PROFILE_INTERVAL_MS / 1000
+        self._busy = threading.Lock()
+
+    def _is_flagged(self, scope) -> bool:
+        """Check the profiling header or query flag against the token."""
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return hmac.compare_digest(value, self.token)
+        query = scope.get("query_string", b"")
+        if PROFILE_QUERY_PARAM.encode() in query:
+            values = parse_qs(query.decode("latin-1")).get(PROFILE_QUERY_PARAM, [])
+            return any(hmac.compare_digest(v.encode(), self.token) for v in values)
+        return False
+
+    def _output_path(self, scope, request_id: str) -> Path:
+        """Build the profile file name from the matched route template."""
+        route = scope.get("route")
+        template = getattr(route, "path", None) or scope["path"]
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", f"{scope['method']} {template}").strip("_")[:80]
+        return self.output_dir / f"{time.strftime('%Y%m%dT%H%M%S')}_{slug}_{request_id}.collapsed"
+
+    async def __call__(self, scope, receive, send):
+        if not self.token or scope["type"] != "http" or not self._is_flagged(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if not self._busy.acquire(blocking=False):
+            logger.warning(f"Profile requested for {scope['path']} while another profile is running; skipping")
+            await self.app(scope, receive, send)
+            return
+
+        request_id = tracer.current_trace_id() or uuid.uuid4().hex
+        output_path = None
+        profiler = SamplingProfiler(self.interval)
+
+        async def send_wrapper(message):
+            nonlocal output_path
+            if message["type"] == "http.response.start":
+                # Routing has happened by now, so the template is known
+                output_path = self._output_path(scope, request_id)
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-file", output_path.name.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            profiler.start()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                await asyncio.to_thread(profiler.stop)
+            if output_path is None:
+                output_path = self._output_path(scope, request_id)
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            await asyncio.to_thread(profiler.write_collapsed, str(output_path))
+            logger.info(
+                f"Profiled {scope['method']} {scope['path']}: {profiler.sample_count} samples "
+                f"over {profiler.duration * 1000:.0f} ms -> {output_path}"
+            )
+        finally:
+            self._busy.release()
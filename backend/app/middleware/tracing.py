@@ -0,0 +1,40 @@
+"""ASGI middleware opening the root tracing span of every HTTP request."""
+from app.core.tracing import tracer
+
+TRACE_HEADER = b"x-trace-id"
+
+
+class TracingMiddleware:
+    """
+    Pure ASGI middleware wrapping each request in a root span.
+
+    The span is renamed to 'METHOD /route/template' once routing has run, and
+    the trace id is returned in an X-Trace-Id header so a slow response can be
+    looked up with scripts/trace_report.py.
+    """
+
+    def __init__(self, app, skip_paths=("/metrics", "/health")):
+        """Wrap an ASGI app."""
+        self.app = app
+        self.skip_paths = set(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not tracer.enabled or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        with tracer.span(f"{scope['method']} {scope['path']}", root=True) as root:
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    root.set_attribute("status", message["status"])
+                    headers = list(message.get("headers", []))
+                    headers.append((TRACE_HEADER, root.trace.trace_id.encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    root.name = f"{scope['method']} {route.path}"
@@ -1,4 +1,7 @@
 """Import all models here for Alembic autogenerate."""
 from app.models.booking import Booking
+from app.models.inventory import TripInventory
+from app.models.idempotency import IdempotencyKey
+from app.models.occupancy import RouteOccupancy
 
-__all__ = ["Booking"]
+__all__ = ["Booking", "TripInventory", "IdempotencyKey", "RouteOccupancy"]
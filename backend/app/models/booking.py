@@ -1,5 +1,5 @@
 """Database models for bookings."""
-from sqlalchemy import Column, Integer, String, DateTime, Enum, Date
+from sqlalchemy import Column, Integer, String, DateTime, Enum, Date, Index
 from datetime import datetime
 import enum
 
@@ -14,13 +14,19 @@ class BookingStatus(str, enum.Enum):
 
 
 class Booking(Base):
-    """Booking model for storing ticket bookings."""
+    """
+    Booking model for storing ticket bookings.
+    
+    On PostgreSQL the table is range-partitioned by travel_date (see
+    alembic revision 0004) with primary key (id, travel_date). The ORM keeps
+    id as the identity since it is unique on its own via the shared sequence.
+    """
     __tablename__ = "bookings"
     
     id = Column(Integer, primary_key=True, index=True)
     customer_name = Column(String, nullable=False)
-    customer_email = Column(String, nullable=False, index=True)
-    customer_phone = Column(String, nullable=False, index=True)
+    customer_email = Column(String, nullable=False)
+    customer_phone = Column(String, nullable=False)
     
     # Route information
     from_district = Column(String, nullable=False)
@@ -33,6 +39,7 @@ class Booking(Base):
     dropping_point = Column(String, nullable=True)
     total_fare = Column(Integer, nullable=False, default=0)
     status = Column(Enum(BookingStatus), default=BookingStatus.CONFIRMED)
+    expires_at = Column(DateTime, nullable=True)  # Hold expiry for PENDING bookings
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -40,3 +47,22 @@ class Booking(Base):
     
     def __repr__(self):
         return f"<Booking {self.id}: {self.customer_name} - {self.from_district} to {self.to_district}>"
+
+
+# Composite indexes for keyset pagination of a customer's bookings, newest first
+Index(
+    "ix_bookings_email_created_id",
+    Booking.customer_email, Booking.created_at.desc(), Booking.id.desc()
+)
+Index(
+    "ix_bookings_phone_created_id",
+    Booking.customer_phone, Booking.created_at.desc(), Booking.id.desc()
+)
+
+# Partial index so the hold sweeper only touches pending rows, ordered by expiry
+Index(
+    "ix_bookings_pending_expires_at",
+    Booking.expires_at,
+    postgresql_where=Booking.status == BookingStatus.PENDING,
+    sqlite_where=Booking.status == BookingStatus.PENDING
+)
@@ -0,0 +1,22 @@
+"""Database models for idempotent request handling."""
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class IdempotencyKey(Base):
+    """Stored response for a client-supplied Idempotency-Key."""
+    __tablename__ = "idempotency_keys"
+    
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<IdempotencyKey {self.key}: {self.status_code}>"
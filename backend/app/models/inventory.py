@@ -0,0 +1,37 @@
+"""Database models for per-trip seat inventory."""
+from sqlalchemy import Column, Integer, String, DateTime, Date, UniqueConstraint, CheckConstraint
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class TripInventory(Base):
+    """Seat capacity and remaining seats for a single trip on a given date."""
+    __tablename__ = "trip_inventory"
+    __table_args__ = (
+        UniqueConstraint(
+            "provider", "from_district", "to_district", "travel_date",
+            name="uq_trip_inventory_trip"
+        ),
+        CheckConstraint("seats_available >= 0", name="ck_trip_inventory_seats_non_negative"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    provider = Column(String, nullable=False)
+    from_district = Column(String, nullable=False)
+    to_district = Column(String, nullable=False)
+    travel_date = Column(Date, nullable=False)
+    
+    # Seat counters
+    capacity = Column(Integer, nullable=False)
+    seats_available = Column(Integer, nullable=False)
+    
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return (
+            f"<TripInventory {self.provider}: {self.from_district} to {self.to_district} "
+            f"on {self.travel_date} ({self.seats_available}/{self.capacity})>"
+        )
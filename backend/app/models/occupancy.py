@@ -0,0 +1,36 @@
+"""Database models for incrementally maintained route occupancy aggregates."""
+from sqlalchemy import Column, Integer, String, DateTime, Date, UniqueConstraint
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class RouteOccupancy(Base):
+    """Confirmed seats, bookings and revenue for one trip on one date."""
+    __tablename__ = "route_occupancy"
+    __table_args__ = (
+        UniqueConstraint(
+            "provider", "from_district", "to_district", "travel_date",
+            name="uq_route_occupancy_trip"
+        ),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    provider = Column(String, nullable=False)
+    from_district = Column(String, nullable=False)
+    to_district = Column(String, nullable=False)
+    travel_date = Column(Date, nullable=False, index=True)
+    
+    # Aggregates over confirmed bookings
+    seats_sold = Column(Integer, nullable=False, default=0)
+    bookings_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(Integer, nullable=False, default=0)
+    
+    # Timestamps
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return (
+            f"<RouteOccupancy {self.provider}: {self.from_district} to {self.to_district} "
+            f"on {self.travel_date} ({self.seats_sold} seats)>"
+        )
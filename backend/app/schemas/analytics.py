@@ -0,0 +1,38 @@
+"""Pydantic schemas for analytics endpoints."""
+from typing import List
+from pydantic import BaseModel
+from datetime import date
+
+
+class RouteOccupancyResponse(BaseModel):
+    """Confirmed seats and revenue for one trip on one date."""
+    provider: str
+    from_district: str
+    to_district: str
+    travel_date: date
+    seats_sold: int
+    bookings_count: int
+    revenue: int
+
+    class Config:
+        from_attributes = True
+
+
+class OccupancyListResponse(BaseModel):
+    """Response model for per-trip occupancy."""
+    trips: List[RouteOccupancyResponse]
+    total_trips: int
+
+
+class ProviderRevenueResponse(BaseModel):
+    """Totals for one bus provider."""
+    provider: str
+    seats_sold: int
+    bookings_count: int
+    revenue: int
+
+
+class RevenueListResponse(BaseModel):
+    """Response model for revenue per provider."""
+    providers: List[ProviderRevenueResponse]
+    total_revenue: int
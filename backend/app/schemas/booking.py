@@ -25,6 +25,11 @@ class BookingCreateRequest(BaseModel):
     dropping_point: Optional[str] = None
 
 
+class BulkBookingCreateRequest(BaseModel):
+    """Request model for booking several passengers at once."""
+    bookings: list[BookingCreateRequest] = Field(..., min_length=1, max_length=100)
+
+
 class BookingResponse(BaseModel):
     """Response model for booking details."""
     id: int
@@ -39,6 +44,7 @@ class BookingResponse(BaseModel):
     dropping_point: Optional[str]
     status: BookingStatus
     total_fare: int
+    expires_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
 
@@ -47,6 +53,14 @@ class BookingResponse(BaseModel):
 
 
 class BookingListResponse(BaseModel):
-    """Response model for list of bookings."""
+    """Response model for a page of bookings."""
+    bookings: list[BookingResponse]
+    total_bookings: int = Field(..., description="Number of bookings in this page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
+
+
+class BulkBookingResponse(BaseModel):
+    """Response model for a group booking."""
     bookings: list[BookingResponse]
     total_bookings: int
+    total_fare: int
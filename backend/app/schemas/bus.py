@@ -46,3 +46,13 @@ class BusProvidersListResponse(BaseModel):
     """Response model for list of bus providers."""
     providers: List[BusProviderResponse]
     total_providers: int
+
+
+class TripAvailabilityResponse(BaseModel):
+    """Response model for remaining seats on a trip."""
+    provider: str
+    from_district: str
+    to_district: str
+    travel_date: date
+    capacity: int
+    seats_available: int
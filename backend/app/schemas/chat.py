@@ -14,3 +14,4 @@ class ChatResponse(BaseModel):
     response: str
     conversation_id: str
     sources: List[dict] = []
+    degraded: bool = False  # True when answered from retrieval only because the LLM was unavailable
@@ -1,11 +1,11 @@
 """Business logic for bus-related operations."""
-from typing import List, Optional
-import json
-from pathlib import Path
+from typing import Dict, List, Optional
 
 from app.services.rag_service import get_rag_service
-from app.schemas.bus import RouteResponse, BusProviderResponse
+from app.services.pricing_service import get_pricing_service
+from app.schemas.bus import RouteResponse, BusProviderResponse, DroppingPoint
 from app.core.logging import logger
+from app.core.metrics import timed
 
 
 class BusService:
@@ -14,20 +14,22 @@ class BusService:
     def __init__(self):
         """Initialize bus service."""
         self.rag_service = get_rag_service()
-        self._load_data()
+        self.pricing_service = get_pricing_service()
     
-    def _load_data(self):
-        """Load bus data from context/data.json."""
-        # Navigate to project root and load data
-        project_root = Path(__file__).parent.parent.parent.parent
-        data_path = project_root / "context" / "data.json"
-        
-        with open(data_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        self.districts = {d["name"]: d for d in data["districts"]}
-        self.providers = {p["name"]: p for p in data["bus_providers"]}
-        logger.info(f"Loaded {len(self.districts)} districts and {len(self.providers)} providers")
+    @property
+    def districts(self) -> Dict[str, Dict]:
+        """Districts keyed by name, shared with the pricing index."""
+        return self.pricing_service.districts
+    
+    @property
+    def providers(self) -> Dict[str, Dict]:
+        """Bus providers keyed by name, shared with the pricing index."""
+        return self.pricing_service.providers
+    
+    @staticmethod
+    def route_query(from_district: str, to_district: str) -> str:
+        """Vector store query used to find routes between two districts."""
+        return f"routes from {from_district} to {to_district}"
     
     async def search_buses(
         self,
@@ -52,76 +54,66 @@ class BusService:
         if to_district not in self.districts:
             raise ValueError(f"Unknown destination district: {to_district}")
         
-        # Build search query for vector store
-        query = f"routes from {from_district} to {to_district}"
-        
-        # Query the vector store directly to get route documents
-        logger.info(f"Searching routes: {query}")
-        vector_store = self.rag_service.vector_store
-        
-        # Retrieve relevant documents
-        docs = vector_store.similarity_search(query, k=10)
-        
-        # Parse routes from documents
-        routes = []
-        seen_providers = set()
-        
-        for doc in docs:
-            metadata = doc.metadata
-            
-            # Filter by route type and matching origin/destination
-            if (metadata.get("type") != "route" or 
-                metadata.get("from") != from_district or
-                metadata.get("to") != to_district):
-                continue
-            
-            provider_name = metadata.get("provider")
+        with timed("bus_service", "search_buses"):
+            # Build search query for vector store
+            query = self.route_query(from_district, to_district)
+        
+            # Query the vector store directly to get route documents
+            logger.info(f"Searching routes: {query}")
+            vector_store = self.rag_service.vector_store
+        
+            # Retrieve relevant documents
+            with timed("bus_service", "embedding"):
+                query_vector = await self.rag_service.aembed_query(query)
+            with timed("bus_service", "vector_search"):
+                docs = vector_store.similarity_search_by_vector(query_vector, k=10)
+        
+            # Fares come from the pricing index rather than the document text. Every route
+            # in a search shares the destination, so its dropping points are built once.
+            # Index entries already have the schema's types, so models skip validation here.
+            dropping_points = [
+                DroppingPoint.model_construct(name=dp["name"], price=dp["price"])
+                for dp in self.pricing_service.get_dropping_points(to_district)
+            ]
+            prices = [dp.price for dp in dropping_points]
+            min_price = min(prices) if prices else 0
+            max_price = max(prices) if prices else 0
+        
+            # Parse routes from documents
+            routes = []
+            seen_providers = set()
+        
+            for doc in docs:
+                metadata = doc.metadata
             
-            # Apply provider filter if specified
-            if provider and provider.lower() != provider_name.lower():
-                continue
-            
-            # Avoid duplicate providers
-            if provider_name in seen_providers:
-                continue
-            seen_providers.add(provider_name)
+                # Filter by route type and matching origin/destination
+                if (metadata.get("type") != "route" or 
+                    metadata.get("from") != from_district or
+                    metadata.get("to") != to_district):
+                    continue
             
-            # Parse dropping points from document content
-            content = doc.page_content
-            dropping_points = []
+                provider_name = metadata.get("provider")
             
-            # Extract dropping points from content
-            # Format: - <name>: ৳<price>
-            import re
-            pattern = r'-\s+(.+?):\s+৳(\d+)'
-            matches = re.findall(pattern, content)
+                # Apply provider filter if specified
+                if provider and provider.lower() != provider_name.lower():
+                    continue
             
-            for name, price in matches:
-                dropping_points.append({
-                    "name": name.strip(),
-                    "price": int(price)
-                })
+                # Avoid duplicate providers
+                if provider_name in seen_providers:
+                    continue
+                seen_providers.add(provider_name)
             
-            # Get min/max prices from metadata or calculate from dropping points
-            min_price = metadata.get("min_price", 0)
-            max_price = metadata.get("max_price", 0)
-            
-            if not min_price and dropping_points:
-                prices = [dp["price"] for dp in dropping_points]
-                min_price = min(prices)
-                max_price = max(prices)
-            
-            routes.append(RouteResponse(
-                provider=provider_name,
-                from_district=from_district,
-                to_district=to_district,
-                min_price=min_price,
-                max_price=max_price,
-                dropping_points=dropping_points,
-                description=f"{provider_name} operates on this route"
-            ))
-        
-        return routes
+                routes.append(RouteResponse.model_construct(
+                    provider=provider_name,
+                    from_district=from_district,
+                    to_district=to_district,
+                    min_price=min_price,
+                    max_price=max_price,
+                    dropping_points=dropping_points,
+                    description=f"{provider_name} operates on this route"
+                ))
+        
+            return routes
     
     def get_all_providers(self, district: Optional[str] = None) -> List[BusProviderResponse]:
         """
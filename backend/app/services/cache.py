@@ -0,0 +1,399 @@
+"""Pluggable cache backends and the read-through booking cache."""
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import cache_requests_total
+
+
+class CacheBackend:
+    """Interface for key/value cache backends storing JSON-serializable values."""
+
+    # Whether calls wait on the network; async callers run those in a worker thread
+    blocking = False
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value, or None if missing or expired."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value with an optional time-to-live in seconds."""
+        raise NotImplementedError
+
+    def delete(self, *keys: str) -> None:
+        """Remove keys if present."""
+        raise NotImplementedError
+
+
+class NullCacheBackend(CacheBackend):
+    """Backend that never stores anything, used when caching is disabled."""
+
+    def get(self, key: str) -> Optional[Any]:
+        return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        pass
+
+    def delete(self, *keys: str) -> None:
+        pass
+
+
+class LRUCacheBackend(CacheBackend):
+    """Bounded in-process LRU cache with per-entry expiry."""
+
+    def __init__(self, max_entries: int, default_ttl: Optional[float] = None):
+        """Initialize an empty cache holding at most max_entries items."""
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = ttl if ttl is not None else self.default_ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis-backed cache shared by all workers of a deployment."""
+
+    blocking = True
+
+    def __init__(self, url: str, default_ttl: Optional[float] = None, prefix: str = "tba:"):
+        """Connect to Redis; requires the optional redis package."""
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("The redis package is required for the redis cache backend (pip install redis)")
+        self.client = redis.Redis.from_url(url)
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = ttl if ttl is not None else self.default_ttl
+        self.client.set(self.prefix + key, json.dumps(value, default=str), ex=int(ttl) if ttl else None)
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+
+def create_cache_backend(name: str, max_entries: int, ttl: Optional[float]) -> CacheBackend:
+    """
+    Create a cache backend by name.
+
+    Args:
+        name: 'memory', 'redis' or 'none'
+        max_entries: Capacity of the in-process LRU backend
+        ttl: Default entry time-to-live in seconds
+
+    Returns:
+        Configured cache backend
+    """
+    if name == "memory":
+        return LRUCacheBackend(max_entries, ttl)
+    if name == "redis":
+        return RedisCacheBackend(settings.REDIS_URL, ttl)
+    if name == "none":
+        return NullCacheBackend()
+    raise ValueError(f"Unknown cache backend: {name}")
+
+
+class CacheStats:
+    """Hit and miss counters per cache namespace."""
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def record(self, namespace: str, hit: bool):
+        """Count a lookup in a namespace."""
+        with self._lock:
+            counts = self._counts.setdefault(namespace, {"hits": 0, "misses": 0})
+            counts["hits" if hit else "misses"] += 1
+        cache_requests_total.inc(cache=namespace, result="hit" if hit else "miss")
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return counters and hit ratios per namespace."""
+        with self._lock:
+            result = {}
+            for namespace, counts in self._counts.items():
+                total = counts["hits"] + counts["misses"]
+                result[namespace] = {
+                    **counts,
+                    "hit_ratio": round(counts["hits"] / total, 4) if total else 0.0,
+                }
+            return result
+
+
+class BackendCache:
+    """Base for caches layered on a backend, with hit/miss statistics."""
+
+    def __init__(self, backend: CacheBackend):
+        """Initialize the cache on top of a backend."""
+        self.backend = backend
+        self.stats = CacheStats()
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Call a cache method from async code without blocking the event loop.
+
+        Network backends (Redis) run in a worker thread; in-process backends
+        are called directly, since a thread hop would cost more than the lookup.
+        """
+        if self.backend.blocking:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+        return fn(*args, **kwargs)
+
+
+class BookingCache(BackendCache):
+    """
+    Read-through cache for single bookings and per-customer booking pages.
+
+    Entries are stored under version tokens (one per booking ID and one per
+    customer email or phone) that are read before the database query. Writes
+    replace the token instead of deleting entries, so invalidation is O(1)
+    on any backend, and a miss that read the database before a concurrent
+    write stores its result under the old token, where nobody looks it up.
+    Old entries simply age out. All tokens also include a generation that
+    invalidate_all() replaces after bulk deletes (archiving, partition
+    retention). A token that expired or was evicted is replaced by a fresh
+    one, which can only cause misses, never stale hits. Endpoints call it
+    through run(), so Redis round trips happen off the event loop.
+    """
+
+    def _token(self, key: str, ttl: Optional[float] = None) -> str:
+        token = self.backend.get(key)
+        if token is None:
+            token = uuid.uuid4().hex
+            self.backend.set(key, token, ttl=ttl)
+        return token
+
+    def _version_key(self, field: str, value: Any) -> str:
+        # The generation never expires (ttl=0), so it only changes through invalidate_all
+        return f"bookings:ver:{self._token('bookings:gen', ttl=0)}:{field}:{value}"
+
+    def _version(self, field: str, value: Any) -> str:
+        """Get the current version token for a booking ID or a customer's booking pages."""
+        return self._token(self._version_key(field, value))
+
+    def get_booking(self, booking_id: int, loader: Callable[[], Optional[Dict]]) -> Optional[Dict]:
+        """
+        Get a booking by ID, loading and caching it on a miss.
+
+        Args:
+            booking_id: Booking ID
+            loader: Returns the serialized booking, or None if it doesn't exist
+
+        Returns:
+            Serialized booking or None
+        """
+        # The token is read before the loader queries the database
+        key = f"booking:{booking_id}:{self._version('id', booking_id)}"
+        cached = self.backend.get(key)
+        self.stats.record("booking", cached is not None)
+        if cached is not None:
+            return cached
+
+        booking = loader()
+        if booking is not None:
+            self.backend.set(key, booking)
+        return booking
+
+    def get_page(
+        self,
+        field: str,
+        value: str,
+        limit: int,
+        cursor: Optional[str],
+        loader: Callable[[], Dict]
+    ) -> Dict:
+        """
+        Get a page of a customer's bookings, loading and caching it on a miss.
+
+        Args:
+            field: 'email' or 'phone'
+            value: Customer email or phone
+            limit: Page size
+            cursor: Pagination cursor
+            loader: Returns the serialized page
+
+        Returns:
+            Serialized booking page
+        """
+        # The token is read before the loader queries the database
+        key = f"bookings:list:{field}:{value}:{self._version(field, value)}:{limit}:{cursor or ''}"
+        cached = self.backend.get(key)
+        self.stats.record("booking_list", cached is not None)
+        if cached is not None:
+            return cached
+
+        page = loader()
+        self.backend.set(key, page)
+        return page
+
+    def invalidate(self, booking_id: Optional[int] = None, email: Optional[str] = None, phone: Optional[str] = None):
+        """
+        Drop cached data affected by a booking write.
+
+        Args:
+            booking_id: Booking whose cached details changed
+            email: Customer email whose pages changed
+            phone: Customer phone whose pages changed
+        """
+        try:
+            for field, value in (("id", booking_id), ("email", email), ("phone", phone)):
+                if value is not None and value != "":
+                    self.backend.set(self._version_key(field, value), uuid.uuid4().hex)
+        except Exception as e:
+            logger.error(f"Error invalidating booking cache: {str(e)}")
+
+    def invalidate_all(self):
+        """Drop every cached booking and page, e.g. after bookings were deleted in bulk."""
+        try:
+            self.backend.set("bookings:gen", uuid.uuid4().hex, ttl=0)
+        except Exception as e:
+            logger.error(f"Error invalidating booking cache: {str(e)}")
+
+
+class RAGCache(BackendCache):
+    """
+    Caches for the chat and search pipeline: query embeddings, retrieved documents and answers.
+
+    Keys are derived from the whitespace- and case-normalized query, so
+    trivially different spellings of a question share entries. Embeddings
+    depend only on the model and never expire; retrieved documents and
+    answers expire after the configured TTL so re-ingested data shows up.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: Optional[float]):
+        """Initialize the cache on top of a backend."""
+        super().__init__(backend)
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(kind: str, query: str, *parts: Any) -> str:
+        normalized = " ".join(query.lower().split())
+        digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+        return ":".join(["rag", kind, *(str(p) for p in parts), digest])
+
+    def get_embedding(self, query: str, loader: Callable[[], List[float]]) -> List[float]:
+        """
+        Get a query embedding, computing and caching it on a miss.
+
+        Args:
+            query: Text to embed
+            loader: Computes the embedding
+
+        Returns:
+            Embedding vector
+        """
+        key = self._key("emb", query, settings.EMBEDDING_BACKEND)
+        cached = self.backend.get(key)
+        self.stats.record("rag_embedding", cached is not None)
+        if cached is not None:
+            return cached
+
+        vector = list(loader())
+        # A TTL of 0 stores without expiry: the same model always gives the same vector
+        self.backend.set(key, vector, ttl=0)
+        return vector
+
+    def get_documents(self, query: str, k: int, loader: Callable[[], List[Dict]]) -> List[Dict]:
+        """
+        Get retrieved documents for a query, loading and caching them on a miss.
+
+        Args:
+            query: Retrieval query
+            k: Number of documents retrieved
+            loader: Returns documents as {'page_content', 'metadata'} dicts
+
+        Returns:
+            Serialized documents
+        """
+        key = self._key("docs", query, k)
+        cached = self.backend.get(key)
+        self.stats.record("rag_retrieval", cached is not None)
+        if cached is not None:
+            return cached
+
+        documents = loader()
+        self.backend.set(key, documents, ttl=self.ttl)
+        return documents
+
+    def get_answer(self, query: str) -> Optional[Dict]:
+        """Get a cached chat answer ('answer' and 'sources'), or None."""
+        cached = self.backend.get(self._key("answer", query))
+        self.stats.record("rag_answer", cached is not None)
+        return cached
+
+    def set_answer(self, query: str, answer: Dict) -> None:
+        """Cache a chat answer; degraded (fallback) answers must not be stored."""
+        self.backend.set(self._key("answer", query), answer, ttl=self.ttl)
+
+
+# Global instances
+_booking_cache = None
+_rag_cache = None
+
+def get_booking_cache() -> BookingCache:
+    """Get or create the global booking cache instance."""
+    global _booking_cache
+    if _booking_cache is None:
+        _booking_cache = BookingCache(create_cache_backend(
+            settings.BOOKING_CACHE_BACKEND,
+            settings.BOOKING_CACHE_MAX_ENTRIES,
+            settings.BOOKING_CACHE_TTL_SECONDS
+        ))
+    return _booking_cache
+
+
+def get_rag_cache() -> RAGCache:
+    """Get or create the global RAG cache instance."""
+    global _rag_cache
+    if _rag_cache is None:
+        _rag_cache = RAGCache(
+            create_cache_backend(
+                settings.RAG_CACHE_BACKEND,
+                settings.RAG_CACHE_MAX_ENTRIES,
+                settings.RAG_CACHE_TTL_SECONDS
+            ),
+            settings.RAG_CACHE_TTL_SECONDS
+        )
+    return _rag_cache
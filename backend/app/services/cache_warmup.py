@@ -0,0 +1,148 @@
+"""Background warming of the RAG caches from historically frequent queries."""
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+import asyncio
+import glob
+import json
+import re
+import time
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.logging import logger
+
+# Placeholders left by query log scrubbing; such queries are personal, not worth warming
+SCRUBBED = re.compile(r"<(?:email|phone|number|name)>")
+
+# Progress of this process's warmup, reported by /health/cache
+warmup_stats: Dict[str, Any] = {
+    "status": "pending",
+    "queries": 0,
+    "warmed": 0,
+    "failed": 0,
+    "elapsed_s": 0.0,
+}
+
+
+def read_queries_file(path: str) -> List[Tuple[str, Any]]:
+    """Chat queries from a text file, one per line in priority order; '#' starts a comment."""
+    items = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            items.append(("chat", line))
+    return items
+
+
+def rank_logged_queries(pattern: str) -> List[Tuple[str, Any]]:
+    """Successful chat queries and route searches from the query log, most frequent first."""
+    counts = Counter()
+    for path in glob.glob(pattern):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("status") != 200:
+                    continue
+                if record.get("kind") == "chat":
+                    query = " ".join(record.get("query", "").split())
+                    if query and not SCRUBBED.search(query):
+                        counts[("chat", query)] += 1
+                elif record.get("kind") == "search":
+                    params = record.get("params") or {}
+                    if params.get("from_district") and params.get("to_district"):
+                        counts[("search", (params["from_district"], params["to_district"]))] += 1
+    return [item for item, _ in counts.most_common()]
+
+
+def load_warmup_queries(max_queries: int) -> List[Tuple[str, Any]]:
+    """
+    Build the ranked warmup list.
+
+    Queries from WARMUP_QUERIES_FILE come first, followed by the query log's
+    most frequent chat queries and routes; duplicates are dropped.
+
+    Args:
+        max_queries: Maximum number of items to return
+
+    Returns:
+        ('chat', query) and ('search', (from_district, to_district)) items
+    """
+    items = []
+    if settings.WARMUP_QUERIES_FILE:
+        try:
+            items += read_queries_file(settings.WARMUP_QUERIES_FILE)
+        except OSError as e:
+            logger.warning(f"Cannot read warmup queries file: {str(e)}")
+    items += rank_logged_queries(str(Path(settings.QUERY_LOG_DIR) / "queries*.jsonl*"))
+
+    seen = set()
+    ranked = []
+    for kind, payload in items:
+        key = (kind, payload.lower() if kind == "chat" else payload)
+        if key not in seen:
+            seen.add(key)
+            ranked.append((kind, payload))
+    return ranked[:max_queries]
+
+
+async def warm_caches(chat: bool, answers: bool) -> Dict[str, Any]:
+    """
+    Precompute embeddings, retrieval results and (optionally) answers for frequent queries.
+
+    Runs after the app is ready, so it never delays readiness. Chat answers
+    are only precomputed when asked, since each costs an agent run. At most
+    WARMUP_CONCURRENCY queries are in flight at once, and whatever is left
+    when WARMUP_TIME_BUDGET_SECONDS runs out is skipped. Live requests for
+    the same queries simply hit the caches as they fill.
+
+    Args:
+        chat: Whether this role serves chat; otherwise only route searches are warmed
+        answers: Also run the agent for chat queries to fill the answer cache
+
+    Returns:
+        Warmup statistics
+    """
+    # Imported here so the module stays importable without langchain
+    from app.services.bus_service import BusService
+    from app.services.rag_service import get_rag_service
+
+    start = time.perf_counter()
+    warmup_stats["status"] = "running"
+    rag_service = get_rag_service()
+    items = await asyncio.to_thread(load_warmup_queries, settings.WARMUP_MAX_QUERIES)
+    if not chat:
+        items = [item for item in items if item[0] == "search"]
+    warmup_stats["queries"] = len(items)
+    semaphore = asyncio.Semaphore(settings.WARMUP_CONCURRENCY)
+
+    async def warm(kind: str, payload: Any):
+        async with semaphore:
+            try:
+                if kind == "search":
+                    await asyncio.to_thread(rag_service.embed_query, BusService.route_query(*payload))
+                else:
+                    await asyncio.to_thread(rag_service._retrieve, payload)
+                    if answers:
+                        await rag_service.get_answer(payload)
+                warmup_stats["warmed"] += 1
+            except Exception as e:
+                warmup_stats["failed"] += 1
+                logger.warning(f"Cache warmup failed for {kind} query: {str(e)}")
+
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(warm(kind, payload) for kind, payload in items)),
+            settings.WARMUP_TIME_BUDGET_SECONDS
+        )
+        warmup_stats["status"] = "done"
+    except asyncio.TimeoutError:
+        warmup_stats["status"] = "budget_exhausted"
+    warmup_stats["elapsed_s"] = round(time.perf_counter() - start, 2)
+    logger.info(
+        f"Cache warmup {warmup_stats['status']}: {warmup_stats['warmed']}/{len(items)} queries "
+        f"in {warmup_stats['elapsed_s']}s"
+    )
+    return warmup_stats
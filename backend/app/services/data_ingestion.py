@@ -1,10 +1,10 @@
 """Data ingestion service for populating ChromaDB with bus route and provider information."""
 import json
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 from langchain_chroma import Chroma
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -12,21 +12,20 @@ load_dotenv()
 
 from app.core.config import settings
 from app.core.logging import logger
+from app.services.embeddings import get_embeddings
+
+# Documents per Chroma write; a single call is capped by Chroma's max batch size
+INGEST_BATCH_SIZE = 1000
 
 
 class DataIngestionService:
     """Service for ingesting data into ChromaDB vector store."""
     
-    def __init__(self):
+    def __init__(self, embeddings: Optional[Embeddings] = None):
         """Initialize the data ingestion service."""
-        # Initialize HuggingFace embeddings (local, free, no API limits)
-        # all-MiniLM-L6-v2: Fast, efficient, perfect for short texts like bus routes
-        logger.info("Initializing HuggingFace embeddings model (all-MiniLM-L6-v2)...")
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2",
-            model_kwargs={'device': 'cpu'},  # Use CPU (or 'cuda' for GPU)
-            encode_kwargs={'normalize_embeddings': True}  # Normalize for better similarity search
-        )
+        # Local all-MiniLM-L6-v2 embeddings (free, no API limits); the backend
+        # (PyTorch or quantized ONNX) is selected by EMBEDDING_BACKEND
+        self.embeddings = embeddings or get_embeddings()
         
         # Initialize Chroma vector store
         self.vector_store = Chroma(
@@ -38,18 +37,16 @@ class DataIngestionService:
         logger.info("Data ingestion service initialized with local embeddings")
     
     def load_json_data(self) -> Dict:
-        """Load data from context/data.json file."""
-        # Go up from backend/app/services to project root
-        data_path = Path(__file__).parent.parent.parent.parent / "context" / "data.json"
+        """Load data from CONTEXT_DIR/data.json."""
+        data_path = Path(settings.CONTEXT_DIR) / "data.json"
         with open(data_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
-        logger.info("Loaded JSON data from context/data.json")
+        logger.info(f"Loaded JSON data from {data_path}")
         return data
     
     def load_provider_documents(self) -> Dict[str, str]:
-        """Load bus provider documents from context/attachment folder."""
-        # Go up from backend/app/services to project root
-        attachment_path = Path(__file__).parent.parent.parent.parent / "context" / "attachment"
+        """Load bus provider documents from CONTEXT_DIR/attachment."""
+        attachment_path = Path(settings.CONTEXT_DIR) / "attachment"
         provider_docs = {}
         
         for doc_file in attachment_path.glob("*.txt"):
@@ -191,10 +188,8 @@ To District: {to_district}
         logger.info(f"Created {len(documents)} route documents")
         return documents
     
-    def ingest_all_data(self):
-        """Ingest all data into ChromaDB."""
-        logger.info("Starting data ingestion...")
-        
+    def build_documents(self) -> List[Dict]:
+        """Build every district, provider and route document from the source data."""
         # Load data
         json_data = self.load_json_data()
         provider_docs = self.load_provider_documents()
@@ -205,7 +200,12 @@ To District: {to_district}
         route_docs = self.create_route_documents(json_data)
         
         # Combine all documents
-        all_documents = district_docs + provider_docs_list + route_docs
+        return district_docs + provider_docs_list + route_docs
+    
+    def ingest_all_data(self):
+        """Ingest all data into ChromaDB."""
+        logger.info("Starting data ingestion...")
+        all_documents = self.build_documents()
         
         # Convert to LangChain Document format
         langchain_docs = []
@@ -219,10 +219,11 @@ To District: {to_district}
             
         # Clear existing documents to ensure a fresh start
         try:
-            existing_ids = self.vector_store.get()["ids"]
+            existing_ids = self.vector_store.get(include=[])["ids"]
             if existing_ids:
                 logger.info(f"Deleting {len(existing_ids)} existing documents...")
-                self.vector_store.delete(ids=existing_ids)
+                for start in range(0, len(existing_ids), INGEST_BATCH_SIZE):
+                    self.vector_store.delete(ids=existing_ids[start:start + INGEST_BATCH_SIZE])
                 logger.info("Existing documents deleted.")
         except Exception as e:
             logger.warning(f"Could not clear existing documents: {e}")
@@ -230,7 +231,11 @@ To District: {to_district}
         # Add to ChromaDB using LangChain's Chroma
         logger.info(f"Adding {len(langchain_docs)} documents to ChromaDB...")
         ids = [doc["id"] for doc in all_documents]
-        self.vector_store.add_documents(documents=langchain_docs, ids=ids)
+        for start in range(0, len(langchain_docs), INGEST_BATCH_SIZE):
+            end = start + INGEST_BATCH_SIZE
+            self.vector_store.add_documents(documents=langchain_docs[start:end], ids=ids[start:end])
+            if len(langchain_docs) > INGEST_BATCH_SIZE:
+                logger.info(f"Added {min(end, len(langchain_docs))}/{len(langchain_docs)} documents")
         
         logger.info(f"Successfully ingested {len(all_documents)} documents into ChromaDB")
         return len(all_documents)
@@ -243,7 +248,7 @@ To District: {to_district}
     def get_collection_count(self) -> int:
         """Get the number of documents in the collection."""
         # Get the underlying collection from Chroma
-        return len(self.vector_store.get()['ids'])
+        return len(self.vector_store.get(include=[])['ids'])
 
 
 # Standalone function to run ingestion
@@ -0,0 +1,61 @@
+"""Process-wide embedding model shared by retrieval, search and ingestion."""
+import threading
+
+from langchain_core.embeddings import Embeddings
+
+from app.core.config import settings
+from app.core.logging import logger
+
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+EMBEDDING_BACKENDS = ("huggingface", "onnx")
+
+_embeddings = None
+_embeddings_lock = threading.Lock()
+
+
+def create_embeddings(backend: str) -> Embeddings:
+    """
+    Load a new embedding model for a backend.
+
+    Args:
+        backend: 'huggingface' (PyTorch sentence-transformers) or 'onnx'
+            (the same model exported to ONNX, int8-quantized by default)
+
+    Returns:
+        LangChain embeddings instance
+    """
+    if backend == "huggingface":
+        from langchain_huggingface import HuggingFaceEmbeddings
+
+        logger.info("Initializing HuggingFace embeddings (all-MiniLM-L6-v2)...")
+        return HuggingFaceEmbeddings(
+            model_name=EMBEDDING_MODEL_NAME,
+            model_kwargs={'device': 'cpu'},
+            encode_kwargs={'normalize_embeddings': True}
+        )
+    if backend == "onnx":
+        from app.services.onnx_embeddings import OnnxEmbeddings
+
+        logger.info(f"Initializing ONNX embeddings from {settings.ONNX_MODEL_DIR} (quantized={settings.ONNX_QUANTIZED})...")
+        return OnnxEmbeddings(
+            settings.ONNX_MODEL_DIR,
+            quantized=settings.ONNX_QUANTIZED,
+            intra_op_threads=settings.ONNX_INTRA_OP_THREADS
+        )
+    raise ValueError(f"Unknown EMBEDDING_BACKEND '{backend}'; expected one of: {', '.join(EMBEDDING_BACKENDS)}")
+
+
+def get_embeddings() -> Embeddings:
+    """
+    Get or load the global embedding model selected by EMBEDDING_BACKEND.
+
+    Loading once per process (or once in a pre-fork master, see
+    scripts/serve.py) keeps a single copy of the model weights in memory.
+    """
+    global _embeddings
+    if _embeddings is None:
+        with _embeddings_lock:
+            if _embeddings is None:
+                _embeddings = create_embeddings(settings.EMBEDDING_BACKEND)
+    return _embeddings
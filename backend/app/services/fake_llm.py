@@ -0,0 +1,99 @@
+"""Local stand-in for the Gemini chat model, for load tests and offline development."""
+from typing import Any, List, Optional
+import asyncio
+import random
+import time
+import uuid
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+class FakeLLMError(Exception):
+    """Injected model failure."""
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Deterministic chat model that drives the RAG agent without network calls.
+
+    It follows the same two-step shape as a real run: the first call asks
+    for the bound retrieval tool with the user's question, and once the tool
+    result is in the conversation it answers from the retrieved documents.
+    Each call sleeps for latency_ms and raises FakeLLMError with probability
+    error_rate, so timeouts, the concurrency cap and the circuit breaker can
+    be exercised locally.
+    """
+
+    latency_ms: float = 200.0
+    error_rate: float = 0.0
+    tool_name: Optional[str] = None
+    max_answer_chars: int = 1200
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def bind_tools(self, tools: List[Any], **kwargs: Any) -> "FakeChatModel":
+        """Remember the first tool's name; the fake model only ever calls that one."""
+        name = None
+        if tools:
+            first = tools[0]
+            name = getattr(first, "name", None) or getattr(first, "__name__", None)
+        return self.model_copy(update={"tool_name": name})
+
+    def _respond(self, messages: List[BaseMessage]) -> ChatResult:
+        if self.error_rate > 0 and random.random() < self.error_rate:
+            raise FakeLLMError("Injected fake LLM failure")
+
+        last = messages[-1] if messages else None
+        if isinstance(last, ToolMessage) or self.tool_name is None:
+            message = AIMessage(content=self._answer(messages))
+        else:
+            question = next(
+                (m.content for m in reversed(messages) if isinstance(m, HumanMessage)), ""
+            )
+            message = AIMessage(
+                content="",
+                tool_calls=[{
+                    "name": self.tool_name,
+                    "args": {"query": question},
+                    "id": f"call_{uuid.uuid4().hex[:12]}",
+                }]
+            )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _answer(self, messages: List[BaseMessage]) -> str:
+        """Answer from the latest tool result, or echo the question without one."""
+        for message in reversed(messages):
+            if isinstance(message, ToolMessage):
+                chunks = [
+                    part.split("Content:", 1)[-1].strip()
+                    for part in str(message.content).split("\n\n")
+                    if part.strip()
+                ]
+                return ("Here is what I found:\n" + "\n".join(chunks))[:self.max_answer_chars]
+            if isinstance(message, HumanMessage):
+                return f"I don't have information about: {message.content}"
+        return "I don't have that information."
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        time.sleep(self.latency_ms / 1000)
+        return self._respond(messages)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        await asyncio.sleep(self.latency_ms / 1000)
+        return self._respond(messages)
@@ -0,0 +1,101 @@
+"""Expiry of pending-booking seat holds."""
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app.models.booking import Booking, BookingStatus
+from app.core.database import SessionLocal
+from app.services.inventory_service import get_inventory_service
+from app.services.cache import get_booking_cache
+
+
+class HoldService:
+    """
+    Service that releases pending bookings whose hold has expired.
+
+    Each batch selects expired holds through the partial index on pending
+    rows with FOR UPDATE SKIP LOCKED. Rows being confirmed or cancelled by a
+    live request are locked and simply skipped until the next sweep, so the
+    sweeper never waits on bookings and its cost grows with the number of
+    expired holds rather than with the size of the table.
+    """
+
+    def __init__(self):
+        """Initialize hold service."""
+        self.inventory = get_inventory_service()
+        self.booking_cache = get_booking_cache()
+
+    def _release_batch(self, batch_size: int) -> int:
+        """Expire one batch of holds in its own transaction."""
+        db = SessionLocal()
+        try:
+            expired = db.execute(
+                select(Booking)
+                .where(
+                    Booking.status == BookingStatus.PENDING,
+                    Booking.expires_at <= datetime.utcnow()
+                )
+                .order_by(Booking.expires_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            ).scalars().all()
+
+            if not expired:
+                return 0
+
+            seats_by_trip = defaultdict(int)
+            customers = set()
+            for booking in expired:
+                booking.status = BookingStatus.CANCELLED
+                seats_by_trip[(
+                    booking.provider,
+                    booking.from_district,
+                    booking.to_district,
+                    booking.travel_date
+                )] += booking.num_seats
+                customers.add((booking.id, booking.customer_email, booking.customer_phone))
+
+            # One inventory update per trip, in a fixed order to avoid lock-order deadlocks
+            for trip in sorted(seats_by_trip):
+                self.inventory.release_seats(db, *trip, seats_by_trip[trip])
+
+            db.commit()
+
+            for booking_id, customer_email, customer_phone in customers:
+                self.booking_cache.invalidate(booking_id=booking_id, email=customer_email, phone=customer_phone)
+            return len(expired)
+
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def release_expired(self, batch_size: int) -> int:
+        """
+        Release all currently expired holds in batches.
+
+        Args:
+            batch_size: Maximum holds released per transaction
+
+        Returns:
+            Number of holds released
+        """
+        total = 0
+        while True:
+            released = self._release_batch(batch_size)
+            total += released
+            if released < batch_size:
+                return total
+
+
+# Global instance
+_hold_service = None
+
+def get_hold_service() -> HoldService:
+    """Get or create the global hold service instance."""
+    global _hold_service
+    if _hold_service is None:
+        _hold_service = HoldService()
+    return _hold_service
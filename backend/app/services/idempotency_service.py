@@ -0,0 +1,131 @@
+"""Idempotency-Key handling for safely retried write requests."""
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.models.idempotency import IdempotencyKey
+from app.core.config import settings
+from app.core.logging import logger
+from app.utils.sql import insert_ignore
+
+
+class IdempotencyConflictError(Exception):
+    """Raised when a key is reused with a different request payload."""
+
+
+class IdempotencyService:
+    """
+    Service for claiming idempotency keys and replaying stored responses.
+
+    A key is claimed by inserting its row inside the caller's transaction and
+    the response is written to the same row before commit, so a committed key
+    always carries its response. A concurrent request with the same key blocks
+    on the primary key until the first transaction finishes: it then either
+    reads the committed response or, if the first request rolled back, claims
+    the key itself.
+    """
+
+    def fingerprint(self, payload: Dict[str, Any]) -> str:
+        """Hash a request payload so key reuse with a different body is detected."""
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def claim(self, db: Session, key: str, request_hash: str) -> Optional[Tuple[int, Dict]]:
+        """
+        Claim a key for the current transaction.
+
+        Args:
+            db: Database session (the caller owns the transaction)
+            key: Client-supplied idempotency key
+            request_hash: Fingerprint of the request payload
+
+        Returns:
+            None if the key was claimed and the request should be executed,
+            otherwise the stored (status_code, body) to replay
+
+        Raises:
+            IdempotencyConflictError: If the key was used for a different payload
+        """
+        now = datetime.utcnow()
+
+        # Expired keys behave as if they were never used
+        db.execute(
+            delete(IdempotencyKey)
+            .where(IdempotencyKey.key == key, IdempotencyKey.expires_at <= now)
+            .execution_options(synchronize_session=False)
+        )
+
+        inserted = insert_ignore(db, IdempotencyKey, {
+            "key": key,
+            "request_hash": request_hash,
+            "created_at": now,
+            "expires_at": now + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS),
+        })
+        if inserted:
+            return None
+
+        record = db.execute(
+            select(IdempotencyKey).where(IdempotencyKey.key == key)
+        ).scalar_one()
+        if record.request_hash != request_hash:
+            raise IdempotencyConflictError(
+                "Idempotency-Key has already been used with a different request"
+            )
+
+        logger.info(f"Replaying stored response for idempotency key {key}")
+        return record.status_code, json.loads(record.response_body)
+
+    def complete(self, db: Session, key: str, status_code: int, body: Dict[str, Any]) -> None:
+        """
+        Store the response for a claimed key; committed with the caller's transaction.
+
+        Args:
+            db: Database session holding the claim
+            key: Client-supplied idempotency key
+            status_code: HTTP status code of the response
+            body: JSON-serializable response body
+        """
+        record = db.get(IdempotencyKey, key)
+        record.status_code = status_code
+        record.response_body = json.dumps(body, default=str)
+
+    def purge_expired(self, db: Session, batch_size: int = 1000) -> int:
+        """
+        Delete expired keys in small committed batches.
+
+        Args:
+            db: Database session
+            batch_size: Maximum rows deleted per transaction
+
+        Returns:
+            Number of keys deleted
+        """
+        total = 0
+        while True:
+            expired = select(IdempotencyKey.key).where(
+                IdempotencyKey.expires_at <= datetime.utcnow()
+            ).limit(batch_size)
+            deleted = db.execute(
+                delete(IdempotencyKey)
+                .where(IdempotencyKey.key.in_(expired))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+            total += deleted
+            if deleted < batch_size:
+                return total
+
+
+# Global instance
+_idempotency_service = None
+
+def get_idempotency_service() -> IdempotencyService:
+    """Get or create the global idempotency service instance."""
+    global _idempotency_service
+    if _idempotency_service is None:
+        _idempotency_service = IdempotencyService()
+    return _idempotency_service
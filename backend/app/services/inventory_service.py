@@ -0,0 +1,185 @@
+"""Seat inventory management with contention-safe reservations."""
+from datetime import date
+
+from sqlalchemy import update, case, func
+from sqlalchemy.orm import Session
+
+from app.models.booking import Booking, BookingStatus
+from app.models.inventory import TripInventory
+from app.core.config import settings
+from app.utils.sql import insert_ignore
+
+
+class SeatsUnavailableError(Exception):
+    """Raised when a trip does not have enough seats left for a reservation."""
+
+
+class InventoryService:
+    """
+    Service for reserving and releasing seats on a trip.
+
+    Reservations are a single conditional UPDATE that decrements the counter
+    only while enough seats remain. The database takes a row lock for the
+    update and re-checks the condition once the lock is granted, so concurrent
+    bookings for the same trip serialize on that row and can never oversell.
+    Nothing is committed here: callers commit the reservation together with
+    the booking row in one transaction.
+    """
+
+    def _trip_filter(self, provider: str, from_district: str, to_district: str, travel_date: date):
+        """Build the WHERE clause identifying a single trip."""
+        return (
+            TripInventory.provider == provider,
+            TripInventory.from_district == from_district,
+            TripInventory.to_district == to_district,
+            TripInventory.travel_date == travel_date,
+        )
+
+    def _booked_seats(self, db: Session, provider: str, from_district: str, to_district: str, travel_date: date) -> int:
+        """Seats held by pending or confirmed bookings for a trip."""
+        return db.query(func.coalesce(func.sum(Booking.num_seats), 0)).filter(
+            Booking.provider == provider,
+            Booking.from_district == from_district,
+            Booking.to_district == to_district,
+            Booking.travel_date == travel_date,
+            Booking.status != BookingStatus.CANCELLED
+        ).scalar()
+
+    def _ensure_trip(self, db: Session, provider: str, from_district: str, to_district: str, travel_date: date):
+        """
+        Create the inventory row for a trip if it doesn't exist yet.
+
+        Bookings made before the trip had an inventory row still hold their
+        seats, so the counter starts at capacity minus every pending or
+        confirmed booking for the trip.
+        """
+        capacity = settings.DEFAULT_TRIP_CAPACITY
+        booked = self._booked_seats(db, provider, from_district, to_district, travel_date)
+        insert_ignore(db, TripInventory, {
+            "provider": provider,
+            "from_district": from_district,
+            "to_district": to_district,
+            "travel_date": travel_date,
+            "capacity": capacity,
+            "seats_available": max(capacity - booked, 0),
+        })
+
+    def reserve_seats(
+        self,
+        db: Session,
+        provider: str,
+        from_district: str,
+        to_district: str,
+        travel_date: date,
+        num_seats: int
+    ) -> None:
+        """
+        Atomically take seats from a trip's inventory.
+
+        Args:
+            db: Database session (the caller owns the transaction)
+            provider: Bus provider name
+            from_district: Departure district
+            to_district: Destination district
+            travel_date: Date of travel
+            num_seats: Number of seats to reserve
+
+        Raises:
+            SeatsUnavailableError: If fewer than num_seats seats are left
+        """
+        stmt = (
+            update(TripInventory)
+            .where(
+                *self._trip_filter(provider, from_district, to_district, travel_date),
+                TripInventory.seats_available >= num_seats
+            )
+            .values(seats_available=TripInventory.seats_available - num_seats)
+            .execution_options(synchronize_session=False)
+        )
+
+        if db.execute(stmt).rowcount == 1:
+            return
+
+        # Either the trip has no inventory row yet or it is sold out
+        self._ensure_trip(db, provider, from_district, to_district, travel_date)
+        if db.execute(stmt).rowcount == 1:
+            return
+
+        raise SeatsUnavailableError(
+            f"Not enough seats left on {provider} from {from_district} to {to_district} "
+            f"on {travel_date} for {num_seats} passenger(s)"
+        )
+
+    def release_seats(
+        self,
+        db: Session,
+        provider: str,
+        from_district: str,
+        to_district: str,
+        travel_date: date,
+        num_seats: int
+    ) -> None:
+        """
+        Return seats to a trip's inventory, never exceeding its capacity.
+
+        Args:
+            db: Database session (the caller owns the transaction)
+            provider: Bus provider name
+            from_district: Departure district
+            to_district: Destination district
+            travel_date: Date of travel
+            num_seats: Number of seats to release
+        """
+        released = TripInventory.seats_available + num_seats
+        db.execute(
+            update(TripInventory)
+            .where(*self._trip_filter(provider, from_district, to_district, travel_date))
+            .values(seats_available=case(
+                (released > TripInventory.capacity, TripInventory.capacity),
+                else_=released
+            ))
+            .execution_options(synchronize_session=False)
+        )
+
+    def get_availability(
+        self,
+        db: Session,
+        provider: str,
+        from_district: str,
+        to_district: str,
+        travel_date: date
+    ) -> dict:
+        """
+        Get capacity and remaining seats for a trip.
+
+        Args:
+            db: Database session
+            provider: Bus provider name
+            from_district: Departure district
+            to_district: Destination district
+            travel_date: Date of travel
+
+        Returns:
+            Dict with 'capacity' and 'seats_available'
+        """
+        trip = db.query(TripInventory).filter(
+            *self._trip_filter(provider, from_district, to_district, travel_date)
+        ).first()
+
+        if not trip:
+            capacity = settings.DEFAULT_TRIP_CAPACITY
+            booked = self._booked_seats(db, provider, from_district, to_district, travel_date)
+            return {"capacity": capacity, "seats_available": max(capacity - booked, 0)}
+
+        return {"capacity": trip.capacity, "seats_available": trip.seats_available}
+
+
+# Global instance
+_inventory_service = None
+
+def get_inventory_service() -> InventoryService:
+    """Get or create the global inventory service instance."""
+    global _inventory_service
+    if _inventory_service is None:
+        _inventory_service = InventoryService()
+    return _inventory_service
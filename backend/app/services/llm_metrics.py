@@ -0,0 +1,65 @@
+"""LangChain callback handler feeding LLM and tool timings into metrics and traces."""
+from typing import Any, Dict
+import threading
+import time
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from app.core.metrics import observe_stage
+from app.core.tracing import start_span, finish_span
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """
+    Record the duration of every chat model call and tool call in an agent run.
+
+    LangChain reports start and end as separate events tied by run_id, so
+    start times are kept until the matching end or error event arrives. LLM
+    calls also become tracing spans; tools open their own spans so the work
+    they do nests under them.
+    """
+
+    # Timing is cheap and thread-safe, so skip the executor hop for async runs
+    run_inline = True
+
+    def __init__(self, component: str = "rag"):
+        """Initialize the handler for a component label."""
+        self.component = component
+        self._starts: Dict[UUID, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _start(self, run_id: UUID, stage: str, traced: bool = False) -> None:
+        span = start_span(f"{self.component}.{stage}") if traced else None
+        with self._lock:
+            self._starts[run_id] = (stage, time.perf_counter(), span)
+
+    def _finish(self, run_id: UUID, error: BaseException = None) -> None:
+        with self._lock:
+            started = self._starts.pop(run_id, None)
+        if started is not None:
+            stage, start, span = started
+            observe_stage(self.component, stage, time.perf_counter() - start, error is not None)
+            finish_span(span, error)
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages, *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id, "llm_call", traced=True)
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts, *, run_id: UUID, **kwargs: Any) -> None:
+        self._start(run_id, "llm_call", traced=True)
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, error)
+
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, *, run_id: UUID, **kwargs: Any) -> None:
+        name = (serialized or {}).get("name") or kwargs.get("name") or "unknown"
+        self._start(run_id, f"tool:{name}")
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, error)
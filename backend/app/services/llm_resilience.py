@@ -0,0 +1,248 @@
+"""Timeouts, concurrency limits and a circuit breaker for LLM calls."""
+from typing import Any, Awaitable, Callable, Dict
+import asyncio
+import threading
+import time
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import registry, gauge, Counter
+
+
+class LLMUnavailableError(Exception):
+    """Raised when an LLM call is not attempted or does not finish in time."""
+
+    def __init__(self, reason: str, message: str):
+        """Initialize with a short machine-readable reason."""
+        super().__init__(message)
+        self.reason = reason
+
+
+class CircuitBreaker:
+    """
+    Classic three-state circuit breaker.
+
+    CLOSED: calls flow; consecutive failures are counted.
+    OPEN: after failure_threshold consecutive failures, calls are rejected
+          immediately for reset_timeout seconds.
+    HALF_OPEN: after the timeout a single trial call is let through; success
+          closes the circuit, failure opens it for another period.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        """Initialize a closed breaker."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Check whether a call may proceed, moving OPEN to HALF_OPEN when the timeout has passed."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Reset the failure count and close the circuit."""
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("LLM circuit closed after a successful trial call")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold or on a failed trial."""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                    logger.warning(
+                        f"LLM circuit opened after {self.failures} consecutive failures; "
+                        f"retrying in {self.reset_timeout:.0f}s"
+                    )
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Give back a half-open trial slot that was never used for a call."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class LLMGuard:
+    """
+    Wrap each LLM call with a circuit breaker, a concurrency cap and a timeout.
+
+    Waiting for a concurrency slot is bounded too, so under overload callers
+    fall back quickly instead of queueing behind slow calls. Timeouts and
+    provider errors (rate limits, 5xx) count as breaker failures and surface
+    as LLMUnavailableError like every other reason the model was skipped, so
+    callers serve their fallback for each of them. Rejections by the guard
+    itself and cancelled calls do not count, but they give back a half-open
+    trial slot.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        call_timeout: float,
+        queue_timeout: float,
+        breaker: CircuitBreaker
+    ):
+        """Initialize the guard."""
+        self.max_concurrency = max_concurrency
+        self.call_timeout = call_timeout
+        self.queue_timeout = queue_timeout
+        self.breaker = breaker
+        self.in_flight = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _acquire_slot(self) -> bool:
+        """
+        Wait up to queue_timeout for a concurrency slot.
+
+        asyncio.wait_for around acquire() can time out or be cancelled just
+        after the acquire succeeded (Python 3.11 and earlier), which leaks the
+        slot. Waiting on the acquire task instead shows whether it finished,
+        and a slot it took is given back if the caller cannot use it.
+
+        Returns:
+            True if a slot was taken, False if none freed up in time
+        """
+        acquire = asyncio.ensure_future(self._semaphore.acquire())
+        try:
+            await asyncio.wait({acquire}, timeout=self.queue_timeout)
+        except BaseException:
+            self._abandon_acquire(acquire)
+            raise
+        if acquire.done():
+            return True
+        self._abandon_acquire(acquire)
+        return False
+
+    def _abandon_acquire(self, acquire: asyncio.Future) -> None:
+        if acquire.done() and not acquire.cancelled():
+            self._semaphore.release()
+        else:
+            acquire.cancel()
+
+    async def call(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run one guarded LLM call.
+
+        Args:
+            fn: Zero-argument coroutine function performing the call
+
+        Returns:
+            The call's result
+
+        Raises:
+            LLMUnavailableError: If the circuit is open, no slot frees up in
+                time, the call times out or the provider returns an error
+        """
+        if not self.breaker.allow():
+            llm_fallbacks_total.inc(reason="circuit_open")
+            raise LLMUnavailableError("circuit_open", "LLM circuit is open")
+
+        try:
+            acquired = await self._acquire_slot()
+        except BaseException:
+            # Cancelled while queueing (agent timeout, client gone): a half-open trial
+            # that is never given back would keep the circuit from ever closing
+            self.breaker.release_trial()
+            raise
+        if not acquired:
+            self.breaker.release_trial()
+            llm_fallbacks_total.inc(reason="saturated")
+            raise LLMUnavailableError("saturated", f"No LLM slot free within {self.queue_timeout:.1f}s")
+
+        self.in_flight += 1
+        try:
+            result = await asyncio.wait_for(fn(), self.call_timeout)
+        except asyncio.TimeoutError:
+            self.breaker.record_failure()
+            llm_fallbacks_total.inc(reason="timeout")
+            raise LLMUnavailableError("timeout", f"LLM call exceeded {self.call_timeout:.1f}s")
+        except Exception as e:
+            self.breaker.record_failure()
+            llm_fallbacks_total.inc(reason="error")
+            raise LLMUnavailableError("error", f"LLM call failed: {type(e).__name__}: {e}") from e
+        except BaseException:
+            # Cancellation says nothing about the model's health; just free the trial slot
+            self.breaker.release_trial()
+            raise
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+        self.breaker.record_success()
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Current breaker state and load."""
+        return {
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "times_opened": self.breaker.times_opened,
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "call_timeout_seconds": self.call_timeout,
+        }
+
+
+llm_fallbacks_total = registry.register(Counter(
+    "llm_fallbacks_total", "LLM calls rejected, timed out or failed, by reason",
+    ("reason",)
+))
+
+
+# Global instance
+_llm_guard = None
+
+def get_llm_guard() -> LLMGuard:
+    """Get or create the global LLM guard."""
+    global _llm_guard
+    if _llm_guard is None:
+        _llm_guard = LLMGuard(
+            max_concurrency=settings.LLM_MAX_CONCURRENCY,
+            call_timeout=settings.LLM_TIMEOUT_SECONDS,
+            queue_timeout=settings.LLM_QUEUE_TIMEOUT_SECONDS,
+            breaker=CircuitBreaker(
+                settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+                settings.LLM_CIRCUIT_RESET_SECONDS
+            )
+        )
+    return _llm_guard
+
+
+def _collect_llm_metrics():
+    """Expose breaker state and in-flight calls at scrape time."""
+    if _llm_guard is None:
+        return []
+    states = (CircuitBreaker.CLOSED, CircuitBreaker.HALF_OPEN, CircuitBreaker.OPEN)
+    return [
+        gauge("llm_circuit_state", "LLM circuit breaker state (1 for the current state)", [
+            ({"state": state}, 1 if _llm_guard.breaker.state == state else 0) for state in states
+        ]),
+        gauge("llm_calls_in_flight", "LLM calls currently running", [({}, _llm_guard.in_flight)]),
+    ]
+
+
+registry.register_collector(_collect_llm_metrics)
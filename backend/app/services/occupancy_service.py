@@ -0,0 +1,198 @@
+"""Incrementally maintained seat and revenue aggregates per trip."""
+from typing import Dict, List, Optional
+from datetime import date, datetime
+
+from sqlalchemy import select, update, delete, insert, func, text
+from sqlalchemy.orm import Session
+
+from app.models.booking import Booking, BookingStatus
+from app.models.occupancy import RouteOccupancy
+from app.utils.sql import insert_ignore
+
+
+class OccupancyService:
+    """
+    Service maintaining route_occupancy alongside booking writes.
+
+    Every change to a confirmed booking applies a signed delta to its trip's
+    row inside the caller's transaction, so the aggregates commit or roll back
+    together with the booking. Analytics then read one row per trip instead of
+    scanning bookings.
+    """
+
+    def _trip_filter(self, provider: str, from_district: str, to_district: str, travel_date: date):
+        """Build the WHERE clause identifying a single trip."""
+        return (
+            RouteOccupancy.provider == provider,
+            RouteOccupancy.from_district == from_district,
+            RouteOccupancy.to_district == to_district,
+            RouteOccupancy.travel_date == travel_date,
+        )
+
+    def apply_delta(
+        self,
+        db: Session,
+        provider: str,
+        from_district: str,
+        to_district: str,
+        travel_date: date,
+        seats: int,
+        bookings: int,
+        revenue: int
+    ) -> None:
+        """
+        Add (or subtract) seats, bookings and revenue for a trip.
+
+        Args:
+            db: Database session (the caller owns the transaction)
+            provider: Bus provider name
+            from_district: Departure district
+            to_district: Destination district
+            travel_date: Date of travel
+            seats: Change in seats sold
+            bookings: Change in number of confirmed bookings
+            revenue: Change in revenue
+        """
+        stmt = (
+            update(RouteOccupancy)
+            .where(*self._trip_filter(provider, from_district, to_district, travel_date))
+            .values(
+                seats_sold=RouteOccupancy.seats_sold + seats,
+                bookings_count=RouteOccupancy.bookings_count + bookings,
+                revenue=RouteOccupancy.revenue + revenue
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if db.execute(stmt).rowcount:
+            return
+
+        inserted = insert_ignore(db, RouteOccupancy, {
+            "provider": provider,
+            "from_district": from_district,
+            "to_district": to_district,
+            "travel_date": travel_date,
+            "seats_sold": seats,
+            "bookings_count": bookings,
+            "revenue": revenue,
+            "updated_at": datetime.utcnow(),
+        })
+        if not inserted:
+            # Another transaction created the row between our update and insert
+            db.execute(stmt)
+
+    def record_booking(self, db: Session, booking, sign: int = 1) -> None:
+        """
+        Apply a confirmed booking (sign=1) or its cancellation (sign=-1).
+
+        Args:
+            db: Database session (the caller owns the transaction)
+            booking: Booking model or schema with trip, seat and fare fields
+            sign: 1 to add the booking, -1 to remove it
+        """
+        self.apply_delta(
+            db,
+            booking.provider,
+            booking.from_district,
+            booking.to_district,
+            booking.travel_date,
+            sign * booking.num_seats,
+            sign,
+            sign * booking.total_fare
+        )
+
+    def rebuild(self, db: Session) -> int:
+        """
+        Recompute every aggregate from the bookings table in one transaction.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of trip rows written
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            # Waits for in-flight booking transactions to commit their deltas and
+            # holds new ones back until the rebuilt rows are committed
+            db.execute(text("LOCK TABLE route_occupancy IN EXCLUSIVE MODE"))
+        db.execute(delete(RouteOccupancy))
+        source = (
+            select(
+                Booking.provider,
+                Booking.from_district,
+                Booking.to_district,
+                Booking.travel_date,
+                func.sum(Booking.num_seats),
+                func.count(),
+                func.sum(Booking.total_fare),
+                func.now()
+            )
+            .where(Booking.status == BookingStatus.CONFIRMED)
+            .group_by(Booking.provider, Booking.from_district, Booking.to_district, Booking.travel_date)
+        )
+        written = db.execute(insert(RouteOccupancy).from_select([
+            "provider", "from_district", "to_district", "travel_date",
+            "seats_sold", "bookings_count", "revenue", "updated_at"
+        ], source)).rowcount
+        db.commit()
+        return written
+
+    def get_occupancy(
+        self,
+        db: Session,
+        provider: Optional[str] = None,
+        from_district: Optional[str] = None,
+        to_district: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        limit: int = 500
+    ) -> List[RouteOccupancy]:
+        """Get per-trip aggregates matching the given filters, by date."""
+        query = db.query(RouteOccupancy)
+        if provider:
+            query = query.filter(RouteOccupancy.provider == provider)
+        if from_district:
+            query = query.filter(RouteOccupancy.from_district == from_district)
+        if to_district:
+            query = query.filter(RouteOccupancy.to_district == to_district)
+        if start_date:
+            query = query.filter(RouteOccupancy.travel_date >= start_date)
+        if end_date:
+            query = query.filter(RouteOccupancy.travel_date <= end_date)
+        return query.order_by(
+            RouteOccupancy.travel_date, RouteOccupancy.provider,
+            RouteOccupancy.from_district, RouteOccupancy.to_district
+        ).limit(limit).all()
+
+    def get_revenue_by_provider(
+        self,
+        db: Session,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[Dict]:
+        """Get seats sold, bookings and revenue totals per provider."""
+        query = db.query(
+            RouteOccupancy.provider,
+            func.sum(RouteOccupancy.seats_sold),
+            func.sum(RouteOccupancy.bookings_count),
+            func.sum(RouteOccupancy.revenue)
+        )
+        if start_date:
+            query = query.filter(RouteOccupancy.travel_date >= start_date)
+        if end_date:
+            query = query.filter(RouteOccupancy.travel_date <= end_date)
+        rows = query.group_by(RouteOccupancy.provider).order_by(func.sum(RouteOccupancy.revenue).desc()).all()
+        return [
+            {"provider": provider, "seats_sold": int(seats or 0), "bookings_count": int(count or 0), "revenue": int(revenue or 0)}
+            for provider, seats, count, revenue in rows
+        ]
+
+
+# Global instance
+_occupancy_service = None
+
+def get_occupancy_service() -> OccupancyService:
+    """Get or create the global occupancy service instance."""
+    global _occupancy_service
+    if _occupancy_service is None:
+        _occupancy_service = OccupancyService()
+    return _occupancy_service
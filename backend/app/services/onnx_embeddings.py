@@ -0,0 +1,89 @@
+"""Sentence embeddings computed with ONNX Runtime instead of PyTorch."""
+from typing import List
+from pathlib import Path
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# Files written by scripts/export_onnx_embeddings.py
+QUANTIZED_MODEL_FILE = "model_quantized.onnx"
+FULL_MODEL_FILE = "model.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+
+# all-MiniLM-L6-v2 was trained with this maximum sequence length
+MAX_SEQ_LENGTH = 256
+
+
+class OnnxEmbeddings(Embeddings):
+    """
+    all-MiniLM-L6-v2 embeddings from an exported (optionally int8-quantized) ONNX model.
+
+    Reproduces the sentence-transformers pipeline: tokenize, run the
+    transformer, mean-pool token vectors over the attention mask and
+    L2-normalize, so vectors are interchangeable with the PyTorch backend's
+    within quantization error.
+    """
+
+    def __init__(self, model_dir: str, quantized: bool = True, intra_op_threads: int = 0, batch_size: int = 32):
+        """
+        Load the tokenizer and ONNX session.
+
+        Args:
+            model_dir: Directory produced by scripts/export_onnx_embeddings.py
+            quantized: Use the int8 model rather than the float32 export
+            intra_op_threads: ONNX Runtime threads per call (0 lets it decide)
+            batch_size: Texts encoded per inference call in embed_documents
+        """
+        # Optional dependencies, only needed with EMBEDDING_BACKEND=onnx
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_path = Path(model_dir)
+        model_file = model_path / (QUANTIZED_MODEL_FILE if quantized else FULL_MODEL_FILE)
+        if not model_file.exists():
+            raise FileNotFoundError(
+                f"{model_file} not found; run 'python scripts/export_onnx_embeddings.py' first"
+            )
+
+        self.tokenizer = Tokenizer.from_file(str(model_path / TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=MAX_SEQ_LENGTH)
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads > 0:
+            options.intra_op_num_threads = intra_op_threads
+        self.session = ort.InferenceSession(str(model_file), options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.batch_size = batch_size
+
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        """Embed one batch of texts into normalized float32 vectors."""
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean pooling over real (non-padding) tokens
+        mask = attention_mask[:, :, None].astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        counts = np.clip(mask.sum(axis=1), 1e-9, None)
+        embeddings = summed / counts
+
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.clip(norms, 1e-12, None)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed a list of documents."""
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            vectors.extend(self._embed_batch(texts[start:start + self.batch_size]).tolist())
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query."""
+        return self._embed_batch([text])[0].tolist()
@@ -0,0 +1,166 @@
+"""Maintenance of the monthly travel_date partitions of the bookings table."""
+from typing import Dict, List
+import re
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.database import engine
+from app.core.config import settings
+from app.core.logging import logger
+from app.services.cache import get_booking_cache
+
+PARTITION_NAME = re.compile(r"^bookings_p(\d{4})_(\d{2})$")
+
+# Serializes maintenance across workers; arbitrary constant shared by all callers
+ADVISORY_LOCK_ID = 726_001
+
+
+def add_months(day: date, months: int) -> date:
+    """Return the first day of the month `months` after the month of `day`."""
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+class PartitionService:
+    """
+    Service that keeps a rolling window of monthly bookings partitions.
+
+    Partitions are named bookings_pYYYY_MM and cover one calendar month of
+    travel dates. Upcoming months are created ahead of time so inserts never
+    fall into the default partition, and months older than the retention
+    window are detached (kept as standalone tables) or dropped.
+    """
+
+    def is_supported(self) -> bool:
+        """Partitioning is only available on PostgreSQL."""
+        return engine.dialect.name == "postgresql"
+
+    def _is_partitioned(self, conn: Connection) -> bool:
+        """Check whether the bookings table has been converted to a partitioned table."""
+        return conn.execute(text(
+            "SELECT 1 FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = 'bookings'"
+        )).first() is not None
+
+    def list_partitions(self, conn: Connection) -> Dict[date, str]:
+        """Get attached monthly partitions keyed by the first day of their month."""
+        rows = conn.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = 'bookings'"
+        )).scalars()
+        partitions = {}
+        for name in rows:
+            match = PARTITION_NAME.match(name)
+            if match:
+                partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+        return partitions
+
+    def _create_partition(self, conn: Connection, month: date) -> str:
+        """Create one monthly partition, moving any matching rows out of the default partition."""
+        name = f"bookings_p{month:%Y_%m}"
+        lower, upper = month.isoformat(), add_months(month, 1).isoformat()
+
+        # Attaching a range that overlaps rows in the default partition fails,
+        # so those rows are moved into the new table before it is attached
+        conn.execute(text(f"CREATE TABLE {name} (LIKE bookings INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+        conn.execute(text(
+            f"WITH moved AS (DELETE FROM bookings_default "
+            f"WHERE travel_date >= :lower AND travel_date < :upper RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ), {"lower": lower, "upper": upper})
+        conn.execute(text(
+            f"ALTER TABLE bookings ATTACH PARTITION {name} FOR VALUES FROM ('{lower}') TO ('{upper}')"
+        ))
+        return name
+
+    def ensure_partitions(self, months_ahead: int) -> List[str]:
+        """
+        Create any missing partitions from the current month through months_ahead.
+
+        Args:
+            months_ahead: Number of future months that must have a partition
+
+        Returns:
+            Names of the partitions that were created
+        """
+        if not self.is_supported():
+            logger.warning("Bookings partitioning requires PostgreSQL; skipping partition creation")
+            return []
+
+        created = []
+        with engine.begin() as conn:
+            conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": ADVISORY_LOCK_ID})
+            if not self._is_partitioned(conn):
+                logger.warning("Bookings table is not partitioned; run 'alembic upgrade head' first")
+                return []
+            existing = self.list_partitions(conn)
+            current = add_months(date.today(), 0)
+            for offset in range(months_ahead + 1):
+                month = add_months(current, offset)
+                if month not in existing:
+                    created.append(self._create_partition(conn, month))
+
+        for name in created:
+            logger.info(f"Created bookings partition {name}")
+        return created
+
+    def apply_retention(self, retention_months: int, action: str) -> List[str]:
+        """
+        Detach or drop partitions that ended before the retention window.
+
+        Args:
+            retention_months: Number of past months to keep attached (0 keeps everything)
+            action: 'detach' to keep expired partitions as standalone tables, 'drop' to delete them
+
+        Returns:
+            Names of the partitions that were detached or dropped
+        """
+        if not self.is_supported() or retention_months <= 0:
+            return []
+        if action not in ("detach", "drop"):
+            raise ValueError(f"Unknown retention action: {action}")
+
+        cutoff = add_months(date.today(), -retention_months)
+        expired = []
+        with engine.begin() as conn:
+            conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": ADVISORY_LOCK_ID})
+            for month, name in sorted(self.list_partitions(conn).items()):
+                if add_months(month, 1) > cutoff:
+                    continue
+                conn.execute(text(f"ALTER TABLE bookings DETACH PARTITION {name}"))
+                if action == "drop":
+                    conn.execute(text(f"DROP TABLE {name}"))
+                expired.append(name)
+
+        for name in expired:
+            logger.info(f"Retention: {'dropped' if action == 'drop' else 'detached'} bookings partition {name}")
+        if expired:
+            # The removed bookings may still be cached for their customers
+            get_booking_cache().invalidate_all()
+        return expired
+
+    def run_maintenance(self) -> Dict[str, List[str]]:
+        """Run partition creation and retention using the configured settings."""
+        return {
+            "created": self.ensure_partitions(settings.BOOKING_PARTITION_MONTHS_AHEAD),
+            "expired": self.apply_retention(
+                settings.BOOKING_RETENTION_MONTHS,
+                settings.BOOKING_RETENTION_ACTION
+            ),
+        }
+
+
+# Global instance
+_partition_service = None
+
+def get_partition_service() -> PartitionService:
+    """Get or create the global partition service instance."""
+    global _partition_service
+    if _partition_service is None:
+        _partition_service = PartitionService()
+    return _partition_service
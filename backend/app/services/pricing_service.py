@@ -0,0 +1,164 @@
+"""In-memory pricing index built from context/data.json."""
+from typing import Dict, List, Optional, Tuple
+import json
+import threading
+import time
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.logging import logger
+
+
+class InvalidRouteError(ValueError):
+    """Raised when a provider, route or dropping point is not offered."""
+
+
+class PricingIndex:
+    """Immutable lookup tables derived from one version of data.json."""
+
+    def __init__(self, data: Dict):
+        """Precompute route and fare lookups."""
+        self.districts = {d["name"]: d for d in data.get("districts", [])}
+        self.providers = {p["name"]: p for p in data.get("bus_providers", [])}
+        self.coverage = {
+            name: frozenset(p.get("coverage_districts", []))
+            for name, p in self.providers.items()
+        }
+
+        # (provider, to_district, dropping_point) -> fare per seat
+        self.fares: Dict[Tuple[str, str, str], int] = {}
+        self.dropping_points: Dict[str, List[Dict]] = {}
+        for name, district in self.districts.items():
+            points = district.get("dropping_points", [])
+            self.dropping_points[name] = [{"name": dp["name"], "price": dp["price"]} for dp in points]
+            for provider, covered in self.coverage.items():
+                if name in covered:
+                    for dp in points:
+                        self.fares[(provider, name, dp["name"])] = dp["price"]
+
+
+class PricingService:
+    """Service for O(1) route validation and fare lookups."""
+
+    # Minimum seconds between checks of data.json for modifications
+    RELOAD_CHECK_INTERVAL = 5.0
+
+    def __init__(self):
+        """Initialize pricing service."""
+        self.data_path = Path(settings.CONTEXT_DIR) / "data.json"
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._last_check = 0.0
+        self.reload()
+
+    def reload(self):
+        """Rebuild the index from data.json."""
+        with self._lock:
+            mtime = self.data_path.stat().st_mtime
+            with open(self.data_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # Swap in a fully built index so readers never see a partial one
+            self._index = PricingIndex(data)
+            self._mtime = mtime
+            self._last_check = time.monotonic()
+        logger.info(
+            f"Pricing index loaded: {len(self._index.districts)} districts, "
+            f"{len(self._index.providers)} providers, {len(self._index.fares)} fares"
+        )
+
+    @property
+    def index(self) -> PricingIndex:
+        """Current index, reloaded first if data.json changed on disk."""
+        now = time.monotonic()
+        if now - self._last_check >= self.RELOAD_CHECK_INTERVAL:
+            self._last_check = now
+            try:
+                if self.data_path.stat().st_mtime != self._mtime:
+                    self.reload()
+            except OSError as e:
+                logger.warning(f"Could not check {self.data_path} for changes: {e}")
+        return self._index
+
+    @property
+    def districts(self) -> Dict[str, Dict]:
+        """Districts keyed by name."""
+        return self.index.districts
+
+    @property
+    def providers(self) -> Dict[str, Dict]:
+        """Bus providers keyed by name."""
+        return self.index.providers
+
+    def get_dropping_points(self, district: str) -> List[Dict]:
+        """Get dropping points with fares for a destination district."""
+        return self.index.dropping_points.get(district, [])
+
+    def get_fare(self, provider: str, to_district: str, dropping_point: str) -> Optional[int]:
+        """Get the per-seat fare to a dropping point, or None if not offered."""
+        return self.index.fares.get((provider, to_district, dropping_point))
+
+    def is_route(self, provider: str, from_district: str, to_district: str) -> bool:
+        """Check whether a provider operates between two districts."""
+        covered = self.index.coverage.get(provider)
+        return (
+            covered is not None
+            and from_district != to_district
+            and from_district in covered
+            and to_district in covered
+            and bool(self.index.dropping_points.get(to_district))
+        )
+
+    def quote(
+        self,
+        provider: str,
+        from_district: str,
+        to_district: str,
+        dropping_point: Optional[str],
+        num_seats: int
+    ) -> int:
+        """
+        Validate a trip and compute its total fare.
+
+        Args:
+            provider: Bus provider name
+            from_district: Departure district
+            to_district: Destination district
+            dropping_point: Dropping point in the destination district; the
+                cheapest one is used when omitted
+            num_seats: Number of seats
+
+        Returns:
+            Total fare in BDT
+
+        Raises:
+            InvalidRouteError: If the route or dropping point is not offered
+        """
+        index = self.index
+        if provider not in index.providers:
+            raise InvalidRouteError(f"Unknown bus provider: {provider}")
+        if from_district not in index.districts:
+            raise InvalidRouteError(f"Unknown departure district: {from_district}")
+        if to_district not in index.districts:
+            raise InvalidRouteError(f"Unknown destination district: {to_district}")
+        if not self.is_route(provider, from_district, to_district):
+            raise InvalidRouteError(f"{provider} does not operate from {from_district} to {to_district}")
+
+        if dropping_point is None:
+            fare = min(dp["price"] for dp in index.dropping_points[to_district])
+        else:
+            fare = self.get_fare(provider, to_district, dropping_point)
+            if fare is None:
+                raise InvalidRouteError(f"Unknown dropping point in {to_district}: {dropping_point}")
+
+        return fare * num_seats
+
+
+# Global instance
+_pricing_service = None
+
+def get_pricing_service() -> PricingService:
+    """Get or create the global pricing service instance."""
+    global _pricing_service
+    if _pricing_service is None:
+        _pricing_service = PricingService()
+    return _pricing_service
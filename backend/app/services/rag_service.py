@@ -2,16 +2,43 @@
 RAG Service for Bus Ticket Booking Chatbot.
 Integrates LangChain v1.0, ChromaDB (with local embeddings), and Gemini API.
 """
-from typing import Dict, Any
+from typing import Dict, Any, List
+import asyncio
+import threading
 from langchain_chroma import Chroma
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
 from langchain.agents import create_agent
+from langchain.agents.middleware import AgentMiddleware
 from langchain.tools import tool
 from langchain_core.documents import Document
 
 from app.core.config import settings
 from app.core.logging import logger
+from app.core.metrics import timed, errors_total
+from app.core.tracing import span
+from app.services.llm_metrics import MetricsCallbackHandler
+from app.services.embeddings import get_embeddings
+from app.services.cache import get_rag_cache
+from app.services.llm_resilience import LLMGuard, LLMUnavailableError, get_llm_guard, llm_fallbacks_total
+
+# Documents retrieved per query, and how many of them a fallback answer lists
+RETRIEVAL_K = 8
+FALLBACK_DOCS = 3
+
+
+class LLMGuardMiddleware(AgentMiddleware):
+    """Run every model call of the agent through the LLM guard."""
+
+    def __init__(self, guard: LLMGuard):
+        """Initialize with the process-wide guard."""
+        super().__init__()
+        self.guard = guard
+
+    async def awrap_model_call(self, request, handler):
+        """Apply the circuit breaker, concurrency cap and per-call timeout."""
+        return await self.guard.call(lambda: handler(request))
+
 
 class RAGService:
     """Service for Retrieval-Augmented Generation using LangChain v1.0."""
@@ -19,19 +46,17 @@ class RAGService:
     def __init__(self):
         """Initialize the RAG service components."""
         self.embeddings = self._initialize_embeddings()
+        self.cache = get_rag_cache()
         self.vector_store = self._initialize_vector_store()
         self.llm = self._initialize_llm()
+        self.llm_guard = get_llm_guard()
         self.agent = self._create_rag_agent()
+        self.metrics_callback = MetricsCallbackHandler("rag")
         logger.info("RAG Service initialized successfully with LangChain v1.0")
 
-    def _initialize_embeddings(self) -> HuggingFaceEmbeddings:
-        """Initialize local HuggingFace embeddings."""
-        logger.info("Initializing HuggingFace embeddings (all-MiniLM-L6-v2)...")
-        return HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2",
-            model_kwargs={'device': 'cpu'},
-            encode_kwargs={'normalize_embeddings': True}
-        )
+    def _initialize_embeddings(self) -> Embeddings:
+        """Get the shared local embeddings (backend selected by EMBEDDING_BACKEND)."""
+        return get_embeddings()
 
     def _initialize_vector_store(self) -> Chroma:
         """Initialize ChromaDB vector store."""
@@ -53,24 +78,67 @@ class RAGService:
             
         return store
 
-    def _initialize_llm(self) -> ChatGoogleGenerativeAI:
-        """Initialize Gemini Chat Model."""
+    def _initialize_llm(self) -> BaseChatModel:
+        """Initialize the chat model selected by LLM_PROVIDER."""
+        if settings.LLM_PROVIDER == "fake":
+            from app.services.fake_llm import FakeChatModel
+
+            logger.info(
+                f"Using fake chat model (latency {settings.FAKE_LLM_LATENCY_MS:.0f}ms, "
+                f"error rate {settings.FAKE_LLM_ERROR_RATE:.0%})"
+            )
+            return FakeChatModel(
+                latency_ms=settings.FAKE_LLM_LATENCY_MS,
+                error_rate=settings.FAKE_LLM_ERROR_RATE
+            )
+        if settings.LLM_PROVIDER != "gemini":
+            raise ValueError(f"Unknown LLM_PROVIDER '{settings.LLM_PROVIDER}'; expected 'gemini' or 'fake'")
+
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
         return ChatGoogleGenerativeAI(
             model="gemini-2.5-flash-lite",
             google_api_key=settings.GOOGLE_API_KEY,
             temperature=0.3, # Low temperature for factual responses
-            convert_system_message_to_human=True
+            convert_system_message_to_human=True,
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+            max_retries=settings.LLM_MAX_RETRIES
         )
 
+    def embed_query(self, query: str) -> List[float]:
+        """Embed a query, reusing the cached vector for repeated queries."""
+        return self.cache.get_embedding(query, lambda: self.embeddings.embed_query(query))
+
+    async def aembed_query(self, query: str) -> List[float]:
+        """embed_query for async callers; a Redis-backed cache lookup runs off the event loop."""
+        return await self.cache.run(self.embed_query, query)
+
+    def _search(self, query: str, k: int) -> List[Dict]:
+        # Embed and search separately so each stage gets its own latency histogram
+        with timed("rag", "embedding"):
+            query_vector = self.embed_query(query)
+        with timed("rag", "vector_search"):
+            docs = self.vector_store.similarity_search_by_vector(query_vector, k=k)
+        return [{"page_content": doc.page_content, "metadata": doc.metadata} for doc in docs]
+
+    def _retrieve(self, query: str, k: int = RETRIEVAL_K) -> List[Document]:
+        """Embed the query and fetch the closest knowledge documents (cached per query and k)."""
+        with span("rag.retrieve_bus_info") as tool_span:
+            cached = self.cache.get_documents(query, k, lambda: self._search(query, k))
+            retrieved_docs = [Document(**doc) for doc in cached]
+            if tool_span is not None:
+                tool_span.set_attribute("documents", len(retrieved_docs))
+        return retrieved_docs
+
 
     def _create_retrieval_tool(self):
         """Create the retrieval tool for the agent."""
-        vector_store = self.vector_store
+        retrieve = self._retrieve
         
         @tool(response_format="content_and_artifact")
         def retrieve_bus_info(query: str):
             """Retrieve information about bus routes, providers, and districts to help answer user questions."""
-            retrieved_docs = vector_store.similarity_search(query, k=8)
+            retrieved_docs = retrieve(query)
             serialized = "\n\n".join(
                 f"Source: {doc.metadata}\nContent: {doc.page_content}"
                 for doc in retrieved_docs
@@ -97,76 +165,162 @@ class RAGService:
         agent = create_agent(
             self.llm,
             tools=[retrieval_tool],
-            system_prompt=system_prompt
+            system_prompt=system_prompt,
+            middleware=[LLMGuardMiddleware(self.llm_guard)]
         )
         
         return agent
 
+    @staticmethod
+    def _collect_sources(docs: List[Document]) -> List[dict]:
+        """Describe the distinct documents an answer is based on."""
+        sources = []
+        seen_sources = set()
+        for doc in docs:
+            metadata = doc.metadata
+            source_type = metadata.get("type", "unknown")
+
+            if source_type == "route":
+                source_id = f"{metadata.get('provider')} ({metadata.get('from')} to {metadata.get('to')})"
+            elif source_type == "bus_provider":
+                source_id = f"{metadata.get('provider')} Info"
+            elif source_type == "district":
+                source_id = f"{metadata.get('district')} District Info"
+            else:
+                source_id = "General Info"
+
+            if source_id not in seen_sources:
+                sources.append({"title": source_id, "type": source_type})
+                seen_sources.add(source_id)
+        return sources
+
+    async def _fallback_answer(self, query: str, reason: str) -> Dict[str, Any]:
+        """
+        Answer from retrieval alone when the language model is unavailable.
+
+        Args:
+            query: User's question
+            reason: Why the model was skipped (circuit_open, saturated, timeout, error)
+
+        Returns:
+            Dict containing 'answer', 'sources' and 'degraded'
+        """
+        logger.warning(f"Answering from retrieval only ({reason})")
+        with timed("rag", "fallback"):
+            docs = await asyncio.to_thread(self._retrieve, query)
+        docs = docs[:FALLBACK_DOCS]
+        if not docs:
+            answer = (
+                "Our assistant is temporarily unavailable and I couldn't find matching "
+                "bus information. Please try again shortly."
+            )
+            return {"answer": answer, "sources": [], "degraded": True}
+
+        lines = []
+        for doc in docs:
+            metadata = doc.metadata
+            if metadata.get("type") == "route":
+                lines.append(
+                    f"- {metadata.get('provider')}: {metadata.get('from')} to {metadata.get('to')}, "
+                    f"fares ৳{metadata.get('min_price')}-৳{metadata.get('max_price')}"
+                )
+            else:
+                summary = "; ".join(line.strip() for line in doc.page_content.strip().splitlines()[:3] if line.strip())
+                lines.append(f"- {summary}")
+        answer = (
+            "Our assistant is temporarily unavailable, but here is the closest matching "
+            "information (prices in BDT):\n" + "\n".join(lines)
+        )
+        return {"answer": answer, "sources": self._collect_sources(docs), "degraded": True}
+
     async def get_answer(self, query: str) -> Dict[str, Any]:
         """
         Process a query and return the answer with sources.
         
+        Model calls go through the LLM guard and the whole agent run is bounded
+        by AGENT_TIMEOUT_SECONDS; when the model is unavailable the answer is
+        built from the retrieved documents instead and marked degraded.
+        
         Args:
             query: User's question
             
         Returns:
-            Dict containing 'answer' and 'sources'
+            Dict containing 'answer', 'sources' and 'degraded'
         """
         logger.info(f"Processing RAG query: {query}")
         
-        try:
-            # Invoke the agent
-            response = await self.agent.ainvoke({
-                "messages": [{"role": "user", "content": query}]
-            })
+        with span("rag.get_answer", query_length=len(query)) as answer_span:
+            cached = await self.cache.run(self.cache.get_answer, query)
+            if cached is not None:
+                if answer_span is not None:
+                    answer_span.set_attribute("cache", "hit")
+                return {**cached, "degraded": False}
             
-            # Extract the last message (AI response)
-            messages = response["messages"]
-            last_message = messages[-1]
-            answer = last_message.content
+            try:
+                # Invoke the agent; the callback times each LLM and tool call inside the run
+                with timed("rag", "agent"):
+                    response = await asyncio.wait_for(
+                        self.agent.ainvoke(
+                            {"messages": [{"role": "user", "content": query}]},
+                            config={"callbacks": [self.metrics_callback]}
+                        ),
+                        settings.AGENT_TIMEOUT_SECONDS
+                    )
             
-            # Extract sources from context if available
-            sources = []
-            if "context" in response:
-                context_docs = response["context"]
-                seen_sources = set()
-                
-                for doc in context_docs:
-                    metadata = doc.metadata
-                    source_type = metadata.get("type", "unknown")
-                    
-                    if source_type == "route":
-                        source_id = f"{metadata.get('provider')} ({metadata.get('from')} to {metadata.get('to')})"
-                    elif source_type == "bus_provider":
-                        source_id = f"{metadata.get('provider')} Info"
-                    elif source_type == "district":
-                        source_id = f"{metadata.get('district')} District Info"
-                    else:
-                        source_id = "General Info"
-                    
-                    if source_id not in seen_sources:
-                        sources.append(source_id)
-                        seen_sources.add(source_id)
+                # Extract the last message (AI response)
+                messages = response["messages"]
+                last_message = messages[-1]
+                answer = last_message.content
             
-            return {
-                "answer": answer,
-                "sources": sources
-            }
+                # Extract sources from context if available
+                sources = self._collect_sources(response.get("context", []))
+                await self.cache.run(self.cache.set_answer, query, {"answer": answer, "sources": sources})
             
-        except Exception as e:
-            logger.error(f"Error generating RAG response: {str(e)}")
-            return {
-                "answer": "I apologize, but I encountered an error while processing your request. Please try again later.",
-                "sources": []
-            }
+                return {
+                    "answer": answer,
+                    "sources": sources,
+                    "degraded": False
+                }
+            
+            except (LLMUnavailableError, asyncio.TimeoutError) as e:
+                reason = e.reason if isinstance(e, LLMUnavailableError) else "agent_timeout"
+                if isinstance(e, asyncio.TimeoutError):
+                    llm_fallbacks_total.inc(reason=reason)
+                if answer_span is not None:
+                    answer_span.set_attribute("fallback", reason)
+                try:
+                    return await self._fallback_answer(query, reason)
+                except Exception as fallback_error:
+                    errors_total.inc(component="rag", stage="fallback")
+                    logger.error(f"Error building fallback response: {str(fallback_error)}")
+                    return {
+                        "answer": "I apologize, but I encountered an error while processing your request. Please try again later.",
+                        "sources": [],
+                        "degraded": True
+                    }
+            
+            except Exception as e:
+                errors_total.inc(component="rag", stage="answer")
+                if answer_span is not None:
+                    answer_span.error = f"{type(e).__name__}: {e}"[:500]
+                logger.error(f"Error generating RAG response: {str(e)}")
+                return {
+                    "answer": "I apologize, but I encountered an error while processing your request. Please try again later.",
+                    "sources": [],
+                    "degraded": False
+                }
 
 # Global instance
 rag_service = None
+_rag_service_lock = threading.Lock()
 
 def get_rag_service() -> RAGService:
     """Get or create the global RAG service instance."""
     global rag_service
     if rag_service is None:
-        rag_service = RAGService()
+        # Startup warmup and early requests can race here; the model must load only once
+        with _rag_service_lock:
+            if rag_service is None:
+                rag_service = RAGService()
     return rag_service
 
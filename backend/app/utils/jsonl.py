@@ -0,0 +1,136 @@
+"""Non-blocking, size-rotated JSON Lines file writer."""
+from typing import Any, Dict, Optional
+import json
+import os
+import queue
+import threading
+from pathlib import Path
+
+from app.core.logging import logger
+
+# Sentinel telling the writer thread to flush and exit
+_STOP = object()
+
+
+class JsonlWriter:
+    """
+    Append JSON records to a file from a background thread.
+
+    write() only enqueues, so callers on the event loop never touch the disk.
+    When the bounded queue is full, records are dropped and counted instead of
+    blocking the caller. The file is rotated like RotatingFileHandler:
+    path -> path.1 -> ... -> path.N once it exceeds max_bytes.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 50_000_000, backup_count: int = 5, queue_size: int = 10_000):
+        """Initialize the writer; the thread starts on the first write."""
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.queue_size = queue_size
+        self.dropped = 0
+        self.written = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        """Start the writer thread, again in a forked child whose thread did not survive the fork."""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            if self._pid is not None and self._pid != os.getpid():
+                # Queued records belong to the parent; start the child clean
+                self._queue = queue.Queue(maxsize=self.queue_size)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name=f"jsonl-writer:{self.path.name}", daemon=True)
+            self._thread.start()
+
+    def write(self, record: Dict[str, Any]) -> bool:
+        """
+        Queue a record for writing.
+
+        Args:
+            record: JSON-serializable dict
+
+        Returns:
+            False if the record was dropped because the queue is full
+        """
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _rotate(self, stream):
+        """Close the current file, shift backups and open a fresh one."""
+        stream.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = self.path.with_name(f"{self.path.name}.{index}")
+                if source.exists():
+                    os.replace(source, self.path.with_name(f"{self.path.name}.{index + 1}"))
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink(missing_ok=True)
+        return open(self.path, "a", encoding="utf-8")
+
+    def _run(self) -> None:
+        """Writer loop: drain the queue, batching writes between flushes."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        stream = open(self.path, "a", encoding="utf-8")
+        try:
+            while True:
+                record = self._queue.get()
+                batch = [record]
+                # Drain whatever else is waiting so bursts cost one flush
+                while len(batch) < 1000:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = False
+                for item in batch:
+                    if item is _STOP:
+                        stop = True
+                        continue
+                    try:
+                        stream.write(json.dumps(item, default=str, separators=(",", ":")) + "\n")
+                        self.written += 1
+                    except (TypeError, ValueError) as e:
+                        logger.warning(f"Skipping unserializable record for {self.path.name}: {e}")
+                stream.flush()
+                if self.max_bytes and stream.tell() >= self.max_bytes:
+                    stream = self._rotate(stream)
+                if stop:
+                    return
+        except Exception as e:
+            logger.error(f"JSONL writer for {self.path} stopped: {str(e)}")
+        finally:
+            stream.close()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush queued records and stop the writer thread."""
+        thread = self._thread
+        if thread is None or self._pid != os.getpid() or not thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+        self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for health endpoints."""
+        return {
+            "path": str(self.path),
+            "written": self.written,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize(),
+        }
@@ -0,0 +1,39 @@
+"""JSON responses for models that were already validated."""
+from typing import Any, Dict, Optional
+from fastapi import Response, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def model_response(
+    model: BaseModel,
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Serialize a model straight to JSON with pydantic-core.
+
+    Returning a model from an endpoint makes FastAPI dump it, validate the
+    result against response_model again and encode it a second time. A
+    Response is sent as-is, so hot endpoints return this instead; the
+    response_model on the route still documents the schema.
+
+    Args:
+        model: Response model, validated or built from trusted data
+        status_code: HTTP status (the route's status_code is not applied to Responses)
+        headers: Extra response headers
+
+    Returns:
+        JSON response
+    """
+    return Response(
+        content=model.model_dump_json(),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json"
+    )
+
+
+def json_response(content: Any, status_code: int = status.HTTP_200_OK) -> Response:
+    """Encode already JSON-ready data (e.g. a cached model_dump(mode='json')) without validation."""
+    return ORJSONResponse(content=content, status_code=status_code)
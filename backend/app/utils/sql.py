@@ -0,0 +1,29 @@
+"""Small SQL helpers shared across services."""
+from typing import Any, Dict
+
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+
+def insert_ignore(db: Session, model, values: Dict[str, Any]) -> int:
+    """
+    Insert a row, silently skipping it if it violates a unique constraint.
+
+    Args:
+        db: Database session
+        model: ORM model class to insert into
+        values: Column values for the new row
+
+    Returns:
+        Number of rows inserted (0 or 1)
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        stmt = pg_insert(model).values(**values).on_conflict_do_nothing()
+    elif dialect == "sqlite":
+        stmt = sqlite_insert(model).values(**values).on_conflict_do_nothing()
+    else:
+        stmt = insert(model).values(**values).prefix_with("IGNORE")
+    return db.execute(stmt).rowcount
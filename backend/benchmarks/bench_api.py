@@ -0,0 +1,378 @@
+"""End-to-end API benchmark with local stand-ins for every external dependency.
+
+Runs the FastAPI app in-process (httpx ASGITransport, startup and shutdown
+included) against a throwaway SQLite database, a temporary Chroma directory
+ingested from context/data.json, and the deterministic fake chat model
+(LLM_PROVIDER=fake), so no Postgres server, Gemini key or network is needed.
+Pass --database-url to use a local Postgres instead, or --base-url to load an
+already running server.
+
+Each scenario is driven closed-loop by N concurrent workers for a fixed
+duration per concurrency level. The report covers p50/p95/p99 latency,
+throughput and error/429 counts, and is saved as JSON named after the current
+git commit so runs can be compared across commits with --compare.
+
+Scenarios:
+    search     GET  /api/v1/buses/search (cycling through valid routes)
+    providers  GET  /api/v1/buses/providers
+    chat       POST /api/v1/chat (fake LLM; latency set with --llm-latency-ms)
+    bookings   POST, GET, GET list and DELETE /api/v1/bookings, timed per step
+
+Usage:
+    python benchmarks/bench_api.py
+    python benchmarks/bench_api.py --scenarios search bookings --concurrency 1 8 32 --duration 15
+    python benchmarks/bench_api.py --compare benchmarks/results/abc1234.json benchmarks/results/def5678.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+RESULTS_DIR = Path(__file__).parent / "results"
+SCENARIOS = ("search", "providers", "chat", "bookings")
+CHAT_QUESTIONS = (
+    "Are there any buses from Dhaka to Rajshahi under 1000 taka?",
+    "What are the dropping points in Chattogram?",
+    "Which districts does Hanif cover?",
+    "What is the cancellation policy of Shyamoli?",
+)
+# Bookings are spread over trips far in the future so seats never run out
+BOOKING_BASE_DATE = date.today() + timedelta(days=3650)
+
+
+def prepare_environment(workdir: Path, args):
+    """Point settings at local stand-ins; must run before any app module is imported."""
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{workdir / 'bench.db'}"
+    os.environ["CHROMA_PERSIST_DIR"] = str(workdir / "chroma")
+    os.environ["TRACE_DIR"] = str(workdir / "traces")
+    os.environ["LLM_PROVIDER"] = "fake"
+    os.environ["FAKE_LLM_LATENCY_MS"] = str(args.llm_latency_ms)
+    os.environ["FAKE_LLM_ERROR_RATE"] = "0.0"
+    os.environ["SERVICE_ROLE"] = "all"
+    os.environ["LOG_LEVEL"] = "WARNING"
+    os.environ["LANGSMITH_TRACING"] = "false"
+    os.environ.setdefault("GOOGLE_API_KEY", "unused-with-fake-llm")
+    # Warming from the real query log would make results depend on local history
+    os.environ["WARMUP_ENABLED"] = "False"
+    if args.no_admission:
+        os.environ["ADMISSION_ENABLED"] = "False"
+
+    from dotenv import load_dotenv
+
+    # Anything not overridden above (e.g. EMBEDDING_BACKEND) still comes from .env
+    load_dotenv(dotenv_path=BACKEND_DIR / ".env")
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+def prepare_data(args) -> dict:
+    """Create the schema and fill the temporary vector store; returns the source data."""
+    from app.core.database import Base, engine
+    import app.models  # noqa: F401  (registers every table on Base.metadata)
+    from app.services.data_ingestion import DataIngestionService
+
+    if not args.database_url:
+        Base.metadata.create_all(engine)
+    service = DataIngestionService()
+    start = time.perf_counter()
+    count = service.ingest_all_data()
+    print(f"✅ Ingested {count} documents into a temporary Chroma in {time.perf_counter() - start:.1f}s")
+    return service.load_json_data()
+
+
+def route_triples(data: dict) -> list:
+    """(provider, from, to) combinations that the pricing index accepts."""
+    with_points = {d["name"] for d in data.get("districts", []) if d.get("dropping_points")}
+    triples = []
+    for provider in data.get("bus_providers", []):
+        coverage = provider.get("coverage_districts", [])
+        for from_district in coverage:
+            for to_district in coverage:
+                if from_district != to_district and to_district in with_points:
+                    triples.append((provider["name"], from_district, to_district))
+    return triples
+
+
+class Recorder:
+    """Latencies and status codes per operation for one concurrency level."""
+
+    def __init__(self):
+        """Initialize empty series."""
+        self.latencies = {}
+        self.statuses = {}
+
+    def record(self, operation: str, seconds: float, status: int):
+        self.latencies.setdefault(operation, []).append(seconds)
+        counts = self.statuses.setdefault(operation, {})
+        counts[status] = counts.get(status, 0) + 1
+
+    def summary(self, elapsed: float) -> dict:
+        """Percentiles, throughput and outcome counts per operation."""
+        report = {}
+        for operation, latencies in self.latencies.items():
+            latencies.sort()
+            statuses = self.statuses[operation]
+            report[operation] = {
+                "requests": len(latencies),
+                "throughput_rps": round(len(latencies) / elapsed, 2),
+                "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+                "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+                "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+                "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+                "max_ms": round(latencies[-1] * 1000, 2),
+                "rejected_429": statuses.get(429, 0),
+                "errors": sum(n for status, n in statuses.items() if status >= 500 or status == 0),
+                "statuses": {str(status): n for status, n in sorted(statuses.items())},
+            }
+        return report
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+async def timed_request(client, recorder: Recorder, operation: str, method: str, url: str, **kwargs):
+    """Send one request and record its latency; status 0 marks a transport failure."""
+    start = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+    except Exception:
+        recorder.record(operation, time.perf_counter() - start, 0)
+        return None
+    recorder.record(operation, time.perf_counter() - start, response.status_code)
+    return response
+
+
+def make_scenarios(triples: list) -> dict:
+    """Scenario name -> coroutine running one iteration for worker iteration i."""
+
+    async def search(client, recorder, i):
+        _, from_district, to_district = triples[i % len(triples)]
+        await timed_request(
+            client, recorder, "search", "GET", "/api/v1/buses/search",
+            params={"from_district": from_district, "to_district": to_district}
+        )
+
+    async def providers(client, recorder, i):
+        await timed_request(client, recorder, "providers", "GET", "/api/v1/buses/providers")
+
+    async def chat(client, recorder, i):
+        await timed_request(
+            client, recorder, "chat", "POST", "/api/v1/chat",
+            json={"message": CHAT_QUESTIONS[i % len(CHAT_QUESTIONS)]}
+        )
+
+    async def bookings(client, recorder, i):
+        provider, from_district, to_district = triples[i % len(triples)]
+        email = f"bench-{i}@example.com"
+        response = await timed_request(
+            client, recorder, "bookings.create", "POST", "/api/v1/bookings",
+            json={
+                "customer_name": f"Bench Passenger {i}",
+                "customer_email": email,
+                "customer_phone": "01700000000",
+                "from_district": from_district,
+                "to_district": to_district,
+                "provider": provider,
+                "travel_date": (BOOKING_BASE_DATE + timedelta(days=i % 365)).isoformat(),
+                "num_seats": 1,
+            }
+        )
+        if response is None or response.status_code != 201:
+            return
+        booking_id = response.json()["id"]
+        await timed_request(client, recorder, "bookings.get", "GET", f"/api/v1/bookings/{booking_id}")
+        await timed_request(
+            client, recorder, "bookings.list", "GET", "/api/v1/bookings", params={"customer_email": email}
+        )
+        await timed_request(client, recorder, "bookings.cancel", "DELETE", f"/api/v1/bookings/{booking_id}")
+
+    return {"search": search, "providers": providers, "chat": chat, "bookings": bookings}
+
+
+async def run_level(client, scenario, concurrency: int, duration: float, offset: int) -> tuple:
+    """Drive one scenario with `concurrency` closed-loop workers for `duration` seconds."""
+    recorder = Recorder()
+    deadline = time.perf_counter() + duration
+    counter = iter(range(offset, offset + 10_000_000))
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            await scenario(client, recorder, next(counter))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return recorder.summary(time.perf_counter() - start), next(counter)
+
+
+async def wait_until_ready(client, timeout: float = 600):
+    """Poll /ready until background warmup has loaded the RAG stack."""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        response = await client.get("/ready")
+        if response.status_code == 200:
+            return
+        if response.json().get("status") == "failed":
+            raise RuntimeError(f"Warmup failed: {response.json().get('error')}")
+        await asyncio.sleep(0.5)
+    raise RuntimeError("App did not become ready in time")
+
+
+async def run_benchmark(args, triples: list) -> dict:
+    """Run every selected scenario at every concurrency level."""
+    import httpx
+
+    scenarios = make_scenarios(triples)
+    limits = httpx.Limits(max_connections=max(args.concurrency) * 2)
+    results = {}
+
+    async def run_all(client):
+        await wait_until_ready(client)
+        offset = 0
+        for name in args.scenarios:
+            # Unmeasured warmup so first-call costs (caches, lazy imports) don't skew level 1
+            _, offset = await run_level(client, scenarios[name], 2, args.warmup, offset)
+            results[name] = {}
+            for concurrency in args.concurrency:
+                summary, offset = await run_level(client, scenarios[name], concurrency, args.duration, offset)
+                results[name][str(concurrency)] = summary
+                print_level(name, concurrency, summary)
+
+    if args.base_url:
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=120, limits=limits) as client:
+            await run_all(client)
+        return results
+
+    from app.main import app
+
+    # Run startup/shutdown hooks the way a server would (ASGITransport skips lifespan)
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120, limits=limits) as client:
+            await run_all(client)
+    return results
+
+
+def print_level(scenario: str, concurrency: int, summary: dict):
+    for operation, stats in summary.items():
+        print(
+            f"{operation:<16} c={concurrency:<4} {stats['throughput_rps']:>9.1f} rps "
+            f"p50 {stats['p50_ms']:>8.1f}ms p95 {stats['p95_ms']:>8.1f}ms p99 {stats['p99_ms']:>8.1f}ms "
+            f"429 {stats['rejected_429']:>5} err {stats['errors']:>5}"
+        )
+
+
+def git_revision() -> str:
+    """Short commit hash, suffixed with -dirty when the tree has local changes."""
+    try:
+        sha = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+        dirty = subprocess.check_output(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=BACKEND_DIR, text=True
+        ).strip()
+        return f"{sha}-dirty" if dirty else sha
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(base_path: str, new_path: str, threshold: float) -> int:
+    """Print per-operation deltas between two result files; returns 1 if any regressed."""
+    base = json.loads(Path(base_path).read_text())
+    new = json.loads(Path(new_path).read_text())
+    print("=" * 50)
+    print(f"Benchmark Comparison: {base['revision']} -> {new['revision']}")
+    print("=" * 50)
+    print(f"{'operation':<16} {'c':>4} {'p50':>9} {'p95':>9} {'p99':>9} {'rps':>9}")
+
+    regressions = []
+    for scenario, levels in new["results"].items():
+        for concurrency, operations in levels.items():
+            for operation, stats in operations.items():
+                old = base["results"].get(scenario, {}).get(concurrency, {}).get(operation)
+                if old is None:
+                    continue
+                deltas = {}
+                for key in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps"):
+                    deltas[key] = (stats[key] - old[key]) / old[key] if old[key] else 0.0
+                # Latency going up or throughput going down beyond the threshold is a regression
+                if max(deltas["p50_ms"], deltas["p95_ms"], -deltas["throughput_rps"]) > threshold:
+                    regressions.append(f"{operation} c={concurrency}")
+                print(
+                    f"{operation:<16} {concurrency:>4} {deltas['p50_ms']:>+9.1%} {deltas['p95_ms']:>+9.1%} "
+                    f"{deltas['p99_ms']:>+9.1%} {deltas['throughput_rps']:>+9.1%}"
+                )
+
+    if regressions:
+        print(f"❌ Regressions beyond {threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"✅ No regressions beyond {threshold:.0%}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 4, 16, 32], help="Concurrency levels")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds measured per level")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before each scenario")
+    parser.add_argument("--llm-latency-ms", type=float, default=200.0, help="Fake LLM delay per model call")
+    parser.add_argument("--database-url", help="Local Postgres to use instead of a temporary SQLite file (schema must exist)")
+    parser.add_argument("--base-url", help="Benchmark a running server instead of the in-process app")
+    parser.add_argument("--no-admission", action="store_true", help="Disable admission control (no 429s)")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<git sha>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="Compare two result files and exit")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change counted as a regression")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(compare(args.compare[0], args.compare[1], args.threshold))
+
+    with tempfile.TemporaryDirectory(prefix="bench-api-") as tmp:
+        prepare_environment(Path(tmp), args)
+        print("=" * 50)
+        print("API Benchmark")
+        print("=" * 50)
+        if args.base_url:
+            from app.core.config import settings
+
+            data = json.loads((Path(settings.CONTEXT_DIR) / "data.json").read_text(encoding="utf-8"))
+        else:
+            data = prepare_data(args)
+        triples = route_triples(data)
+        results = asyncio.run(run_benchmark(args, triples))
+
+    revision = git_revision()
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{revision}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "revision": revision,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "target": args.base_url or "in-process",
+            "database": "postgres" if args.database_url else "sqlite",
+            "duration_s": args.duration,
+            "concurrency": args.concurrency,
+            "llm_latency_ms": args.llm_latency_ms,
+            "admission": not args.no_admission,
+            "python": sys.version.split()[0],
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }, indent=2))
+    print(f"✅ Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Compare group booking throughput against looping over the single endpoint.
+
+Requires a running API server. Passengers are spread over trips ten years in
+the future so the run never competes with real inventory; benchmark rows are
+deleted from the database afterwards.
+
+Usage:
+    python benchmarks/bench_bulk_booking.py --base-url http://localhost:8000 --passengers 50
+"""
+import argparse
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+env_path = Path(__file__).parent.parent / ".env"
+load_dotenv(dotenv_path=env_path)
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+
+from app.core.database import SessionLocal
+from app.models.booking import Booking
+from app.models.inventory import TripInventory
+
+PROVIDER = "Hanif"
+FROM_DISTRICT = "Dhaka"
+TO_DISTRICT = "Rajshahi"
+BASE_DATE = date.today() + timedelta(days=3650)
+
+
+def make_passengers(run_id: str, label: str, count: int) -> list:
+    """Build booking payloads, at most ten passengers per trip."""
+    return [
+        {
+            "customer_name": f"Bench Passenger {i}",
+            "customer_email": f"bench-{run_id}-{label}-{i}@example.com",
+            "customer_phone": "01700000000",
+            "from_district": FROM_DISTRICT,
+            "to_district": TO_DISTRICT,
+            "provider": PROVIDER,
+            "travel_date": (BASE_DATE + timedelta(days=i // 10)).isoformat(),
+            "num_seats": 1,
+        }
+        for i in range(count)
+    ]
+
+
+def run_single(client: httpx.Client, passengers: list) -> float:
+    """Book each passenger with its own request."""
+    start = time.perf_counter()
+    for payload in passengers:
+        client.post("/api/v1/bookings", json=payload).raise_for_status()
+    return time.perf_counter() - start
+
+
+def run_bulk(client: httpx.Client, passengers: list) -> float:
+    """Book all passengers with one group booking request."""
+    start = time.perf_counter()
+    client.post("/api/v1/bookings/bulk", json={"bookings": passengers}).raise_for_status()
+    return time.perf_counter() - start
+
+
+def cleanup(run_id: str, passengers: int):
+    """Delete benchmark bookings and the inventory rows they created."""
+    db = SessionLocal()
+    try:
+        deleted = db.query(Booking).filter(
+            Booking.customer_email.like(f"bench-{run_id}-%")
+        ).delete(synchronize_session=False)
+        db.query(TripInventory).filter(
+            TripInventory.provider == PROVIDER,
+            TripInventory.from_district == FROM_DISTRICT,
+            TripInventory.to_district == TO_DISTRICT,
+            TripInventory.travel_date >= BASE_DATE,
+            TripInventory.travel_date <= BASE_DATE + timedelta(days=passengers // 10 + 1)
+        ).delete(synchronize_session=False)
+        db.commit()
+        print(f"Cleaned up {deleted} benchmark bookings")
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000", help="API server URL")
+    parser.add_argument("--passengers", type=int, default=50, help="Passengers per run (max 100)")
+    args = parser.parse_args()
+
+    run_id = uuid.uuid4().hex[:8]
+    # Both runs share trips; twenty passengers per trip stays under the default capacity
+    single_passengers = make_passengers(run_id, "single", args.passengers)
+    bulk_passengers = make_passengers(run_id, "bulk", args.passengers)
+
+    try:
+        with httpx.Client(base_url=args.base_url, timeout=60) as client:
+            single_elapsed = run_single(client, single_passengers)
+            bulk_elapsed = run_bulk(client, bulk_passengers)
+    finally:
+        cleanup(run_id, args.passengers)
+
+    print("=" * 50)
+    print("Group Booking Benchmark")
+    print("=" * 50)
+    print(f"Passengers:        {args.passengers}")
+    print(f"Single endpoint:   {single_elapsed:.3f} s ({args.passengers / single_elapsed:.1f} passengers/s)")
+    print(f"Bulk endpoint:     {bulk_elapsed:.3f} s ({args.passengers / bulk_elapsed:.1f} passengers/s)")
+    print(f"Speedup:           {single_elapsed / bulk_elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
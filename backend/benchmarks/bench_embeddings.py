@@ -0,0 +1,132 @@
+"""Compare the PyTorch and ONNX embedding backends on the bus knowledge corpus.
+
+Both backends embed the same documents that data ingestion writes to Chroma
+and a set of queries derived from the source data. The report covers model
+load time, single-query latency, batch throughput, and how closely the ONNX
+backend reproduces retrieval: cosine similarity between the two backends'
+vectors and overlap of the exact top-k documents for each query.
+
+Usage:
+    python benchmarks/bench_embeddings.py
+    python benchmarks/bench_embeddings.py --k 8 --no-quantized
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+env_path = Path(__file__).parent.parent / ".env"
+load_dotenv(dotenv_path=env_path)
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.data_ingestion import DataIngestionService
+from app.services.embeddings import create_embeddings
+from app.services.onnx_embeddings import OnnxEmbeddings
+
+
+def build_queries(data: dict) -> list:
+    """Queries resembling chat and search traffic, derived from the source data."""
+    districts = [d["name"] for d in data.get("districts", [])]
+    providers = [p["name"] for p in data.get("bus_providers", [])]
+    queries = []
+    for i, from_district in enumerate(districts):
+        to_district = districts[(i + 1) % len(districts)]
+        queries.append(f"routes from {from_district} to {to_district}")
+        queries.append(f"What are the dropping points in {from_district}?")
+    for provider in providers:
+        queries.append(f"Tell me about {provider} bus service, their privacy policy and contact information")
+        queries.append(f"Which districts does {provider} cover?")
+    return queries
+
+
+def measure(embeddings, documents: list, queries: list, batch_repeats: int) -> dict:
+    """Embed the corpus and queries, timing both."""
+    # One call first so lazy initialization is not counted
+    embeddings.embed_query("warmup")
+
+    latencies = []
+    query_vectors = []
+    for query in queries:
+        start = time.perf_counter()
+        query_vectors.append(embeddings.embed_query(query))
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(batch_repeats):
+        doc_vectors = embeddings.embed_documents(documents)
+    batch_elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "query_vectors": np.array(query_vectors, dtype=np.float32),
+        "doc_vectors": np.array(doc_vectors, dtype=np.float32),
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)] * 1000,
+        "docs_per_s": len(documents) * batch_repeats / batch_elapsed,
+    }
+
+
+def top_k(query_vectors: np.ndarray, doc_vectors: np.ndarray, k: int) -> np.ndarray:
+    """Exact top-k document indices by cosine similarity (vectors are normalized)."""
+    scores = query_vectors @ doc_vectors.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--k", type=int, default=8, help="Documents retrieved per query (the chat tool uses 8)")
+    parser.add_argument("--batch-repeats", type=int, default=3, help="Times the corpus is embedded for throughput")
+    parser.add_argument("--no-quantized", action="store_true", help="Benchmark the float32 ONNX export instead of int8")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    reference = create_embeddings("huggingface")
+    hf_load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    onnx = OnnxEmbeddings(
+        settings.ONNX_MODEL_DIR,
+        quantized=not args.no_quantized,
+        intra_op_threads=settings.ONNX_INTRA_OP_THREADS
+    )
+    onnx_load = time.perf_counter() - start
+
+    service = DataIngestionService(embeddings=reference)
+    documents = [doc["document"] for doc in service.build_documents()]
+    queries = build_queries(service.load_json_data())
+
+    hf = measure(reference, documents, queries, args.batch_repeats)
+    ox = measure(onnx, documents, queries, args.batch_repeats)
+
+    doc_cosine = (hf["doc_vectors"] * ox["doc_vectors"]).sum(axis=1)
+    query_cosine = (hf["query_vectors"] * ox["query_vectors"]).sum(axis=1)
+    hf_top = top_k(hf["query_vectors"], hf["doc_vectors"], args.k)
+    ox_top = top_k(ox["query_vectors"], ox["doc_vectors"], args.k)
+    overlap = np.mean([len(set(a) & set(b)) / args.k for a, b in zip(hf_top, ox_top)])
+    top1 = np.mean(hf_top[:, 0] == ox_top[:, 0])
+
+    label = "ONNX float32" if args.no_quantized else "ONNX int8"
+    print("=" * 50)
+    print("Embedding Backend Benchmark")
+    print("=" * 50)
+    print(f"Corpus: {len(documents)} documents, {len(queries)} queries, k={args.k}")
+    print(f"{'':<16} {'load s':>8} {'query p50':>10} {'query p95':>10} {'docs/s':>9}")
+    print(f"{'PyTorch':<16} {hf_load:>8.2f} {hf['p50_ms']:>8.2f}ms {hf['p95_ms']:>8.2f}ms {hf['docs_per_s']:>9.1f}")
+    print(f"{label:<16} {onnx_load:>8.2f} {ox['p50_ms']:>8.2f}ms {ox['p95_ms']:>8.2f}ms {ox['docs_per_s']:>9.1f}")
+    print(f"Query speedup (p50):      {hf['p50_ms'] / ox['p50_ms']:.2f}x")
+    print(f"Batch speedup:            {ox['docs_per_s'] / hf['docs_per_s']:.2f}x")
+    print(f"Cosine to PyTorch:        docs min {doc_cosine.min():.4f} mean {doc_cosine.mean():.4f}, "
+          f"queries min {query_cosine.min():.4f} mean {query_cosine.mean():.4f}")
+    print(f"Top-{args.k} overlap:           {overlap:.1%}")
+    print(f"Top-1 agreement:          {top1:.1%}")
+
+
+if __name__ == "__main__":
+    main()
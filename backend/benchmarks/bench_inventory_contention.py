@@ -0,0 +1,169 @@
+"""Benchmark seat reservations when many clients book the same trip at once.
+
+Every client books one trip in a loop until it is sold out. The run reports
+booking throughput, sold-out rejections and pool wait times, then checks that
+the inventory counter matches the booked seats exactly (no overselling).
+
+Usage:
+    python benchmarks/bench_inventory_contention.py --clients 200 --capacity 1000
+"""
+import argparse
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+env_path = Path(__file__).parent.parent / ".env"
+load_dotenv(dotenv_path=env_path)
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import func
+
+from app.core.database import SessionLocal
+from app.core.db_metrics import get_pool_stats
+from app.models.booking import Booking, BookingStatus
+from app.models.inventory import TripInventory
+from app.services.inventory_service import get_inventory_service, SeatsUnavailableError
+
+FROM_DISTRICT = "Dhaka"
+TO_DISTRICT = "Chattogram"
+
+
+def create_trip(provider: str, travel_date: date, capacity: int):
+    """Create a fresh inventory row for the benchmark trip."""
+    db = SessionLocal()
+    try:
+        db.add(TripInventory(
+            provider=provider,
+            from_district=FROM_DISTRICT,
+            to_district=TO_DISTRICT,
+            travel_date=travel_date,
+            capacity=capacity,
+            seats_available=capacity
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_client(client_id: int, provider: str, travel_date: date, seats: int, latencies: list) -> dict:
+    """Book seats for one client until the trip is sold out."""
+    inventory = get_inventory_service()
+    result = {"booked": 0, "sold_out": 0, "errors": 0}
+
+    while True:
+        db = SessionLocal()
+        start = time.perf_counter()
+        try:
+            inventory.reserve_seats(db, provider, FROM_DISTRICT, TO_DISTRICT, travel_date, seats)
+            db.add(Booking(
+                customer_name=f"Bench Client {client_id}",
+                customer_email=f"bench{client_id}@example.com",
+                customer_phone="01700000000",
+                from_district=FROM_DISTRICT,
+                to_district=TO_DISTRICT,
+                provider=provider,
+                travel_date=travel_date,
+                num_seats=seats,
+                total_fare=0,
+                status=BookingStatus.CONFIRMED
+            ))
+            db.commit()
+            latencies.append(time.perf_counter() - start)
+            result["booked"] += 1
+        except SeatsUnavailableError:
+            db.rollback()
+            result["sold_out"] += 1
+            return result
+        except Exception as e:
+            db.rollback()
+            result["errors"] += 1
+            print(f"Client {client_id} error: {e}")
+            return result
+        finally:
+            db.close()
+
+
+def verify_and_cleanup(provider: str, travel_date: date, capacity: int) -> dict:
+    """Check counters against booked seats and remove benchmark rows."""
+    db = SessionLocal()
+    try:
+        trip = db.query(TripInventory).filter(TripInventory.provider == provider).one()
+        booked_seats = db.query(func.coalesce(func.sum(Booking.num_seats), 0)).filter(
+            Booking.provider == provider,
+            Booking.travel_date == travel_date
+        ).scalar()
+        report = {
+            "capacity": capacity,
+            "seats_available": trip.seats_available,
+            "booked_seats": int(booked_seats),
+            "consistent": capacity - trip.seats_available == booked_seats,
+        }
+        db.query(Booking).filter(Booking.provider == provider).delete()
+        db.query(TripInventory).filter(TripInventory.provider == provider).delete()
+        db.commit()
+        return report
+    finally:
+        db.close()
+
+
+def percentile(values: list, pct: float) -> float:
+    """Return the given percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=200, help="Concurrent booking clients")
+    parser.add_argument("--capacity", type=int, default=1000, help="Seats on the benchmark trip")
+    parser.add_argument("--seats", type=int, default=1, help="Seats per booking")
+    args = parser.parse_args()
+
+    provider = f"bench-{uuid.uuid4().hex[:8]}"
+    travel_date = date.today() + timedelta(days=30)
+    create_trip(provider, travel_date, args.capacity)
+
+    latencies: list = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as executor:
+        futures = [
+            executor.submit(run_client, i, provider, travel_date, args.seats, latencies)
+            for i in range(args.clients)
+        ]
+        results = [f.result() for f in futures]
+    elapsed = time.perf_counter() - start
+
+    booked = sum(r["booked"] for r in results)
+    report = verify_and_cleanup(provider, travel_date, args.capacity)
+    pool = get_pool_stats()
+
+    print("=" * 50)
+    print("Seat Inventory Contention Benchmark")
+    print("=" * 50)
+    print(f"Clients:              {args.clients}")
+    print(f"Capacity:             {args.capacity} seats ({args.seats} per booking)")
+    print(f"Bookings committed:   {booked}")
+    print(f"Sold-out rejections:  {sum(r['sold_out'] for r in results)}")
+    print(f"Errors:               {sum(r['errors'] for r in results)}")
+    print(f"Elapsed:              {elapsed:.2f} s")
+    print(f"Throughput:           {booked / elapsed:.1f} bookings/s")
+    print(f"Latency p50/p95/p99:  {percentile(latencies, 50) * 1000:.1f} / "
+          f"{percentile(latencies, 95) * 1000:.1f} / {percentile(latencies, 99) * 1000:.1f} ms")
+    print(f"Pool wait avg/max:    {pool['checkout_wait_avg_ms']} / {pool['checkout_wait_max_ms']} ms")
+    print(f"Peak pool saturation: {pool['peak_saturation']}")
+    print(f"Seats booked:         {report['booked_seats']} (available left: {report['seats_available']})")
+    print(f"Counter consistent:   {'✅' if report['consistent'] else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Measure memory per worker and throughput of the pre-fork server by worker count.
+
+For each worker count the script starts scripts/serve.py, waits until every
+worker reports ready, and reads RSS and PSS (proportional set size, which
+splits shared copy-on-write pages between the processes sharing them) from
+/proc. It then drives a fixed-concurrency load against one endpoint. Use
+--no-preload to compare against workers that each load their own model.
+
+Linux only (reads /proc/<pid>/smaps_rollup).
+
+Usage:
+    python benchmarks/bench_prefork.py --workers 1 2 4 --duration 20
+    python benchmarks/bench_prefork.py --workers 4 --path "/api/v1/bookings/1" --no-preload
+"""
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).parent.parent
+DEFAULT_PATH = "/api/v1/buses/search?from_district=Dhaka&to_district=Rajshahi"
+
+
+def read_memory(pid: int) -> dict:
+    """Read RSS, PSS and shared/private totals of one process in MiB."""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 3 and parts[1].isdigit():
+                values[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {
+        "rss": values.get("Rss", 0.0),
+        "pss": values.get("Pss", 0.0),
+        "shared": values.get("Shared_Clean", 0.0) + values.get("Shared_Dirty", 0.0),
+        "private": values.get("Private_Clean", 0.0) + values.get("Private_Dirty", 0.0),
+    }
+
+
+def child_pids(pid: int) -> list:
+    """List the direct children of a process."""
+    path = Path(f"/proc/{pid}/task/{pid}/children")
+    return [int(p) for p in path.read_text().split()] if path.exists() else []
+
+
+def wait_ready(base_url: str, workers: int, timeout: float):
+    """Poll /ready until enough consecutive answers (spread over the workers) succeed."""
+    deadline = time.monotonic() + timeout
+    needed = workers * 4
+    streak = 0
+    with httpx.Client(base_url=base_url, timeout=5) as client:
+        while time.monotonic() < deadline:
+            try:
+                # A fresh connection per probe lets the kernel hand it to any worker
+                ok = client.get("/ready", headers={"Connection": "close"}).status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            streak = streak + 1 if ok else 0
+            if streak >= needed:
+                return
+            time.sleep(0.05 if ok else 0.5)
+    raise RuntimeError(f"Server not ready after {timeout:.0f}s")
+
+
+async def drive_load(base_url: str, path: str, concurrency: int, duration: float) -> dict:
+    """Send requests from `concurrency` clients for `duration` seconds."""
+    latencies = []
+    errors = 0
+    stop_at = time.perf_counter() + duration
+
+    async def client_loop(client: httpx.AsyncClient):
+        nonlocal errors
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            try:
+                response = await client.get(path)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    count = len(latencies)
+    return {
+        "requests": count,
+        "errors": errors,
+        "rps": count / elapsed if elapsed else 0.0,
+        "p50_ms": latencies[count // 2] * 1000 if count else 0.0,
+        "p95_ms": latencies[min(int(count * 0.95), count - 1)] * 1000 if count else 0.0,
+    }
+
+
+def run_one(workers: int, args) -> dict:
+    """Start a server with `workers` workers, measure it, and stop it."""
+    command = [sys.executable, "scripts/serve.py", "--workers", str(workers), "--port", str(args.port), "--no-access-log"]
+    if args.no_preload:
+        command.append("--no-preload")
+    server = subprocess.Popen(command, cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        started = time.perf_counter()
+        wait_ready(base_url, workers, args.startup_timeout)
+        startup = time.perf_counter() - started
+
+        # Touch every worker once so lazily built per-worker state is counted
+        asyncio.run(drive_load(base_url, args.path, workers * 2, 2.0))
+        master = read_memory(server.pid)
+        worker_memory = [read_memory(pid) for pid in child_pids(server.pid)]
+        load = asyncio.run(drive_load(base_url, args.path, args.concurrency, args.duration))
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    count = max(len(worker_memory), 1)
+    return {
+        "workers": workers,
+        "startup_s": startup,
+        "master_rss": master["rss"],
+        "worker_rss": sum(m["rss"] for m in worker_memory) / count,
+        "worker_pss": sum(m["pss"] for m in worker_memory) / count,
+        "worker_private": sum(m["private"] for m in worker_memory) / count,
+        "total_pss": master["pss"] + sum(m["pss"] for m in worker_memory),
+        **load,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker counts to compare")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the benchmark server")
+    parser.add_argument("--path", default=DEFAULT_PATH, help="Endpoint to load")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=20.0, help="Load duration per worker count (seconds)")
+    parser.add_argument("--startup-timeout", type=float, default=300.0, help="Seconds to wait for readiness")
+    parser.add_argument("--no-preload", action="store_true", help="Workers load their own models")
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        print("❌ This benchmark needs Linux /proc/<pid>/smaps_rollup")
+        sys.exit(1)
+
+    results = [run_one(workers, args) for workers in args.workers]
+
+    print("=" * 50)
+    print(f"Pre-fork Benchmark ({'no preload' if args.no_preload else 'preloaded master'})")
+    print("=" * 50)
+    print(f"Endpoint: {args.path}  concurrency: {args.concurrency}  duration: {args.duration:.0f}s")
+    print(
+        f"{'workers':>7} {'ready s':>8} {'RSS/wkr':>9} {'PSS/wkr':>9} {'priv/wkr':>9} {'total PSS':>10} "
+        f"{'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}"
+    )
+    for r in results:
+        print(
+            f"{r['workers']:>7} {r['startup_s']:>8.1f} {r['worker_rss']:>8.0f}M {r['worker_pss']:>8.0f}M "
+            f"{r['worker_private']:>8.0f}M {r['total_pss']:>9.0f}M {r['rps']:>8.1f} {r['p50_ms']:>8.1f} "
+            f"{r['p95_ms']:>8.1f} {r['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
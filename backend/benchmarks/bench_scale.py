@@ -0,0 +1,225 @@
+"""Exercise ingestion, service loading and bus search on a synthetic network.
+
+Generates a network with scripts/generate_network.py (or uses --context-dir),
+points CONTEXT_DIR and CHROMA_PERSIST_DIR at temporary directories, and then
+measures each stage the API goes through at that size:
+
+- document build and Chroma ingestion time (documents/s)
+- on-disk index size
+- pricing index and BusService load time
+- bus search latency (p50/p95/p99) and recall: the share of providers
+  serving a route (known from data.json) that the search actually returns
+- provider listing latency
+- process memory (RSS) after each stage and at peak
+
+The chat model is the local fake (LLM_PROVIDER=fake); search never calls it.
+
+Usage:
+    python benchmarks/bench_scale.py
+    python benchmarks/bench_scale.py --districts 64 --providers 400 --queries 500 --output scale.json
+    python benchmarks/bench_scale.py --context-dir /tmp/network
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+
+def rss_mb() -> float:
+    """Current resident set size in MiB (Linux)."""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size in MiB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def dir_size_mb(path: Path) -> float:
+    """Total size of the files under a directory in MiB."""
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file()) / 2**20
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def route_providers(data: dict) -> dict:
+    """(from, to) -> providers operating it, the ground truth for search recall."""
+    with_points = {d["name"] for d in data["districts"] if d.get("dropping_points")}
+    routes = {}
+    for provider in data["bus_providers"]:
+        coverage = provider["coverage_districts"]
+        for from_district in coverage:
+            for to_district in coverage:
+                if from_district != to_district and to_district in with_points:
+                    routes.setdefault((from_district, to_district), set()).add(provider["name"])
+    return routes
+
+
+class Stages:
+    """Wall time and memory after each stage."""
+
+    def __init__(self):
+        """Initialize an empty report."""
+        self.rows = []
+
+    def run(self, name: str, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        self.rows.append({"stage": name, "seconds": round(elapsed, 3), "rss_mb": round(rss_mb(), 1)})
+        print(f"{name:<28} {elapsed:>9.2f} s {rss_mb():>9.1f} MiB")
+        return result
+
+
+async def measure_search(bus_service, routes: dict, queries: int, seed: int) -> dict:
+    """Time search_buses over random routes and compare results with the ground truth."""
+    rng = random.Random(seed)
+    pairs = rng.choices(list(routes), k=queries)
+    latencies = []
+    recalls = []
+    for from_district, to_district in pairs:
+        start = time.perf_counter()
+        results = await bus_service.search_buses(from_district, to_district)
+        latencies.append(time.perf_counter() - start)
+        expected = routes[(from_district, to_district)]
+        found = {r.provider for r in results} & expected
+        recalls.append(len(found) / len(expected))
+    latencies.sort()
+    providers_per_route = [len(routes[p]) for p in pairs]
+    return {
+        "queries": queries,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_recall": round(sum(recalls) / len(recalls), 4),
+        "full_recall_share": round(sum(r == 1.0 for r in recalls) / len(recalls), 4),
+        "mean_providers_per_route": round(sum(providers_per_route) / len(providers_per_route), 2),
+        "max_providers_per_route": max(providers_per_route),
+    }
+
+
+def measure_listing(bus_service, districts: list) -> dict:
+    """Time the provider listing filtered by each district."""
+    latencies = []
+    for district in districts:
+        start = time.perf_counter()
+        bus_service.get_all_providers(district)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return {
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--context-dir", help="Use an existing generated network instead of generating one")
+    parser.add_argument("--districts", type=int, default=64)
+    parser.add_argument("--providers", type=int, default=200)
+    parser.add_argument("--max-points", type=int, default=320, help="Dropping points in the busiest district")
+    parser.add_argument("--attachment-bytes", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--queries", type=int, default=200, help="Searches to time")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-scale-") as tmp:
+        workdir = Path(tmp)
+        context_dir = Path(args.context_dir) if args.context_dir else workdir / "context"
+
+        # Settings are read at import time, so everything is pointed at the temp dirs first
+        os.environ["CONTEXT_DIR"] = str(context_dir)
+        os.environ["CHROMA_PERSIST_DIR"] = str(workdir / "chroma")
+        os.environ["TRACE_DIR"] = str(workdir / "traces")
+        os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'unused.db'}"
+        os.environ["LLM_PROVIDER"] = "fake"
+        os.environ["LOG_LEVEL"] = "WARNING"
+        os.environ["LANGSMITH_TRACING"] = "false"
+        os.environ.setdefault("GOOGLE_API_KEY", "unused-with-fake-llm")
+
+        from dotenv import load_dotenv
+
+        load_dotenv(dotenv_path=BACKEND_DIR / ".env")
+        sys.path.insert(0, str(BACKEND_DIR))
+
+        from scripts.generate_network import generate_network
+        from app.services.embeddings import get_embeddings
+        from app.services.data_ingestion import DataIngestionService
+        from app.services.pricing_service import PricingService
+        from app.services.bus_service import get_bus_service
+
+        print("=" * 50)
+        print("Scale Benchmark")
+        print("=" * 50)
+        print(f"{'stage':<28} {'time':>11} {'RSS':>13}")
+        stages = Stages()
+        stages.rows.append({"stage": "imports", "seconds": 0.0, "rss_mb": round(rss_mb(), 1)})
+
+        network = None
+        if not args.context_dir:
+            network = stages.run(
+                "generate network", generate_network, context_dir,
+                args.districts, args.providers, args.max_points, 2, args.attachment_bytes, args.seed
+            )
+
+        stages.run("load embedding model", get_embeddings)
+        service = DataIngestionService()
+        documents = stages.run("build documents", service.build_documents)
+        ingested = stages.run("ingest into Chroma", service.ingest_all_data)
+        ingest_seconds = stages.rows[-1]["seconds"]
+        index_mb = dir_size_mb(workdir / "chroma")
+
+        pricing = stages.run("build pricing index", PricingService)
+        bus_service = stages.run("load BusService", get_bus_service)
+
+        data = service.load_json_data()
+        routes = route_providers(data)
+        search = asyncio.run(measure_search(bus_service, routes, args.queries, args.seed))
+        listing = measure_listing(bus_service, [d["name"] for d in data["districts"]])
+
+        print("-" * 50)
+        if network:
+            print(f"Network:            {network['districts']} districts, {network['providers']} providers, "
+                  f"{network['dropping_points']:,} dropping points, {network['routes']:,} provider routes")
+        print(f"Documents:          {len(documents):,} ({ingested / ingest_seconds:.0f} docs/s ingested)")
+        print(f"Index size:         {index_mb:.1f} MiB")
+        print(f"Pricing fares:      {len(pricing.index.fares):,}")
+        print(f"Search latency:     p50 {search['p50_ms']:.1f}ms  p95 {search['p95_ms']:.1f}ms  p99 {search['p99_ms']:.1f}ms")
+        print(f"Search recall:      {search['mean_recall']:.1%} mean, {search['full_recall_share']:.1%} of routes complete "
+              f"({search['mean_providers_per_route']:.1f} providers/route, max {search['max_providers_per_route']})")
+        print(f"Provider listing:   p50 {listing['p50_ms']:.3f}ms  p95 {listing['p95_ms']:.3f}ms")
+        print(f"Peak RSS:           {peak_rss_mb():.1f} MiB")
+
+        if args.output:
+            Path(args.output).write_text(json.dumps({
+                "network": network,
+                "documents": len(documents),
+                "index_mb": round(index_mb, 2),
+                "fares": len(pricing.index.fares),
+                "stages": stages.rows,
+                "search": search,
+                "listing": listing,
+                "peak_rss_mb": round(peak_rss_mb(), 1),
+            }, indent=2))
+            print(f"✅ Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
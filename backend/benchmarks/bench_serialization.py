@@ -0,0 +1,173 @@
+"""Measure JSON serialization time and bytes on the wire for hot responses.
+
+Builds a bus search response (routes sharing one destination's dropping
+points) and a page of bookings, then times each way the API can turn them
+into bytes:
+
+- validate + json.dumps: what FastAPI does with a returned model and the
+  stock JSONResponse (dump, validate against response_model, encode)
+- validate + orjson: the same with ORJSONResponse as the default class
+- model_dump_json: app.utils.responses.model_response, which skips the
+  second validation
+- orjson (cached dict): json_response for booking pages served from cache
+
+Compressed sizes and compression time use the same functions as
+CompressionMiddleware (gzip always, brotli when the package is installed).
+
+Usage:
+    python benchmarks/bench_serialization.py
+    python benchmarks/bench_serialization.py --routes 10 --points 320 --bookings 100 --iterations 2000
+    python benchmarks/bench_serialization.py --output serialization.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+
+def per_call_us(fn, iterations: int) -> float:
+    """Mean microseconds per call after one warmup call."""
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def build_search(schemas, routes: int, points: int):
+    """A search response with `routes` providers to a destination with `points` dropping points."""
+    dropping_points = [
+        schemas.DroppingPoint(name=f"Counter {i} Chattar", price=700 + (i * 37) % 400)
+        for i in range(points)
+    ]
+    prices = [dp.price for dp in dropping_points]
+    return schemas.BusSearchResponse(
+        routes=[
+            schemas.RouteResponse(
+                provider=f"Provider {i} Paribahan",
+                from_district="Dhaka",
+                to_district="Chattogram",
+                min_price=min(prices),
+                max_price=max(prices),
+                dropping_points=dropping_points,
+                description=f"Provider {i} Paribahan operates on this route"
+            )
+            for i in range(routes)
+        ],
+        total_results=routes
+    )
+
+
+def build_bookings(schemas, count: int):
+    """A page of `count` bookings for one customer."""
+    now = datetime(2025, 1, 15, 9, 30)
+    return schemas.BookingListResponse(
+        bookings=[
+            schemas.BookingResponse(
+                id=100000 + i,
+                customer_name="Rahim Uddin",
+                customer_email="rahim@example.com",
+                customer_phone="+8801712345678",
+                from_district="Dhaka",
+                to_district="Sylhet",
+                provider="Green Line",
+                travel_date=date(2025, 2, 1) + timedelta(days=i % 30),
+                num_seats=1 + i % 4,
+                dropping_point="Kadamtali",
+                status="confirmed",
+                total_fare=750 * (1 + i % 4),
+                created_at=now - timedelta(minutes=i),
+                updated_at=now - timedelta(minutes=i),
+            )
+            for i in range(count)
+        ],
+        total_bookings=count,
+        next_cursor="MjAyNS0wMS0xNVQwOTozMDowMHwxMDAwMDA"
+    )
+
+
+def measure(model, iterations: int, compress, encodings: list) -> dict:
+    """Serialization variants and compressed sizes for one response model."""
+    import orjson
+
+    model_class = type(model)
+    cached = model.model_dump(mode="json")
+
+    def validate_and_dump():
+        # Mirrors FastAPI's serialize_response for a returned model
+        return model_class.model_validate(model.model_dump()).model_dump(mode="json")
+
+    variants = {
+        "validate + json.dumps": lambda: json.dumps(
+            validate_and_dump(), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8"),
+        "validate + orjson": lambda: orjson.dumps(validate_and_dump()),
+        "model_dump_json": lambda: model.model_dump_json().encode("utf-8"),
+        "orjson (cached dict)": lambda: orjson.dumps(cached),
+    }
+    body = model.model_dump_json().encode("utf-8")
+    result = {
+        "serialize_us": {name: round(per_call_us(fn, iterations), 1) for name, fn in variants.items()},
+        "bytes": {"identity": len(body)},
+        "compress_us": {},
+    }
+    for encoding in encodings:
+        result["bytes"][encoding] = len(compress(body, encoding))
+        result["compress_us"][encoding] = round(per_call_us(lambda: compress(body, encoding), max(iterations // 10, 1)), 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--routes", type=int, default=10, help="Routes in the search response (search k is 10)")
+    parser.add_argument("--points", type=int, default=40, help="Dropping points at the destination")
+    parser.add_argument("--bookings", type=int, default=100, help="Bookings in the page (limit is 1-100)")
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    args = parser.parse_args()
+
+    # Settings are read at import time; nothing here touches the database
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ["LOG_LEVEL"] = "WARNING"
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    from app.schemas import booking as booking_schemas
+    from app.schemas import bus as bus_schemas
+    from app.middleware.compression import brotli, compress
+
+    encodings = ["gzip"] + (["br"] if brotli is not None else [])
+
+    print("=" * 50)
+    print("Serialization Benchmark")
+    print("=" * 50)
+    report = {
+        "search": measure(build_search(bus_schemas, args.routes, args.points), args.iterations, compress, encodings),
+        "bookings": measure(build_bookings(booking_schemas, args.bookings), args.iterations, compress, encodings),
+    }
+    if brotli is None:
+        print("brotli is not installed; only gzip is measured")
+
+    for name, result in report.items():
+        print(f"{name}:")
+        baseline = result["serialize_us"]["validate + json.dumps"]
+        for variant, us in result["serialize_us"].items():
+            print(f"   {variant:<24} {us:>10.1f} us  ({baseline / us:.1f}x)")
+        identity = result["bytes"]["identity"]
+        print(f"   {'identity':<24} {identity:>10,} bytes")
+        for encoding in encodings:
+            size = result["bytes"][encoding]
+            print(f"   {encoding:<24} {size:>10,} bytes  ({size / identity:.1%}, "
+                  f"{result['compress_us'][encoding]:.1f} us to compress)")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({"args": vars(args), **report}, indent=2))
+        print(f"✅ Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""Script to archive bookings by travel date to compressed files.
+
+Bookings are streamed through a server-side cursor in batches, so memory use
+stays flat regardless of how many rows are archived. With --delete, exactly the
+archived rows (by id and updated_at) are then removed in small, separately
+committed chunks so the table is never locked for long.
+
+Usage:
+    python scripts/archive_bookings.py --start 2025-01-01 --end 2025-06-30 --format csv
+    python scripts/archive_bookings.py --start 2025-01-01 --end 2025-06-30 --format parquet --delete
+"""
+import argparse
+import csv
+import enum
+import gzip
+import json
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+env_path = Path(__file__).parent.parent / ".env"
+load_dotenv(dotenv_path=env_path)
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, delete, tuple_, and_, or_
+
+from app.core.config import settings
+from app.core.database import engine
+from app.models.booking import Booking
+from app.core.logging import logger
+from app.services.cache import get_booking_cache
+
+ARCHIVE_DIR = Path(__file__).parent.parent / "archives"
+
+
+def serialize_value(value):
+    """Convert database values to plain strings and numbers."""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+class CsvArchiveWriter:
+    """Write rows to a gzip-compressed CSV file."""
+
+    def __init__(self, path: Path, columns: list):
+        self.file = gzip.open(path, "wt", encoding="utf-8", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(columns)
+
+    def write_batch(self, rows: list):
+        self.writer.writerows([serialize_value(v) for v in row] for row in rows)
+
+    def close(self):
+        self.file.close()
+
+
+class JsonlArchiveWriter:
+    """Write rows to a gzip-compressed JSON Lines file."""
+
+    def __init__(self, path: Path, columns: list):
+        self.file = gzip.open(path, "wt", encoding="utf-8")
+        self.columns = columns
+
+    def write_batch(self, rows: list):
+        self.file.writelines(
+            json.dumps({c: serialize_value(v) for c, v in zip(self.columns, row)}, ensure_ascii=False) + "\n"
+            for row in rows
+        )
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetArchiveWriter:
+    """Write rows to a zstd-compressed Parquet file, one row group per batch."""
+
+    def __init__(self, path: Path, columns: list):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("The pyarrow package is required for Parquet archives (pip install pyarrow)")
+        self.pa = pa
+        self.pq = pq
+        self.path = path
+        self.columns = columns
+        self.writer = None
+
+    def write_batch(self, rows: list):
+        table = self.pa.Table.from_pylist(
+            [{c: serialize_value(v) for c, v in zip(self.columns, row)} for row in rows]
+        )
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.path, table.schema, compression="zstd")
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+WRITERS = {
+    "csv": (CsvArchiveWriter, "csv.gz"),
+    "jsonl": (JsonlArchiveWriter, "jsonl.gz"),
+    "parquet": (ParquetArchiveWriter, "parquet"),
+}
+
+
+def in_range(start: date, end: date):
+    """Filter for bookings travelling between start and end (inclusive)."""
+    return (Booking.travel_date >= start, Booking.travel_date <= end)
+
+
+def export_bookings(start: date, end: date, fmt: str, output: Path, batch_size: int, spool) -> int:
+    """
+    Stream bookings in the date range to an archive file.
+
+    The (id, updated_at) of every exported row is appended to `spool`, so a
+    later delete can remove exactly the rows that were archived.
+
+    Returns:
+        Number of rows exported
+    """
+    table = Booking.__table__
+    columns = [c.name for c in table.columns]
+    writer_class, _ = WRITERS[fmt]
+    writer = writer_class(output, columns)
+
+    exported = 0
+    started = time.perf_counter()
+    stmt = select(table).where(*in_range(start, end)).order_by(table.c.id)
+
+    try:
+        with engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(stmt)
+            for batch in result.partitions():
+                writer.write_batch(batch)
+                spool.writelines(
+                    f"{row.id}\t{row.updated_at.isoformat() if row.updated_at else ''}\n" for row in batch
+                )
+                exported += len(batch)
+                elapsed = time.perf_counter() - started
+                print(f"  exported {exported} rows ({exported / elapsed:.0f} rows/s)", end="\r")
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"\nExported {exported} rows in {elapsed:.2f} s ({exported / max(elapsed, 1e-9):.0f} rows/s)")
+    return exported
+
+
+def read_spool(spool, chunk_size: int):
+    """Yield lists of (id, updated_at) exported rows, chunk_size at a time."""
+    spool.seek(0)
+    chunk = []
+    for line in spool:
+        row_id, _, updated_at = line.rstrip("\n").partition("\t")
+        chunk.append((int(row_id), datetime.fromisoformat(updated_at) if updated_at else None))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def delete_archived(start: date, end: date, spool, chunk_size: int) -> int:
+    """
+    Delete archived bookings in small committed chunks.
+
+    Only the exported rows are deleted, and only while their updated_at is
+    unchanged. A booking that committed after the export's snapshot (even
+    with a lower id) or was modified after it was exported stays in the
+    table, so nothing is removed without being archived as it is. Every
+    DELETE also carries the archived travel_date range, so on the
+    partitioned table PostgreSQL only visits the partitions being archived.
+    """
+    deleted_total = 0
+    started = time.perf_counter()
+
+    for chunk in read_spool(spool, chunk_size):
+        pairs = [(row_id, updated_at) for row_id, updated_at in chunk if updated_at is not None]
+        never_updated = [row_id for row_id, updated_at in chunk if updated_at is None]
+        conditions = []
+        if pairs:
+            conditions.append(tuple_(Booking.id, Booking.updated_at).in_(pairs))
+        if never_updated:
+            conditions.append(and_(Booking.id.in_(never_updated), Booking.updated_at.is_(None)))
+        with engine.begin() as conn:
+            deleted_total += conn.execute(
+                delete(Booking).where(*in_range(start, end), or_(*conditions))
+            ).rowcount
+        elapsed = time.perf_counter() - started
+        print(f"  deleted {deleted_total} rows ({deleted_total / max(elapsed, 1e-9):.0f} rows/s)", end="\r")
+
+    elapsed = time.perf_counter() - started
+    print(f"\nDeleted {deleted_total} rows in {elapsed:.2f} s ({deleted_total / max(elapsed, 1e-9):.0f} rows/s)")
+    return deleted_total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", type=date.fromisoformat, required=True, help="First travel date (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, required=True, help="Last travel date (YYYY-MM-DD)")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="csv", help="Archive file format")
+    parser.add_argument("--output", type=Path, help="Archive file path (default: archives/bookings_<start>_<end>.<ext>)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows fetched per cursor batch")
+    parser.add_argument("--delete", action="store_true", help="Delete archived rows after a successful export")
+    parser.add_argument("--delete-chunk", type=int, default=1000, help="Rows deleted per transaction")
+    parser.add_argument("--yes", action="store_true", help="Skip the deletion confirmation prompt")
+    args = parser.parse_args()
+
+    output = args.output
+    if output is None:
+        ARCHIVE_DIR.mkdir(exist_ok=True)
+        output = ARCHIVE_DIR / f"bookings_{args.start}_{args.end}.{WRITERS[args.format][1]}"
+
+    print("=" * 50)
+    print("Archive Bookings Script")
+    print("=" * 50)
+    print(f"Archiving bookings travelling {args.start} to {args.end} into {output}")
+
+    # Exported row versions go to a temporary file, keeping memory flat for any range size
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as spool:
+        exported = export_bookings(args.start, args.end, args.format, output, args.batch_size, spool)
+        size = output.stat().st_size if output.exists() else 0
+        print(f"Archive size: {size / 1024:.1f} KiB")
+        logger.info(f"Archived {exported} bookings ({args.start} to {args.end}) to {output}")
+
+        if not args.delete or not exported:
+            return
+
+        if not args.yes:
+            confirmation = input(f"Delete the {exported} archived bookings from the database? (yes/no): ")
+            if confirmation.lower() != "yes":
+                print("Deletion skipped.")
+                return
+
+        deleted = delete_archived(args.start, args.end, spool, args.delete_chunk)
+    logger.info(f"Deleted {deleted} archived bookings ({args.start} to {args.end})")
+    if deleted < exported:
+        print(f"{exported - deleted} exported bookings changed or were removed after the export and were kept; "
+              "archive them in a later run.")
+    if deleted:
+        # Customers' cached bookings and pages still include the deleted rows
+        get_booking_cache().invalidate_all()
+        if settings.BOOKING_CACHE_BACKEND == "memory":
+            print("Note: the API's in-process booking caches keep deleted bookings for up to "
+                  f"{settings.BOOKING_CACHE_TTL_SECONDS}s; use BOOKING_CACHE_BACKEND=redis to flush them from here.")
+    print(f"✅ Archived {exported} and deleted {deleted} bookings.")
+
+
+if __name__ == "__main__":
+    main()
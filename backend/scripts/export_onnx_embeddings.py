@@ -0,0 +1,124 @@
+"""Script to export all-MiniLM-L6-v2 to ONNX and quantize it to int8.
+
+Writes model.onnx (float32), model_quantized.onnx (int8 dynamic quantization
+of the weights) and tokenizer.json to ONNX_MODEL_DIR, then checks that the
+quantized model's sentence embeddings match the PyTorch ones. Afterwards set
+EMBEDDING_BACKEND=onnx to serve with it.
+
+Requires torch and transformers (already installed with the HuggingFace
+backend) plus onnxruntime.
+
+Usage:
+    python scripts/export_onnx_embeddings.py
+    python scripts/export_onnx_embeddings.py --output-dir models/minilm-onnx --opset 17
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+env_path = Path(__file__).parent.parent / ".env"
+load_dotenv(dotenv_path=env_path)
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.embeddings import EMBEDDING_MODEL_NAME, create_embeddings
+from app.services.onnx_embeddings import (
+    OnnxEmbeddings,
+    FULL_MODEL_FILE,
+    QUANTIZED_MODEL_FILE,
+    MAX_SEQ_LENGTH
+)
+
+CHECK_SENTENCES = [
+    "buses from Dhaka to Rajshahi",
+    "What is the cancellation policy of Hanif Enterprise?",
+    "dropping points in Chattogram and their fares",
+]
+
+
+def export(output_dir: Path, opset: int):
+    """Export the transformer (without pooling) to ONNX and save its tokenizer."""
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(EMBEDDING_MODEL_NAME)
+    model = AutoModel.from_pretrained(EMBEDDING_MODEL_NAME).eval()
+    tokenizer.save_pretrained(str(output_dir))
+
+    sample = tokenizer(CHECK_SENTENCES, padding=True, truncation=True, max_length=MAX_SEQ_LENGTH, return_tensors="pt")
+    inputs = (sample["input_ids"], sample["attention_mask"], sample["token_type_ids"])
+    dynamic = {0: "batch", 1: "sequence"}
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            inputs,
+            str(output_dir / FULL_MODEL_FILE),
+            input_names=["input_ids", "attention_mask", "token_type_ids"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": dynamic,
+                "attention_mask": dynamic,
+                "token_type_ids": dynamic,
+                "last_hidden_state": dynamic,
+            },
+            opset_version=opset,
+            do_constant_folding=True,
+        )
+
+
+def quantize(output_dir: Path):
+    """Quantize weights to int8; activations are quantized dynamically at run time."""
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    quantize_dynamic(
+        str(output_dir / FULL_MODEL_FILE),
+        str(output_dir / QUANTIZED_MODEL_FILE),
+        weight_type=QuantType.QInt8,
+    )
+
+
+def verify(output_dir: Path):
+    """Compare ONNX embeddings with the PyTorch backend on a few sentences."""
+    reference = np.array(create_embeddings("huggingface").embed_documents(CHECK_SENTENCES))
+    for quantized in (False, True):
+        onnx_vectors = np.array(OnnxEmbeddings(str(output_dir), quantized=quantized).embed_documents(CHECK_SENTENCES))
+        cosines = (reference * onnx_vectors).sum(axis=1)
+        label = "int8" if quantized else "float32"
+        print(f"{label:>8}: cosine to PyTorch min {cosines.min():.4f}, mean {cosines.mean():.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output-dir", default=settings.ONNX_MODEL_DIR, help="Directory for the exported model")
+    parser.add_argument("--opset", type=int, default=14, help="ONNX opset version")
+    parser.add_argument("--skip-verify", action="store_true", help="Don't compare against the PyTorch model")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("Export ONNX Embeddings Script")
+    print("=" * 50)
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    export(output_dir, args.opset)
+    quantize(output_dir)
+    full_mb = (output_dir / FULL_MODEL_FILE).stat().st_size / 1e6
+    quantized_mb = (output_dir / QUANTIZED_MODEL_FILE).stat().st_size / 1e6
+    print(f"✅ Exported to {output_dir} in {time.perf_counter() - start:.1f}s")
+    print(f"   {FULL_MODEL_FILE}: {full_mb:.1f} MB, {QUANTIZED_MODEL_FILE}: {quantized_mb:.1f} MB")
+
+    if not args.skip_verify:
+        verify(output_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""Script to generate a synthetic bus network for scale testing.
+
+Writes data.json and one attachment (provider policy text) per provider in the
+same layout as context/, so the output directory can be used as CONTEXT_DIR
+for ingestion, the pricing index and the API. Output is deterministic for a
+given --seed.
+
+Distributions are skewed the way real networks are: district popularity
+follows a Zipf law (Dhaka first), so hubs get many dropping points and appear
+in most providers' coverage; most providers are regional operators covering a
+handful of districts while a few national carriers cover dozens; fares grow
+with distance from Dhaka with per-counter variation.
+
+Usage:
+    python scripts/generate_network.py --output-dir /tmp/network
+    python scripts/generate_network.py --output-dir /tmp/network --districts 64 --providers 200 --max-points 320
+"""
+import argparse
+import json
+import math
+import random
+import sys
+from pathlib import Path
+
+# The 64 districts of Bangladesh, roughly by bus traffic (the Zipf rank)
+DISTRICT_NAMES = [
+    "Dhaka", "Chattogram", "Sylhet", "Khulna", "Rajshahi", "Cox's Bazar", "Barishal", "Rangpur",
+    "Mymensingh", "Comilla", "Bogra", "Gazipur", "Narayanganj", "Jashore", "Kushtia", "Dinajpur",
+    "Tangail", "Feni", "Noakhali", "Pabna", "Sirajganj", "Faridpur", "Brahmanbaria", "Moulvibazar",
+    "Habiganj", "Chandpur", "Kishoreganj", "Jamalpur", "Naogaon", "Natore", "Satkhira", "Bagerhat",
+    "Patuakhali", "Bhola", "Gopalganj", "Madaripur", "Sunamganj", "Netrokona", "Sherpur", "Gaibandha",
+    "Kurigram", "Lalmonirhat", "Nilphamari", "Thakurgaon", "Panchagarh", "Joypurhat", "Chapai Nawabganj",
+    "Jhenaidah", "Magura", "Narail", "Chuadanga", "Meherpur", "Rajbari", "Manikganj", "Munshiganj",
+    "Narsingdi", "Shariatpur", "Lakshmipur", "Pirojpur", "Jhalokati", "Barguna", "Bandarban",
+    "Rangamati", "Khagrachhari",
+]
+PROVIDER_PREFIXES = [
+    "Green", "Star", "Royal", "Golden", "Silver", "Sonar Bangla", "Padma", "Meghna", "Jamuna",
+    "Karnaphuli", "Surma", "Tista", "Rupsha", "Shohag", "Saint Martin", "Nabil", "Eagle", "Agomoni",
+    "Tuba", "Unique", "Al Hamra", "Lal Sabuj", "Ekota", "Mitali", "Desh", "Shapla", "Dolphin",
+    "Sakura", "Hanif", "Shyamoli",
+]
+PROVIDER_SUFFIXES = ["Paribahan", "Travels", "Express", "Line", "Enterprise", "Transport", "Deluxe", "Coach", "Service"]
+POINT_PREFIXES = [
+    "Notun", "Puran", "Uttar", "Dakshin", "Kazi", "Shah", "Mohan", "Rup", "Nawab", "Shanti", "Bir",
+    "Chowdhury", "Mirza", "Kamal", "Sonar", "Rajar", "Station", "College", "Court", "Hospital",
+    "Stadium", "Rail", "Boro", "Choto",
+]
+POINT_SUFFIXES = ["bazar", "pur", "ganj", "mor", "hat", "ghat", "tola", "para", " Road", " Chattar", " Terminal", " Counter"]
+POLICY_SENTENCES = [
+    "Personal data is used only to process bookings, issue tickets and notify passengers of schedule changes.",
+    "Payment details are handled by licensed payment partners and are never stored on our servers.",
+    "Passengers may request a copy of their stored information or its deletion by contacting customer support.",
+    "Tickets cancelled at least 24 hours before departure are refunded after deducting a service charge.",
+    "Counter staff may ask for a national ID or phone number to verify a booking before boarding.",
+    "Luggage above 20 kg per passenger may be charged separately at the counter.",
+    "Schedules can change during public holidays, hartals or severe weather; affected passengers are informed by SMS.",
+    "Promotional messages are sent only to customers who have opted in and can be stopped at any time.",
+    "Complaints are acknowledged within two working days and resolved within fourteen working days.",
+    "CCTV recordings inside coaches are retained for thirty days for passenger safety.",
+]
+
+
+def zipf_weights(count: int, exponent: float) -> list:
+    """Popularity weights 1, 1/2^s, 1/3^s, ... for ranks 1..count."""
+    return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+def weighted_sample(rng: random.Random, items: list, weights: list, k: int) -> list:
+    """Sample k distinct items with probability proportional to weight (Efraimidis-Spirakis)."""
+    keyed = sorted(zip(items, weights), key=lambda iw: rng.random() ** (1 / iw[1]), reverse=True)
+    return [item for item, _ in keyed[:k]]
+
+
+def district_names(count: int) -> list:
+    """Real district names first, numbered extras beyond 64."""
+    names = DISTRICT_NAMES[:count]
+    names += [f"District {i}" for i in range(len(names) + 1, count + 1)]
+    return names
+
+
+def provider_names(rng: random.Random, count: int) -> list:
+    """Unique provider names built from common Bangladeshi operator name parts."""
+    combos = [f"{p} {s}" for p in PROVIDER_PREFIXES for s in PROVIDER_SUFFIXES]
+    rng.shuffle(combos)
+    names = combos[:count]
+    names += [f"{combos[i % len(combos)]} {i // len(combos) + 2}" for i in range(len(names), count)]
+    return names
+
+
+def make_dropping_points(rng: random.Random, district: str, count: int, base_fare: float) -> list:
+    """Named counters with fares scattered around the district's base fare."""
+    points = []
+    used = set()
+    while len(points) < count:
+        name = f"{rng.choice(POINT_PREFIXES)}{rng.choice(POINT_SUFFIXES)}"
+        if name in used:
+            name = f"{name} {len(points) + 1}"
+        used.add(name)
+        fare = base_fare * rng.uniform(0.85, 1.15)
+        points.append({"name": name, "price": int(round(fare / 10) * 10)})
+    return points
+
+
+def coverage_size(rng: random.Random, districts: int) -> int:
+    """Regional (most), inter-regional or national operator footprint."""
+    roll = rng.random()
+    if roll < 0.85:
+        size = rng.randint(3, 8)
+    elif roll < 0.97:
+        size = rng.randint(8, 20)
+    else:
+        size = rng.randint(25, 60)
+    return min(size, districts)
+
+
+def make_attachment(rng: random.Random, provider: str, home: str, target_bytes: int) -> str:
+    """Provider policy text in the shape of the real attachments, padded to about target_bytes."""
+    slug = "".join(c for c in provider.lower() if c.isalnum())
+    lines = [
+        f"{provider} Privacy Policy",
+        "",
+        f"{provider} is committed to protecting the privacy and personal data of our customers.",
+        "",
+        f"Official Address: {home} bus terminal area, {home}",
+        f"Contact Information: Customer Support: 1{rng.randint(1000, 9999)}, "
+        f"Counter: 01{rng.randint(3, 9)}{rng.randint(10, 99)}-{rng.randint(100000, 999999)}",
+        f"Privacy Policy / Terms Link: https://{slug}.example.com/privacy-policy",
+        "",
+    ]
+    text = "\n".join(lines)
+    while len(text.encode("utf-8")) < target_bytes:
+        text += rng.choice(POLICY_SENTENCES) + " "
+    return text.strip() + "\n"
+
+
+def generate_network(
+    output_dir: Path,
+    districts: int = 64,
+    providers: int = 200,
+    max_points: int = 320,
+    min_points: int = 2,
+    attachment_bytes: int = 1000,
+    seed: int = 42
+) -> dict:
+    """
+    Write data.json and attachment/*.txt for a synthetic network.
+
+    Args:
+        output_dir: Directory to use as CONTEXT_DIR
+        districts: Number of districts
+        providers: Number of bus providers
+        max_points: Dropping points in the busiest district (others shrink by Zipf rank)
+        min_points: Dropping points in the quietest districts
+        attachment_bytes: Mean size of each provider's attachment
+        seed: Random seed
+
+    Returns:
+        Counts describing the generated network
+    """
+    rng = random.Random(seed)
+    names = district_names(districts)
+    weights = zipf_weights(districts, 0.8)
+
+    district_entries = []
+    for rank, name in enumerate(names):
+        # Distance from Dhaka drives the fare level; Dhaka itself is the cheapest hub
+        distance_km = 0 if rank == 0 else rng.uniform(40, 450)
+        base_fare = 350 + distance_km * 1.6
+        count = max(min_points, round(max_points * weights[rank] * rng.uniform(0.8, 1.2)))
+        district_entries.append({
+            "name": name,
+            "dropping_points": make_dropping_points(rng, name, count, base_fare),
+        })
+
+    provider_entries = []
+    attachment_dir = output_dir / "attachment"
+    attachment_dir.mkdir(parents=True, exist_ok=True)
+    total_attachment_bytes = 0
+    for provider in provider_names(rng, providers):
+        coverage = weighted_sample(rng, names, weights, coverage_size(rng, districts))
+        if len(coverage) >= 25 and names[0] not in coverage:
+            # National carriers always serve the capital
+            coverage[-1] = names[0]
+        provider_entries.append({"name": provider, "coverage_districts": coverage})
+
+        size = int(attachment_bytes * math.exp(rng.gauss(0, 0.3)))
+        text = make_attachment(rng, provider, coverage[0], size)
+        (attachment_dir / f"{provider.lower()}.txt").write_text(text, encoding="utf-8")
+        total_attachment_bytes += len(text.encode("utf-8"))
+
+    data = {"districts": district_entries, "bus_providers": provider_entries}
+    (output_dir / "data.json").write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    with_points = {d["name"] for d in district_entries if d["dropping_points"]}
+    routes = sum(
+        1
+        for p in provider_entries
+        for a in p["coverage_districts"]
+        for b in p["coverage_districts"]
+        if a != b and b in with_points
+    )
+    return {
+        "districts": districts,
+        "providers": providers,
+        "dropping_points": sum(len(d["dropping_points"]) for d in district_entries),
+        "routes": routes,
+        "attachment_bytes": total_attachment_bytes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output-dir", required=True, help="Directory to write data.json and attachment/ into")
+    parser.add_argument("--districts", type=int, default=64)
+    parser.add_argument("--providers", type=int, default=200)
+    parser.add_argument("--max-points", type=int, default=320, help="Dropping points in the busiest district")
+    parser.add_argument("--min-points", type=int, default=2, help="Dropping points in the quietest districts")
+    parser.add_argument("--attachment-bytes", type=int, default=1000, help="Mean attachment size")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    output_dir = Path(args.output_dir)
+    if output_dir.resolve() == (Path(__file__).parent.parent.parent / "context").resolve():
+        print("❌ Refusing to overwrite the real context directory")
+        sys.exit(1)
+
+    print("=" * 50)
+    print("Generate Network Script")
+    print("=" * 50)
+    stats = generate_network(
+        output_dir,
+        districts=args.districts,
+        providers=args.providers,
+        max_points=args.max_points,
+        min_points=args.min_points,
+        attachment_bytes=args.attachment_bytes,
+        seed=args.seed
+    )
+    print(f"✅ Wrote {output_dir / 'data.json'} and {args.providers} attachments")
+    for key, value in stats.items():
+        print(f"   {key}: {value:,}")
+    print(f"Use it with: CONTEXT_DIR={output_dir.resolve()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Script to maintain monthly partitions of the bookings table.
+
+Creates partitions for upcoming months and detaches or drops partitions older
+than the retention window. Safe to run from cron on any number of hosts; runs
+are serialized with a PostgreSQL advisory lock. The API also runs the same
+maintenance in the background once a day.
+
+Usage:
+    python scripts/manage_partitions.py
+    python scripts/manage_partitions.py --months-ahead 6 --retention-months 24 --action drop
+    python scripts/manage_partitions.py --list
+"""
+import argparse
+import sys
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+env_path = Path(__file__).parent.parent / ".env"
+load_dotenv(dotenv_path=env_path)
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.core.database import engine
+from app.services.partition_service import get_partition_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--months-ahead", type=int, default=settings.BOOKING_PARTITION_MONTHS_AHEAD,
+                        help="Future months that must have a partition")
+    parser.add_argument("--retention-months", type=int, default=settings.BOOKING_RETENTION_MONTHS,
+                        help="Past months to keep attached (0 keeps everything)")
+    parser.add_argument("--action", choices=["detach", "drop"], default=settings.BOOKING_RETENTION_ACTION,
+                        help="What to do with expired partitions")
+    parser.add_argument("--list", action="store_true", help="Only list the attached partitions")
+    args = parser.parse_args()
+
+    service = get_partition_service()
+    if not service.is_supported():
+        print("❌ Bookings partitioning requires PostgreSQL.")
+        return
+
+    print("=" * 50)
+    print("Manage Bookings Partitions Script")
+    print("=" * 50)
+
+    if not args.list:
+        created = service.ensure_partitions(args.months_ahead)
+        expired = service.apply_retention(args.retention_months, args.action)
+        print(f"Created:  {', '.join(created) or 'none'}")
+        print(f"{'Dropped' if args.action == 'drop' else 'Detached'}: {', '.join(expired) or 'none'}")
+
+    with engine.connect() as conn:
+        partitions = service.list_partitions(conn)
+    print(f"Attached partitions ({len(partitions)}):")
+    for month, name in sorted(partitions.items()):
+        print(f"  {name}  ({month:%Y-%m})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Script to rebuild the route occupancy aggregates from the bookings table.
+
+The aggregates are maintained incrementally by the booking endpoints; run this
+after bulk data fixes, restores or manual edits to bookings.
+
+Usage:
+    python scripts/rebuild_occupancy.py
+"""
+import sys
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+env_path = Path(__file__).parent.parent / ".env"
+load_dotenv(dotenv_path=env_path)
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.database import SessionLocal
+from app.services.occupancy_service import get_occupancy_service
+from app.core.logging import logger
+
+
+def rebuild_occupancy():
+    """Recompute all route occupancy rows."""
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        written = get_occupancy_service().rebuild(db)
+        elapsed = time.perf_counter() - start
+        logger.info(f"Rebuilt {written} route occupancy rows in {elapsed:.2f}s")
+        print(f"✅ Rebuilt {written} route occupancy rows in {elapsed:.2f}s.")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error rebuilding route occupancy: {str(e)}")
+        print(f"❌ Error: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Rebuild Route Occupancy Script")
+    print("=" * 50)
+    rebuild_occupancy()
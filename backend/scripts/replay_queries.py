@@ -0,0 +1,303 @@
+"""Script to replay recorded chat and search queries and compare builds.
+
+Reads the query log (QUERY_LOG_ENABLED=True writes QUERY_LOG_DIR/queries*.jsonl)
+and sends the same requests again, either to running servers over HTTP or
+straight to the services in this process. Requests can keep their recorded
+spacing (--speed 1), be accelerated (--speed 10 sends ten times faster), or
+be sent as fast as --concurrency allows (--speed 0).
+
+Each run is saved as JSON (status, latency and answer per query). Two runs,
+for example one per build, are compared on latency percentiles per kind and
+on how often they agree: identical provider lists for searches, identical or
+similar answer text for chat (token overlap). Passing two --target URLs
+replays against both and prints the comparison directly.
+
+Usage:
+    python scripts/replay_queries.py --target http://localhost:8000 --speed 0 --label main
+    python scripts/replay_queries.py --target http://old:8000 --target http://new:8000 --speed 5
+    python scripts/replay_queries.py --in-process --kinds search --limit 500 --output new.json
+    python scripts/replay_queries.py --compare replay-main.json replay-feature.json
+"""
+import argparse
+import asyncio
+import glob
+import json
+import math
+import sys
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+env_path = Path(__file__).parent.parent / ".env"
+load_dotenv(dotenv_path=env_path)
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+
+KINDS = ("chat", "search")
+
+
+def load_records(patterns: list, kinds: list, limit: int) -> list:
+    """Read logged queries from every matching file, oldest first."""
+    records = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if record.get("kind") in kinds and record.get("status", 200) < 500:
+                        records.append(record)
+    records.sort(key=lambda r: r["ts"])
+    return records[:limit] if limit else records
+
+
+class HttpTarget:
+    """Send queries to a running server."""
+
+    def __init__(self, base_url: str, timeout: float):
+        """Initialize the client."""
+        import httpx
+
+        self.name = base_url
+        self.client = httpx.AsyncClient(base_url=base_url, timeout=timeout)
+
+    async def send(self, record: dict) -> tuple:
+        """Return (status, answer, degraded) for one logged query."""
+        if record["kind"] == "chat":
+            response = await self.client.post("/api/v1/chat", json={"message": record["query"]})
+            if response.status_code != 200:
+                return response.status_code, None, False
+            body = response.json()
+            return 200, body["response"], body.get("degraded", False)
+
+        params = {k: v for k, v in record["params"].items() if v is not None}
+        response = await self.client.get("/api/v1/buses/search", params=params)
+        if response.status_code != 200:
+            return response.status_code, None, False
+        return 200, sorted(route["provider"] for route in response.json()["routes"]), False
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class InProcessTarget:
+    """Call the RAG and bus services directly, without HTTP or a server."""
+
+    def __init__(self):
+        """Load the services configured by .env."""
+        from app.services.bus_service import get_bus_service
+        from app.services.rag_service import get_rag_service
+
+        self.name = "in-process"
+        self.bus_service = get_bus_service()
+        self.rag_service = get_rag_service()
+
+    async def send(self, record: dict) -> tuple:
+        """Return (status, answer, degraded) for one logged query."""
+        if record["kind"] == "chat":
+            result = await self.rag_service.get_answer(record["query"])
+            return 200, result["answer"], result.get("degraded", False)
+        try:
+            routes = await self.bus_service.search_buses(**record["params"])
+        except ValueError:
+            return 400, None, False
+        return 200, sorted(route.provider for route in routes), False
+
+    async def close(self):
+        pass
+
+
+async def replay(records: list, target, speed: float, concurrency: int) -> list:
+    """Send every record, spaced by its recorded arrival time divided by speed (0 = no spacing)."""
+    semaphore = asyncio.Semaphore(concurrency)
+    results = [None] * len(records)
+    t0 = records[0]["ts"] if records else 0.0
+    start = time.perf_counter()
+
+    async def run(index: int, record: dict):
+        scheduled = (record["ts"] - t0) / speed if speed > 0 else 0.0
+        delay = scheduled - (time.perf_counter() - start)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        async with semaphore:
+            # How far behind schedule the request left; large values mean the replay could not keep up
+            lag = max(time.perf_counter() - start - scheduled, 0.0) if speed > 0 else 0.0
+            sent = time.perf_counter()
+            try:
+                status, answer, degraded = await target.send(record)
+            except Exception as e:
+                status, answer, degraded = 0, f"{type(e).__name__}: {e}", False
+            results[index] = {
+                "index": index,
+                "kind": record["kind"],
+                "request": record.get("query") or record.get("params"),
+                "status": status,
+                "latency_ms": round((time.perf_counter() - sent) * 1000, 2),
+                "lag_ms": round(lag * 1000, 2),
+                "answer": answer,
+                "degraded": degraded,
+            }
+
+    await asyncio.gather(*(run(i, r) for i, r in enumerate(records)))
+    return results
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(results: list) -> dict:
+    """Latency percentiles and outcome counts per kind."""
+    summary = {}
+    for kind in KINDS:
+        rows = [r for r in results if r["kind"] == kind]
+        if not rows:
+            continue
+        latencies = sorted(r["latency_ms"] for r in rows)
+        summary[kind] = {
+            "queries": len(rows),
+            "ok": sum(r["status"] == 200 for r in rows),
+            "errors": sum(r["status"] == 0 or r["status"] >= 500 for r in rows),
+            "degraded": sum(bool(r["degraded"]) for r in rows),
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "max_lag_ms": max(r["lag_ms"] for r in rows),
+        }
+    return summary
+
+
+def similarity(a, b) -> float:
+    """1.0 for identical answers; token (or provider) Jaccard overlap otherwise."""
+    if a == b:
+        return 1.0
+    if a is None or b is None:
+        return 0.0
+    tokens_a = set(a) if isinstance(a, list) else set(a.lower().split())
+    tokens_b = set(b) if isinstance(b, list) else set(b.lower().split())
+    union = tokens_a | tokens_b
+    return len(tokens_a & tokens_b) / len(union) if union else 1.0
+
+
+def compare(base: dict, new: dict, show: int):
+    """Print latency deltas and answer agreement between two replay runs."""
+    print("=" * 50)
+    print(f"Replay Comparison: {base['label']} -> {new['label']}")
+    print("=" * 50)
+    base_summary, new_summary = summarize(base["results"]), summarize(new["results"])
+    for kind in KINDS:
+        if kind not in base_summary or kind not in new_summary:
+            continue
+        old, cur = base_summary[kind], new_summary[kind]
+        print(f"{kind} ({cur['queries']} queries)")
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            delta = (cur[key] - old[key]) / old[key] if old[key] else 0.0
+            print(f"   {key:<8} {old[key]:>10.1f} -> {cur[key]:>10.1f}  ({delta:+.1%})")
+        print(f"   errors   {old['errors']:>10} -> {cur['errors']:>10}")
+        print(f"   degraded {old['degraded']:>10} -> {cur['degraded']:>10}")
+
+    pairs = [
+        (b, n, similarity(b["answer"], n["answer"]))
+        for b, n in zip(base["results"], new["results"])
+        if b["index"] == n["index"]
+    ]
+    for kind in KINDS:
+        scored = [p for p in pairs if p[0]["kind"] == kind]
+        if not scored:
+            continue
+        identical = sum(score == 1.0 for _, _, score in scored)
+        mean = sum(score for _, _, score in scored) / len(scored)
+        print(f"{kind} answers: {identical / len(scored):.1%} identical, mean similarity {mean:.3f}")
+
+    divergent = sorted((p for p in pairs if p[2] < 1.0), key=lambda p: p[2])[:show]
+    if divergent:
+        print(f"Most divergent answers (up to {show}):")
+        for b, n, score in divergent:
+            print(f"   [{b['kind']}] {score:.2f} {json.dumps(b['request'], ensure_ascii=False)[:100]}")
+            print(f"      {base['label']}: {str(b['answer'])[:160]!r}")
+            print(f"      {new['label']}: {str(n['answer'])[:160]!r}")
+
+
+async def run_targets(records: list, targets: list, args) -> list:
+    """Replay the same records against each target in turn."""
+    runs = []
+    for target in targets:
+        try:
+            start = time.perf_counter()
+            results = await replay(records, target, args.speed, args.concurrency)
+            elapsed = time.perf_counter() - start
+        finally:
+            await target.close()
+        runs.append({"label": target.label, "target": target.name, "speed": args.speed,
+                     "elapsed_s": round(elapsed, 2), "results": results})
+    return runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--log", nargs="+", default=[str(Path(settings.QUERY_LOG_DIR) / "queries*.jsonl*")],
+                        help="Query log files or glob patterns")
+    parser.add_argument("--target", action="append", help="Server base URL (give twice to compare two builds)")
+    parser.add_argument("--in-process", action="store_true", help="Call the services directly instead of HTTP")
+    parser.add_argument("--label", action="append", help="Name for each run (default: target URL)")
+    parser.add_argument("--speed", type=float, default=1.0, help="1 = recorded pace, 10 = ten times faster, 0 = no spacing")
+    parser.add_argument("--concurrency", type=int, default=32, help="Maximum requests in flight")
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    parser.add_argument("--limit", type=int, default=0, help="Replay only the first N queries")
+    parser.add_argument("--timeout", type=float, default=120.0, help="HTTP timeout per request")
+    parser.add_argument("--output", help="Result file for a single run (default: replay-<label>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="Compare two saved runs and exit")
+    parser.add_argument("--show", type=int, default=5, help="Divergent answers to print when comparing")
+    args = parser.parse_args()
+
+    if args.compare:
+        base, new = (json.loads(Path(p).read_text(encoding="utf-8")) for p in args.compare)
+        compare(base, new, args.show)
+        return
+
+    if bool(args.target) == args.in_process:
+        parser.error("give --target URL (once or twice) or --in-process")
+
+    print("=" * 50)
+    print("Replay Queries Script")
+    print("=" * 50)
+    records = load_records(args.log, args.kinds, args.limit)
+    if not records:
+        print(f"❌ No queries found in {', '.join(args.log)}")
+        sys.exit(1)
+    span_s = records[-1]["ts"] - records[0]["ts"]
+    print(f"Loaded {len(records)} queries spanning {span_s:.0f}s")
+
+    targets = [InProcessTarget()] if args.in_process else [HttpTarget(url, args.timeout) for url in args.target]
+    labels = args.label or []
+    for i, target in enumerate(targets):
+        target.label = labels[i] if i < len(labels) else target.name.replace("http://", "").replace("https://", "")
+
+    runs = asyncio.run(run_targets(records, targets, args))
+
+    for run in runs:
+        output = Path(args.output) if args.output and len(runs) == 1 else Path(
+            f"replay-{''.join(c if c.isalnum() or c in '-_.' else '_' for c in run['label'])}.json"
+        )
+        output.write_text(json.dumps(run, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"✅ {run['label']}: {len(run['results'])} queries in {run['elapsed_s']}s, saved to {output}")
+        for kind, stats in summarize(run["results"]).items():
+            print(f"   {kind:<7} ok {stats['ok']}/{stats['queries']}  p50 {stats['p50_ms']:.1f}ms  "
+                  f"p95 {stats['p95_ms']:.1f}ms  p99 {stats['p99_ms']:.1f}ms  max lag {stats['max_lag_ms']:.0f}ms")
+
+    if len(runs) == 2:
+        compare(runs[0], runs[1], args.show)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Pre-fork multi-process launcher for the API.
+
+The master process imports the application and loads the embedding model and
+pricing index once, freezes the garbage collector, and then forks the workers.
+The workers share those pages copy-on-write, so each extra worker costs far
+less memory than another independent uvicorn process. All workers accept
+connections from one listening socket opened by the master. Workers that exit
+unexpectedly are restarted; SIGTERM/SIGINT shut every worker down gracefully.
+
+Chroma clients and the Gemini client are not fork-safe, so each worker opens
+its own during its background warmup (reusing the shared embedding model).
+
+With more than one worker the booking cache must be shared
+(BOOKING_CACHE_BACKEND=redis) or disabled; a per-process memory cache is
+only invalidated in the worker that handled the write, so startup is refused.
+
+Linux/macOS only (requires os.fork).
+
+Usage:
+    python scripts/serve.py --workers 4 --port 8000
+    SERVICE_ROLE=bookings python scripts/serve.py --workers 8
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+env_path = Path(__file__).parent.parent / ".env"
+load_dotenv(dotenv_path=env_path)
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# HF tokenizers disable themselves noisily if they were used before a fork
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+import uvicorn
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.roles import role_needs_rag
+
+# Workers that die within this many seconds of starting are not restarted in a loop
+MIN_WORKER_UPTIME = 5.0
+
+
+def preload(preload_models: bool):
+    """Import the app and load shared read-only state before forking."""
+    start = time.perf_counter()
+    from app.main import app
+    from app.services.pricing_service import get_pricing_service
+
+    get_pricing_service()
+    if preload_models and role_needs_rag(settings.SERVICE_ROLE):
+        from app.services.embeddings import get_embeddings
+        # Load only: running inference here would start torch thread pools that do not survive fork
+        get_embeddings()
+
+    # Move everything allocated so far out of the GC's reach; otherwise each
+    # worker's first collection writes to (and so copies) every shared page
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Master preloaded application in {time.perf_counter() - start:.1f}s")
+    return app
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    """Open the listening socket shared by all workers."""
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app, sock: socket.socket, args, worker_id: int):
+    """Body of a forked worker process; never returns."""
+    # The master's signal handlers must not run in the worker; uvicorn installs its own
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    from app.core.worker import init_worker
+    init_worker(worker_id)
+
+    config = uvicorn.Config(
+        app,
+        log_config=None,  # Keep the application's queue-based logging
+        timeout_keep_alive=args.keep_alive,
+        access_log=not args.no_access_log,
+    )
+    server = uvicorn.Server(config)
+    try:
+        server.run(sockets=[sock])
+    finally:
+        os._exit(0)
+
+
+class Master:
+    """Fork, supervise and stop worker processes."""
+
+    def __init__(self, app, sock: socket.socket, args):
+        """Initialize the supervisor."""
+        self.app = app
+        self.sock = sock
+        self.args = args
+        self.workers = {}  # pid -> (worker slot, start time)
+        self.stopping = False
+
+    def spawn(self, worker_id: int):
+        """Fork the worker for one slot."""
+        pid = os.fork()
+        if pid == 0:
+            run_worker(self.app, self.sock, self.args, worker_id)
+        self.workers[pid] = (worker_id, time.monotonic())
+        logger.info(f"Started worker {worker_id} (pid {pid})")
+
+    def stop(self, signum, frame):
+        """Ask every worker to shut down gracefully."""
+        self.stopping = True
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self):
+        """Start the workers and restart any that exit until told to stop."""
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        for worker_id in range(self.args.workers):
+            self.spawn(worker_id)
+
+        while self.workers:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            worker = self.workers.pop(pid, None)
+            if worker is None or self.stopping:
+                continue
+            worker_id, started = worker
+            code = os.waitstatus_to_exitcode(status)
+            logger.warning(f"Worker {worker_id} (pid {pid}) exited with status {code}")
+            if time.monotonic() - started < MIN_WORKER_UPTIME:
+                logger.error("Worker crashed during startup; not restarting")
+                self.stop(None, None)
+                continue
+            self.spawn(worker_id)
+        logger.info("All workers stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0", help="Bind address")
+    parser.add_argument("--port", type=int, default=8000, help="Bind port")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes")
+    parser.add_argument("--backlog", type=int, default=2048, help="Listen backlog")
+    parser.add_argument("--keep-alive", type=int, default=5, help="HTTP keep-alive timeout in seconds")
+    parser.add_argument("--no-preload", action="store_true", help="Let each worker load its own models")
+    parser.add_argument("--no-access-log", action="store_true", help="Disable uvicorn access logs")
+    args = parser.parse_args()
+
+    if not hasattr(os, "fork"):
+        print("❌ Pre-fork serving requires os.fork; use 'uvicorn app.main:app --workers N' instead.")
+        sys.exit(1)
+
+    if args.workers > 1 and settings.BOOKING_CACHE_BACKEND == "memory":
+        # Each worker would keep its own booking cache and only the worker handling a
+        # write would invalidate it, so the others serve stale bookings until the TTL
+        print("❌ BOOKING_CACHE_BACKEND=memory is per process and goes stale with several workers.")
+        print("   Set BOOKING_CACHE_BACKEND=redis (shared) or none, or run with --workers 1.")
+        sys.exit(1)
+
+    print("=" * 50)
+    print(f"Pre-fork server: {args.workers} workers, role '{settings.SERVICE_ROLE}', {args.host}:{args.port}")
+    print("=" * 50)
+
+    sock = bind_socket(args.host, args.port, args.backlog)
+    app = preload(not args.no_preload)
+    Master(app, sock, args).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Script to summarize locally recorded traces.
+
+Reads TRACE_DIR/traces*.jsonl (per-worker files and rotated backups), lists the slowest
+traces with their critical path, and aggregates which span names account for
+the most critical-path time across them. A single trace can be printed as a
+span tree with --trace, e.g. using the X-Trace-Id header of a slow response.
+
+Usage:
+    python scripts/trace_report.py
+    python scripts/trace_report.py --top 20 --name /api/v1/chat --since 60
+    python scripts/trace_report.py --trace 3f2a9c...
+"""
+import argparse
+import json
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+env_path = Path(__file__).parent.parent / ".env"
+load_dotenv(dotenv_path=env_path)
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+
+
+def load_traces(trace_dir: Path, name: str = None, since_minutes: float = None, errors_only: bool = False) -> list:
+    """Read every trace file, oldest backup first, applying filters."""
+    files = sorted(
+        trace_dir.glob("traces*.jsonl*"),
+        key=lambda path: -int(path.suffix[1:]) if path.suffix[1:].isdigit() else 0
+    )
+    cutoff = time.time() - since_minutes * 60 if since_minutes else None
+    traces = []
+    for path in files:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    trace = json.loads(line)
+                except ValueError:
+                    continue  # Partially written last line
+                if name and name not in trace["name"]:
+                    continue
+                if cutoff and trace["timestamp"] < cutoff:
+                    continue
+                if errors_only and not (trace.get("error") or any(s.get("error") for s in trace["spans"])):
+                    continue
+                traces.append(trace)
+    return traces
+
+
+def critical_path(trace: dict) -> list:
+    """
+    Compute the critical path of a trace.
+
+    Walking backwards from the end of each span, the child that finished last
+    is the one the parent was waiting on; time not covered by any such child
+    is the span's own. Returns [(span name, critical ms)] in path order.
+    """
+    spans = {s["span_id"]: s for s in trace["spans"]}
+    children = defaultdict(list)
+    root = None
+    for span in trace["spans"]:
+        if span["parent_id"] in spans:
+            children[span["parent_id"]].append(span)
+        elif root is None or span["parent_id"] is None:
+            root = span
+    if root is None:
+        return []
+
+    path = []
+
+    def walk(span: dict, end: float):
+        start = span["start_ms"]
+        cursor = min(span["start_ms"] + span["duration_ms"], end)
+        own = 0.0
+        segments = []
+        for child in sorted(children[span["span_id"]], key=lambda c: c["start_ms"] + c["duration_ms"], reverse=True):
+            child_end = child["start_ms"] + child["duration_ms"]
+            if child["start_ms"] >= cursor:
+                continue
+            child_end = min(child_end, cursor)
+            own += cursor - child_end
+            segments.append((child, child_end))
+            cursor = max(child["start_ms"], start)
+        own += max(cursor - start, 0.0)
+        path.append((span["name"], own))
+        # Children are visited in time order so the printed path reads forwards
+        for child, child_end in reversed(segments):
+            walk(child, child_end)
+
+    walk(root, float("inf"))
+    return path
+
+
+def print_tree(trace: dict):
+    """Print every span of one trace as an indented tree."""
+    children = defaultdict(list)
+    ids = {s["span_id"] for s in trace["spans"]}
+    roots = []
+    for span in trace["spans"]:
+        if span["parent_id"] in ids:
+            children[span["parent_id"]].append(span)
+        else:
+            roots.append(span)
+
+    def show(span: dict, depth: int):
+        error = f"  !! {span['error']}" if span.get("error") else ""
+        attributes = f"  {span['attributes']}" if span.get("attributes") else ""
+        print(f"{span['start_ms']:>10.1f} {span['duration_ms']:>10.1f}  {'  ' * depth}{span['name']}{attributes}{error}")
+        for child in sorted(children[span["span_id"]], key=lambda c: c["start_ms"]):
+            show(child, depth + 1)
+
+    print(f"Trace {trace['trace_id']}: {trace['name']} ({trace['duration_ms']:.1f} ms)")
+    print(f"{'start ms':>10} {'dur ms':>10}  span")
+    for root in roots:
+        show(root, 0)
+
+
+def report(traces: list, top: int):
+    """Print the slowest traces and aggregate critical-path time by span name."""
+    slowest = sorted(traces, key=lambda t: t["duration_ms"], reverse=True)[:top]
+    durations = sorted(t["duration_ms"] for t in traces)
+    p50 = durations[len(durations) // 2]
+    p95 = durations[min(int(len(durations) * 0.95), len(durations) - 1)]
+    print(f"Traces: {len(traces)}  p50: {p50:.1f} ms  p95: {p95:.1f} ms  max: {durations[-1]:.1f} ms")
+
+    print(f"\nSlowest {len(slowest)} traces:")
+    by_name = defaultdict(float)
+    in_traces = defaultdict(int)
+    for trace in slowest:
+        path = critical_path(trace)
+        error = "  [error]" if trace.get("error") else ""
+        print(f"\n{trace['duration_ms']:>10.1f} ms  {trace['name']}  {trace['trace_id']}{error}")
+        steps = [(name, ms) for name, ms in path if ms >= 0.05 * trace["duration_ms"]]
+        print("    critical path: " + " > ".join(f"{name} ({ms:.0f} ms)" for name, ms in steps))
+        seen = set()
+        for name, ms in path:
+            by_name[name] += ms
+            if name not in seen:
+                in_traces[name] += 1
+                seen.add(name)
+
+    total = sum(by_name.values()) or 1.0
+    print("\nCritical-path time by span across the slowest traces:")
+    print(f"{'span':<40} {'traces':>7} {'total ms':>12} {'share':>7}")
+    for name, ms in sorted(by_name.items(), key=lambda item: item[1], reverse=True)[:15]:
+        print(f"{name[:40]:<40} {in_traces[name]:>7} {ms:>12.1f} {ms / total:>7.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", default=settings.TRACE_DIR, help="Trace directory (default: TRACE_DIR)")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest traces to show")
+    parser.add_argument("--name", help="Only traces whose root name contains this text")
+    parser.add_argument("--since", type=float, help="Only traces from the last N minutes")
+    parser.add_argument("--errors", action="store_true", help="Only traces containing an error")
+    parser.add_argument("--trace", help="Print the full span tree of one trace id")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("Trace Report")
+    print("=" * 50)
+
+    traces = load_traces(Path(args.dir), args.name, args.since, args.errors)
+    if args.trace:
+        matches = [t for t in traces if t["trace_id"].startswith(args.trace)]
+        if not matches:
+            print(f"❌ Trace {args.trace} not found in {args.dir}")
+            sys.exit(1)
+        print_tree(matches[0])
+        return
+    if not traces:
+        print(f"No traces found in {args.dir}")
+        return
+    report(traces, args.top)
+
+
+if __name__ == "__main__":
+    main()
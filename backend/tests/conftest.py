@@ -0,0 +1,76 @@
+"""Shared fixtures: settings for an isolated SQLite database and no external services."""
+import json
+import os
+import tempfile
+
+# Settings are read when app modules are first imported, so configure them before any test imports
+_tmp = tempfile.mkdtemp(prefix="tba-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/test.db"
+os.environ["GOOGLE_API_KEY"] = "unused-in-tests"
+os.environ["LLM_PROVIDER"] = "fake"
+os.environ["BOOKING_CACHE_BACKEND"] = "memory"
+os.environ["TRACE_DIR"] = os.path.join(_tmp, "traces")
+os.environ["QUERY_LOG_DIR"] = os.path.join(_tmp, "query_logs")
+os.environ["LOG_LEVEL"] = "WARNING"
+os.environ["LANGSMITH_TRACING"] = "false"
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.endpoints import bookings
+from app.core.config import settings
+from app.core.database import Base, SessionLocal, engine
+from app.services.cache import BookingCache, LRUCacheBackend, get_booking_cache
+from app.services.pricing_service import PricingService, get_pricing_service
+import app.models  # noqa: F401  (registers every table on Base)
+
+# A small network: Green Line serves Dhaka and Sylhet, Hanif serves Dhaka and Bogura
+NETWORK = {
+    "districts": [
+        {"name": "Dhaka", "dropping_points": [{"name": "Gabtoli", "price": 500}]},
+        {"name": "Sylhet", "dropping_points": [{"name": "Kadamtali", "price": 750}, {"name": "Subhanighat", "price": 700}]},
+        {"name": "Bogura", "dropping_points": [{"name": "Satmatha", "price": 600}]},
+    ],
+    "bus_providers": [
+        {"name": "Green Line", "coverage_districts": ["Dhaka", "Sylhet"]},
+        {"name": "Hanif", "coverage_districts": ["Dhaka", "Bogura"]},
+    ],
+}
+
+
+@pytest.fixture
+def db():
+    """A session on freshly created tables, dropped after the test."""
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def pricing(tmp_path, monkeypatch):
+    """A pricing service over NETWORK."""
+    (tmp_path / "data.json").write_text(json.dumps(NETWORK), encoding="utf-8")
+    monkeypatch.setattr(settings, "CONTEXT_DIR", str(tmp_path))
+    return PricingService()
+
+
+@pytest.fixture
+def booking_cache():
+    """An empty in-process booking cache."""
+    return BookingCache(LRUCacheBackend(max_entries=1000))
+
+
+@pytest.fixture
+def client(db, pricing, booking_cache):
+    """A client for the booking API on fresh tables, with its own pricing index and cache."""
+    app = FastAPI()
+    app.include_router(bookings.router, prefix="/api/v1")
+    app.dependency_overrides[get_pricing_service] = lambda: pricing
+    app.dependency_overrides[get_booking_cache] = lambda: booking_cache
+    with TestClient(app) as test_client:
+        yield test_client
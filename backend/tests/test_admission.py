@@ -0,0 +1,99 @@
+"""Admission controller limits, priority dispatch and shedding."""
+import asyncio
+
+import pytest
+
+from app.core.admission import AdmissionController, AdmissionGroup, AdmissionRejected, GROUP_PRIORITIES
+
+
+def make_controller(global_limit=1, group_limit=4, max_wait=1.0, max_queue=10):
+    groups = {
+        name: AdmissionGroup(name, group_limit, priority, max_wait, max_queue)
+        for name, priority in GROUP_PRIORITIES.items()
+    }
+    return AdmissionController(global_limit, groups)
+
+
+def test_group_for_path():
+    controller = make_controller()
+    assert controller.group_for_path("/api/v1/bookings/12") == "bookings"
+    assert controller.group_for_path("/api/v1/buses/search") == "search"
+    assert controller.group_for_path("/api/v1/chat") == "chat"
+    assert controller.group_for_path("/api/v1/analytics/revenue") == "default"
+    assert controller.group_for_path("/health/db") is None
+    assert controller.group_for_path("/metrics") is None
+
+
+def test_queued_requests_are_admitted_in_priority_order():
+    async def scenario():
+        controller = make_controller(global_limit=1)
+        await controller.acquire("chat")
+        order = []
+
+        async def request(group):
+            await controller.acquire(group)
+            order.append(group)
+            controller.release(group, 0.0)
+
+        # Queued lowest priority first; bookings must still run first once the slot frees up
+        tasks = []
+        for group in ("chat", "default", "search", "bookings"):
+            tasks.append(asyncio.create_task(request(group)))
+            await asyncio.sleep(0)
+        assert controller.active == 1
+
+        controller.release("chat", 0.0)
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(scenario()) == ["bookings", "search", "default", "chat"]
+
+
+def test_group_limit_holds_while_global_capacity_is_free():
+    async def scenario():
+        controller = make_controller(global_limit=10, group_limit=1, max_wait=0.05)
+        await controller.acquire("chat")
+        # Another group still gets a slot immediately
+        await asyncio.wait_for(controller.acquire("bookings"), 0.1)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("chat")
+        assert rejected.value.reason == "timeout"
+        assert rejected.value.retry_after >= 1
+        assert not controller.groups["chat"].waiters
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_sheds_immediately():
+    async def scenario():
+        controller = make_controller(global_limit=1, max_queue=1)
+        await controller.acquire("search")
+        queued = asyncio.create_task(controller.acquire("search"))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("search")
+        assert rejected.value.reason == "queue_full"
+
+        controller.release("search", 0.0)
+        await queued
+        controller.release("search", 0.0)
+        assert controller.active == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    async def scenario():
+        controller = make_controller(global_limit=1)
+        await controller.acquire("bookings")
+        queued = asyncio.create_task(controller.acquire("bookings"))
+        await asyncio.sleep(0)
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+        controller.release("bookings", 0.0)
+        assert controller.active == 0
+        assert not controller.groups["bookings"].waiters
+
+    asyncio.run(scenario())
@@ -0,0 +1,54 @@
+"""Archiving bookings: export to a file and delete exactly what was exported."""
+import importlib.util
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+
+from app.models.booking import Booking, BookingStatus
+
+SCRIPT = Path(__file__).parent.parent / "scripts" / "archive_bookings.py"
+spec = importlib.util.spec_from_file_location("archive_bookings", SCRIPT)
+archive_bookings = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(archive_bookings)
+
+
+def add_booking(db, travel_date, name="Rahim Uddin"):
+    booking = Booking(
+        customer_name=name,
+        customer_email="rahim@example.com",
+        customer_phone="+8801712345678",
+        provider="Green Line",
+        from_district="Dhaka",
+        to_district="Sylhet",
+        travel_date=travel_date,
+        num_seats=1,
+        total_fare=750,
+        status=BookingStatus.CONFIRMED,
+        updated_at=datetime(2025, 1, 1, 12, 0)
+    )
+    db.add(booking)
+    return booking
+
+
+def test_delete_keeps_rows_changed_after_export(db, tmp_path):
+    start, end = date(2025, 1, 1), date(2025, 1, 31)
+    archived = add_booking(db, date(2025, 1, 10))
+    changed = add_booking(db, date(2025, 1, 20))
+    outside = add_booking(db, date(2025, 2, 1))
+    db.commit()
+    archived_id, changed_id, outside_id = archived.id, changed.id, outside.id
+
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as spool:
+        output = tmp_path / "bookings.jsonl.gz"
+        assert archive_bookings.export_bookings(start, end, "jsonl", output, 10, spool) == 2
+        assert output.stat().st_size > 0
+
+        changed.customer_name = "Karim Uddin"
+        changed.updated_at = datetime(2025, 1, 2, 8, 0)
+        db.commit()
+        assert archive_bookings.delete_archived(start, end, spool, chunk_size=1) == 1
+
+    db.expire_all()
+    remaining = {booking.id for booking in db.query(Booking)}
+    assert remaining == {changed_id, outside_id}
+    assert archived_id not in remaining
@@ -0,0 +1,62 @@
+"""API benchmark reporting: percentiles, per-operation summaries and regression checks."""
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).parent.parent / "benchmarks" / "bench_api.py"
+spec = importlib.util.spec_from_file_location("bench_api", SCRIPT)
+bench_api = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(bench_api)
+
+
+def test_percentile_is_nearest_rank():
+    values = [i / 1000 for i in range(1, 101)]
+    assert bench_api.percentile(values, 50) == 0.05
+    assert bench_api.percentile(values, 99) == 0.099
+    assert bench_api.percentile([0.2], 95) == 0.2
+    assert bench_api.percentile([], 50) == 0.0
+
+
+def test_summary_counts_rejections_and_errors():
+    recorder = bench_api.Recorder()
+    for seconds, status in ((0.03, 200), (0.01, 200), (0.02, 429), (0.05, 503), (0.04, 0)):
+        recorder.record("search", seconds, status)
+
+    summary = recorder.summary(elapsed=2.0)["search"]
+    assert summary["requests"] == 5
+    assert summary["throughput_rps"] == 2.5
+    assert summary["p50_ms"] == 30.0
+    assert summary["max_ms"] == 50.0
+    assert summary["rejected_429"] == 1
+    assert summary["errors"] == 2
+    assert summary["statuses"] == {"0": 1, "200": 2, "429": 1, "503": 1}
+
+
+def test_route_triples_skip_destinations_without_dropping_points():
+    data = {
+        "districts": [{"name": "Dhaka", "dropping_points": [{"name": "Gabtoli", "price": 500}]},
+                      {"name": "Sylhet", "dropping_points": []}],
+        "bus_providers": [{"name": "Green Line", "coverage_districts": ["Dhaka", "Sylhet"]}],
+    }
+    assert bench_api.route_triples(data) == [("Green Line", "Sylhet", "Dhaka")]
+
+
+def write_results(path, revision, p50_ms, throughput_rps):
+    stats = {"p50_ms": p50_ms, "p95_ms": p50_ms * 2, "p99_ms": p50_ms * 3, "throughput_rps": throughput_rps}
+    path.write_text(json.dumps({"revision": revision, "results": {"search": {"4": {"search": stats}}}}))
+    return str(path)
+
+
+@pytest.mark.parametrize("p50_ms, throughput_rps, regressed", [
+    (10.5, 390, 0),
+    (13.0, 400, 1),
+    (10.0, 300, 1),
+])
+def test_compare_flags_regressions_beyond_the_threshold(tmp_path, capsys, p50_ms, throughput_rps, regressed):
+    base = write_results(tmp_path / "base.json", "abc1234", 10.0, 400)
+    new = write_results(tmp_path / "new.json", "def5678", p50_ms, throughput_rps)
+
+    assert bench_api.compare(base, new, threshold=0.1) == regressed
+    assert "abc1234 -> def5678" in capsys.readouterr().out
@@ -0,0 +1,72 @@
+"""Read-through booking cache: hits, invalidation and off-loop calls."""
+import asyncio
+import threading
+
+from app.services.cache import BookingCache, LRUCacheBackend
+
+
+def make_cache():
+    return BookingCache(LRUCacheBackend(max_entries=100))
+
+
+def test_booking_is_loaded_once_until_invalidated():
+    cache = make_cache()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return {"id": 7, "status": "confirmed"}
+
+    assert cache.get_booking(7, loader) == {"id": 7, "status": "confirmed"}
+    assert cache.get_booking(7, loader) == {"id": 7, "status": "confirmed"}
+    assert len(loads) == 1
+
+    cache.invalidate(booking_id=7)
+    cache.get_booking(7, loader)
+    assert len(loads) == 2
+    assert cache.stats.snapshot()["booking"] == {"hits": 1, "misses": 2, "hit_ratio": 0.3333}
+
+
+def test_write_during_a_miss_does_not_leave_a_stale_entry():
+    cache = make_cache()
+
+    def stale_loader():
+        # A booking write commits and invalidates while this miss is still loading
+        cache.invalidate(email="rahim@example.com")
+        return {"bookings": [], "total_bookings": 0}
+
+    cache.get_page("email", "rahim@example.com", 20, None, stale_loader)
+    fresh = cache.get_page("email", "rahim@example.com", 20, None, lambda: {"bookings": [{"id": 1}], "total_bookings": 1})
+    assert fresh["total_bookings"] == 1
+
+
+def test_invalidate_all_drops_every_entry():
+    cache = make_cache()
+    cache.get_booking(1, lambda: {"id": 1})
+    cache.get_page("phone", "+8801712345678", 20, None, lambda: {"total_bookings": 1})
+
+    cache.invalidate_all()
+    assert cache.get_booking(1, lambda: {"id": 1, "reloaded": True})["reloaded"]
+    assert cache.get_page("phone", "+8801712345678", 20, None, lambda: {"total_bookings": 0})["total_bookings"] == 0
+
+
+def test_blocking_backend_calls_run_off_the_event_loop():
+    cache = make_cache()
+    cache.backend.blocking = True
+
+    def loader():
+        return {"thread": threading.get_ident()}
+
+    async def scenario():
+        return threading.get_ident(), await cache.run(cache.get_booking, 3, loader)
+
+    loop_thread, booking = asyncio.run(scenario())
+    assert booking["thread"] != loop_thread
+
+    cache.backend.blocking = False
+    loop_thread, booking = asyncio.run(scenario())
+    # Served from the cache entry stored by the first call
+    assert booking["thread"] != loop_thread
+    asyncio.run(cache.run(cache.invalidate, booking_id=3))
+    loop_thread, booking = asyncio.run(scenario())
+    assert booking["thread"] == loop_thread
@@ -0,0 +1,78 @@
+"""Keyset pagination of a customer's bookings."""
+from datetime import datetime
+
+from app.models.booking import Booking, BookingStatus
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def add_bookings(db, count, email="rahim@example.com", created_at=datetime(2025, 1, 15, 9, 30)):
+    for _ in range(count):
+        db.add(Booking(
+            customer_name="Rahim Uddin",
+            customer_email=email,
+            customer_phone="+8801712345678",
+            provider="Green Line",
+            from_district="Dhaka",
+            to_district="Sylhet",
+            travel_date=datetime(2025, 2, 1).date(),
+            num_seats=1,
+            total_fare=750,
+            status=BookingStatus.CONFIRMED,
+            # Identical timestamps, so the id tie-breaker decides the order
+            created_at=created_at
+        ))
+    db.commit()
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 1, 15, 9, 30, 0, 123456)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+def test_pages_cover_every_booking_once_newest_first(client, db):
+    add_bookings(db, 5)
+    add_bookings(db, 2, created_at=datetime(2025, 1, 16, 8, 0))
+    add_bookings(db, 3, email="karim@example.com")
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"customer_email": "rahim@example.com", "limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/api/v1/bookings", params=params).json()
+        seen += [(b["created_at"], b["id"]) for b in page["bookings"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 7
+    assert seen == sorted(seen, reverse=True)
+    assert len(set(seen)) == 7
+
+
+def test_new_booking_shows_up_on_the_cached_first_page(client, db):
+    add_bookings(db, 1)
+    first = client.get("/api/v1/bookings", params={"customer_email": "rahim@example.com"}).json()
+    assert first["total_bookings"] == 1
+
+    created = client.post("/api/v1/bookings", json={
+        "customer_name": "Rahim Uddin",
+        "customer_email": "rahim@example.com",
+        "customer_phone": "+8801712345678",
+        "from_district": "Dhaka",
+        "to_district": "Sylhet",
+        "provider": "Green Line",
+        "travel_date": "2025-02-01",
+        "num_seats": 1,
+    })
+    assert created.status_code == 201
+    page = client.get("/api/v1/bookings", params={"customer_email": "rahim@example.com"}).json()
+    assert page["total_bookings"] == 2
+    assert page["bookings"][0]["id"] == created.json()["id"]
+
+
+def test_invalid_cursor_is_rejected(client):
+    response = client.get("/api/v1/bookings", params={"customer_email": "rahim@example.com", "cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    assert client.get("/api/v1/bookings").status_code == 400
@@ -0,0 +1,51 @@
+"""All-or-nothing group bookings."""
+from datetime import date
+
+from app.core.config import settings
+from app.models.booking import Booking
+from app.services.inventory_service import InventoryService
+
+PASSENGER = {
+    "customer_name": "Rahim Uddin",
+    "customer_email": "rahim@example.com",
+    "customer_phone": "+8801712345678",
+    "from_district": "Dhaka",
+    "to_district": "Sylhet",
+    "provider": "Green Line",
+    "travel_date": "2025-02-01",
+    "num_seats": 1,
+    "dropping_point": "Kadamtali",
+}
+TRIP = ("Green Line", "Dhaka", "Sylhet", date(2025, 2, 1))
+
+
+def test_group_is_booked_in_request_order(client, db):
+    passengers = [{**PASSENGER, "customer_name": f"Passenger {i}", "num_seats": 1 + i % 2} for i in range(5)]
+    response = client.post("/api/v1/bookings/bulk", json={"bookings": passengers})
+
+    assert response.status_code == 201
+    body = response.json()
+    assert [b["customer_name"] for b in body["bookings"]] == [p["customer_name"] for p in passengers]
+    assert body["total_bookings"] == 5
+    assert body["total_fare"] == 750 * 7
+    assert InventoryService().get_availability(db, *TRIP)["seats_available"] == settings.DEFAULT_TRIP_CAPACITY - 7
+
+
+def test_one_invalid_passenger_books_nobody(client, db):
+    passengers = [PASSENGER, {**PASSENGER, "dropping_point": "Satmatha"}]
+    response = client.post("/api/v1/bookings/bulk", json={"bookings": passengers})
+
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Booking 1:")
+    assert db.query(Booking).count() == 0
+
+
+def test_group_larger_than_the_seats_left_books_nobody(client, db):
+    client.post("/api/v1/bookings", json={**PASSENGER, "num_seats": 10})
+    passengers = [{**PASSENGER, "num_seats": 10}] * 3 + [{**PASSENGER, "num_seats": 1}]
+    response = client.post("/api/v1/bookings/bulk", json={"bookings": passengers})
+
+    assert response.status_code == 409
+    assert db.query(Booking).count() == 1
+    db.expire_all()
+    assert InventoryService().get_availability(db, *TRIP)["seats_available"] == settings.DEFAULT_TRIP_CAPACITY - 10
@@ -0,0 +1,54 @@
+"""Ranking of cache warmup queries from the curated file and the query log."""
+import json
+
+from app.core.config import settings
+from app.services.cache_warmup import load_warmup_queries
+
+
+def write_log(path, records):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records), encoding="utf-8")
+
+
+def chat(query, status=200):
+    return {"kind": "chat", "query": query, "status": status}
+
+
+def search(from_district, to_district, status=200):
+    return {"kind": "search", "params": {"from_district": from_district, "to_district": to_district}, "status": status}
+
+
+def test_curated_queries_first_then_log_by_frequency(tmp_path, monkeypatch):
+    queries_file = tmp_path / "warmup.txt"
+    queries_file.write_text("# curated\nbuses to sylhet\n\n", encoding="utf-8")
+    write_log(tmp_path / "queries.jsonl", [
+        search("Dhaka", "Bogura"),
+        chat("Cheapest  bus to Bogura"),
+        chat("cheapest bus to bogura"),
+        chat("cheapest bus to bogura"),
+        search("Dhaka", "Bogura", status=500),
+        chat("Buses to Sylhet"),
+    ])
+    write_log(tmp_path / "queries.jsonl.1", [search("Dhaka", "Bogura"), search("Dhaka", "Bogura")])
+    monkeypatch.setattr(settings, "WARMUP_QUERIES_FILE", str(queries_file))
+    monkeypatch.setattr(settings, "QUERY_LOG_DIR", str(tmp_path))
+
+    assert load_warmup_queries(10) == [
+        ("chat", "buses to sylhet"),
+        ("search", ("Dhaka", "Bogura")),
+        ("chat", "cheapest bus to bogura"),
+    ]
+    assert len(load_warmup_queries(2)) == 2
+
+
+def test_scrubbed_and_failed_queries_are_not_warmed(tmp_path, monkeypatch):
+    write_log(tmp_path / "queries.jsonl", [
+        chat("my name is <name>, book my seat"),
+        chat("call me on <phone>"),
+        chat("buses to sylhet", status=503),
+    ])
+    with (tmp_path / "queries.jsonl").open("a", encoding="utf-8") as f:
+        f.write("not json\n")
+    monkeypatch.setattr(settings, "WARMUP_QUERIES_FILE", None)
+    monkeypatch.setattr(settings, "QUERY_LOG_DIR", str(tmp_path))
+
+    assert load_warmup_queries(10) == []
@@ -0,0 +1,89 @@
+"""Response compression negotiation and fast JSON responses."""
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response
+from fastapi.testclient import TestClient
+
+from app.middleware import compression
+from app.middleware.compression import CompressionMiddleware, choose_encoding
+from app.schemas.bus import BusSearchResponse
+from app.utils.responses import json_response, model_response
+
+ROUTES = BusSearchResponse(routes=[], total_results=0).model_dump(mode="json")
+LARGE = {"routes": [{"provider": f"Provider {i}", "description": "operates on this route"} for i in range(100)]}
+
+
+@pytest.mark.parametrize("header, without_brotli, with_brotli", [
+    ("gzip, deflate, br", "gzip", "br"),
+    ("br;q=0, gzip", "gzip", "gzip"),
+    ("gzip;q=0", None, None),
+    ("*", "gzip", "gzip"),
+    ("identity", None, None),
+    ("", None, None),
+])
+def test_choose_encoding(monkeypatch, header, without_brotli, with_brotli):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert choose_encoding(header) == without_brotli
+    monkeypatch.setattr(compression, "brotli", object())
+    assert choose_encoding(header) == with_brotli
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    app = FastAPI()
+
+    @app.get("/large")
+    def large():
+        return json_response(LARGE)
+
+    @app.get("/small")
+    def small():
+        return model_response(BusSearchResponse(routes=[], total_results=0))
+
+    @app.get("/text")
+    def text():
+        return PlainTextResponse("x" * 4096, headers={"Vary": "Cookie"})
+
+    @app.get("/encoded")
+    def encoded():
+        body = gzip.compress(b"{}" * 2048)
+        return Response(body, media_type="application/json", headers={"Content-Encoding": "gzip"})
+
+    app.add_middleware(CompressionMiddleware, min_bytes=1024)
+    return TestClient(app)
+
+
+def test_large_json_is_gzipped(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    # The client decodes the body; the header still carries the compressed size
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert response.json() == LARGE
+
+
+def test_small_bodies_and_unsupported_clients_are_sent_as_is(client):
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    assert small.headers["vary"] == "Accept-Encoding"
+    assert small.json() == ROUTES
+
+    identity = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert identity.json() == LARGE
+
+
+def test_text_keeps_its_vary_header(client):
+    response = client.get("/text", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Cookie, Accept-Encoding"
+    assert response.text == "x" * 4096
+
+
+def test_already_encoded_responses_pass_through(client):
+    response = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == b"{}" * 2048
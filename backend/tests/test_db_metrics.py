@@ -0,0 +1,33 @@
+"""Connection pool and statement telemetry."""
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.core.db_metrics import InstrumentedQueuePool, _sql_operation, instrument_engine, pool_stats
+
+
+def test_sql_operation_labels():
+    assert _sql_operation("  select 1") == "select"
+    assert _sql_operation("WITH x AS (SELECT 1) SELECT * FROM x") == "with"
+    assert _sql_operation("PRAGMA foreign_keys") == "other"
+    assert _sql_operation("") == "other"
+
+
+def test_pool_checkouts_and_slow_statements_are_counted(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_MS", 0)
+    engine = create_engine(f"sqlite:///{tmp_path}/pool.db", poolclass=InstrumentedQueuePool, pool_size=2, max_overflow=0)
+    instrument_engine(engine)
+    before = pool_stats.snapshot()
+
+    with engine.connect() as first, engine.connect() as second:
+        during = pool_stats.snapshot()
+        first.execute(text("SELECT 1"))
+        second.execute(text("SELECT 2"))
+    after = pool_stats.snapshot()
+    engine.dispose()
+
+    assert during["checked_out"] == before["checked_out"] + 2
+    assert after["checked_out"] == before["checked_out"]
+    assert after["peak_checked_out"] >= before["checked_out"] + 2
+    assert after["checkouts"] >= before["checkouts"] + 2
+    # With a 0 ms threshold every statement is slow
+    assert after["statements"] - before["statements"] == after["slow_queries"] - before["slow_queries"] >= 2
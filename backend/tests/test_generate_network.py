@@ -0,0 +1,57 @@
+"""Synthetic network generation for scale testing."""
+import importlib.util
+import json
+from pathlib import Path
+
+from app.core.config import settings
+from app.services.pricing_service import PricingService
+
+SCRIPT = Path(__file__).parent.parent / "scripts" / "generate_network.py"
+spec = importlib.util.spec_from_file_location("generate_network", SCRIPT)
+generate_network = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(generate_network)
+
+
+def generate(output_dir, **kwargs):
+    options = dict(districts=70, providers=40, max_points=60, attachment_bytes=300, seed=7)
+    options.update(kwargs)
+    return generate_network.generate_network(output_dir, **options)
+
+
+def test_output_is_deterministic_per_seed(tmp_path):
+    first, second, other = tmp_path / "a", tmp_path / "b", tmp_path / "c"
+    assert generate(first) == generate(second)
+    generate(other, seed=8)
+
+    assert (first / "data.json").read_bytes() == (second / "data.json").read_bytes()
+    assert (first / "data.json").read_bytes() != (other / "data.json").read_bytes()
+
+
+def test_network_has_the_requested_shape(tmp_path):
+    stats = generate(tmp_path)
+    data = json.loads((tmp_path / "data.json").read_text(encoding="utf-8"))
+    districts = [d["name"] for d in data["districts"]]
+    providers = [p["name"] for p in data["bus_providers"]]
+
+    assert len(districts) == len(set(districts)) == stats["districts"] == 70
+    assert districts[0] == "Dhaka" and districts[-1] == "District 70"
+    assert len(providers) == len(set(providers)) == stats["providers"] == 40
+    assert len(list((tmp_path / "attachment").glob("*.txt"))) == 40
+    assert stats["dropping_points"] == sum(len(d["dropping_points"]) for d in data["districts"])
+    # Zipf popularity: the busiest district has the most dropping points
+    assert len(data["districts"][0]["dropping_points"]) == max(len(d["dropping_points"]) for d in data["districts"])
+    for provider in data["bus_providers"]:
+        assert set(provider["coverage_districts"]) <= set(districts)
+
+
+def test_generated_network_loads_into_the_pricing_index(tmp_path, monkeypatch):
+    generate(tmp_path)
+    monkeypatch.setattr(settings, "CONTEXT_DIR", str(tmp_path))
+    pricing = PricingService()
+    data = json.loads((tmp_path / "data.json").read_text(encoding="utf-8"))
+    provider = data["bus_providers"][0]
+    from_district, to_district = provider["coverage_districts"][:2]
+    cheapest = min(dp["price"] for dp in pricing.get_dropping_points(to_district))
+
+    assert pricing.is_route(provider["name"], from_district, to_district)
+    assert pricing.quote(provider["name"], from_district, to_district, None, 2) == 2 * cheapest
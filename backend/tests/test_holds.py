@@ -0,0 +1,78 @@
+"""Pending-booking holds: confirmation, expiry and the sweeper."""
+from datetime import date, datetime, timedelta
+
+from app.core.config import settings
+from app.models.booking import Booking, BookingStatus
+from app.services.hold_service import HoldService
+from app.services.inventory_service import InventoryService
+
+HOLD = {
+    "customer_name": "Rahim Uddin",
+    "customer_email": "rahim@example.com",
+    "customer_phone": "+8801712345678",
+    "from_district": "Dhaka",
+    "to_district": "Sylhet",
+    "provider": "Green Line",
+    "travel_date": "2025-02-01",
+    "num_seats": 3,
+}
+TRIP = ("Green Line", "Dhaka", "Sylhet", date(2025, 2, 1))
+
+
+def seats_left(db):
+    db.expire_all()
+    return InventoryService().get_availability(db, *TRIP)["seats_available"]
+
+
+def expire(db, booking_id):
+    db.query(Booking).filter(Booking.id == booking_id).update(
+        {"expires_at": datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db.commit()
+
+
+def test_hold_reserves_seats_until_confirmed(client, db):
+    hold = client.post("/api/v1/bookings/holds", json=HOLD).json()
+    assert hold["status"] == "pending"
+    assert hold["expires_at"] is not None
+    assert seats_left(db) == settings.DEFAULT_TRIP_CAPACITY - 3
+
+    confirmed = client.post(f"/api/v1/bookings/{hold['id']}/confirm")
+    assert confirmed.status_code == 200
+    assert confirmed.json()["status"] == "confirmed"
+    assert confirmed.json()["expires_at"] is None
+    assert client.post(f"/api/v1/bookings/{hold['id']}/confirm").status_code == 400
+
+
+def test_expired_hold_cannot_be_confirmed(client, db):
+    hold = client.post("/api/v1/bookings/holds", json=HOLD).json()
+    expire(db, hold["id"])
+    assert client.post(f"/api/v1/bookings/{hold['id']}/confirm").status_code == 409
+
+
+def test_sweeper_releases_only_expired_holds(client, db, booking_cache):
+    expired = [client.post("/api/v1/bookings/holds", json=HOLD).json()["id"] for _ in range(3)]
+    live = client.post("/api/v1/bookings/holds", json=HOLD).json()["id"]
+    for booking_id in expired:
+        expire(db, booking_id)
+    # Cached while still pending
+    assert client.get(f"/api/v1/bookings/{expired[0]}").json()["status"] == "pending"
+    assert seats_left(db) == settings.DEFAULT_TRIP_CAPACITY - 12
+
+    sweeper = HoldService()
+    sweeper.booking_cache = booking_cache
+    assert sweeper.release_expired(batch_size=2) == 3
+    assert sweeper.release_expired(batch_size=2) == 0
+
+    assert seats_left(db) == settings.DEFAULT_TRIP_CAPACITY - 3
+    statuses = {b.id: b.status for b in db.query(Booking)}
+    assert all(statuses[booking_id] == BookingStatus.CANCELLED for booking_id in expired)
+    assert statuses[live] == BookingStatus.PENDING
+    assert client.get(f"/api/v1/bookings/{expired[0]}").json()["status"] == "cancelled"
+
+
+def test_cancelling_a_hold_releases_its_seats_once(client, db):
+    hold = client.post("/api/v1/bookings/holds", json=HOLD).json()
+    assert client.delete(f"/api/v1/bookings/{hold['id']}").status_code == 200
+    assert client.delete(f"/api/v1/bookings/{hold['id']}").status_code == 400
+    assert seats_left(db) == settings.DEFAULT_TRIP_CAPACITY
@@ -0,0 +1,52 @@
+"""Idempotency-Key handling on booking creation."""
+from app.models.booking import Booking
+
+BOOKING = {
+    "customer_name": "Rahim Uddin",
+    "customer_email": "rahim@example.com",
+    "customer_phone": "+8801712345678",
+    "from_district": "Dhaka",
+    "to_district": "Sylhet",
+    "provider": "Green Line",
+    "travel_date": "2025-02-01",
+    "num_seats": 2,
+    "dropping_point": "Kadamtali",
+}
+
+
+def test_retry_with_the_same_key_replays_the_original_response(client, db):
+    headers = {"Idempotency-Key": "checkout-1"}
+    first = client.post("/api/v1/bookings", json=BOOKING, headers=headers)
+    retry = client.post("/api/v1/bookings", json=BOOKING, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert db.query(Booking).count() == 1
+
+
+def test_same_key_with_a_different_request_is_rejected(client, db):
+    headers = {"Idempotency-Key": "checkout-2"}
+    assert client.post("/api/v1/bookings", json=BOOKING, headers=headers).status_code == 201
+    conflict = client.post("/api/v1/bookings", json={**BOOKING, "num_seats": 3}, headers=headers)
+
+    assert conflict.status_code == 422
+    assert db.query(Booking).count() == 1
+
+
+def test_requests_without_a_key_are_not_deduplicated(client, db):
+    assert client.post("/api/v1/bookings", json=BOOKING).status_code == 201
+    assert client.post("/api/v1/bookings", json=BOOKING).status_code == 201
+    assert db.query(Booking).count() == 2
+
+
+def test_failed_request_does_not_consume_the_key(client, db):
+    headers = {"Idempotency-Key": "checkout-3"}
+    failed = client.post("/api/v1/bookings", json={**BOOKING, "provider": "Hanif"}, headers=headers)
+    assert failed.status_code == 400
+
+    # The rolled-back claim lets a corrected retry with a fresh body go through
+    retry = client.post("/api/v1/bookings", json=BOOKING, headers=headers)
+    assert retry.status_code == 201
+    assert db.query(Booking).count() == 1
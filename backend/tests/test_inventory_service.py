@@ -0,0 +1,93 @@
+"""Seat reservation and release against the trip inventory."""
+from datetime import date
+
+import pytest
+
+from app.core.config import settings
+from app.models.booking import Booking, BookingStatus
+from app.services.inventory_service import InventoryService, SeatsUnavailableError
+
+TRIP = ("Green Line", "Dhaka", "Sylhet", date(2025, 2, 1))
+
+
+def test_reserve_creates_trip_at_default_capacity(db):
+    inventory = InventoryService()
+    inventory.reserve_seats(db, *TRIP, 3)
+    db.commit()
+
+    availability = inventory.get_availability(db, *TRIP)
+    assert availability["capacity"] == settings.DEFAULT_TRIP_CAPACITY
+    assert availability["seats_available"] == settings.DEFAULT_TRIP_CAPACITY - 3
+
+
+def test_reserve_more_than_left_raises_and_keeps_seats(db):
+    inventory = InventoryService()
+    capacity = settings.DEFAULT_TRIP_CAPACITY
+    inventory.reserve_seats(db, *TRIP, capacity - 2)
+    db.commit()
+
+    with pytest.raises(SeatsUnavailableError):
+        inventory.reserve_seats(db, *TRIP, 3)
+    inventory.reserve_seats(db, *TRIP, 2)
+    db.commit()
+
+    assert inventory.get_availability(db, *TRIP)["seats_available"] == 0
+    with pytest.raises(SeatsUnavailableError):
+        inventory.reserve_seats(db, *TRIP, 1)
+
+
+def test_release_returns_seats(db):
+    inventory = InventoryService()
+    inventory.reserve_seats(db, *TRIP, 4)
+    inventory.release_seats(db, *TRIP, 3)
+    db.commit()
+
+    assert inventory.get_availability(db, *TRIP)["seats_available"] == settings.DEFAULT_TRIP_CAPACITY - 1
+
+
+def test_release_never_exceeds_capacity(db):
+    inventory = InventoryService()
+    inventory.reserve_seats(db, *TRIP, 2)
+    inventory.release_seats(db, *TRIP, 5)
+    db.commit()
+
+    availability = inventory.get_availability(db, *TRIP)
+    assert availability["seats_available"] == availability["capacity"]
+
+
+def test_trips_are_counted_separately(db):
+    inventory = InventoryService()
+    other_day = TRIP[:3] + (date(2025, 2, 2),)
+    inventory.reserve_seats(db, *TRIP, 5)
+    inventory.reserve_seats(db, *other_day, 1)
+    db.commit()
+
+    assert inventory.get_availability(db, *TRIP)["seats_available"] == settings.DEFAULT_TRIP_CAPACITY - 5
+    assert inventory.get_availability(db, *other_day)["seats_available"] == settings.DEFAULT_TRIP_CAPACITY - 1
+
+
+def test_new_trip_counts_existing_bookings(db):
+    inventory = InventoryService()
+    provider, from_district, to_district, travel_date = TRIP
+    for num_seats, booking_status in ((5, BookingStatus.CONFIRMED), (2, BookingStatus.PENDING), (9, BookingStatus.CANCELLED)):
+        db.add(Booking(
+            customer_name="Rahim Uddin",
+            customer_email="rahim@example.com",
+            customer_phone="+8801712345678",
+            provider=provider,
+            from_district=from_district,
+            to_district=to_district,
+            travel_date=travel_date,
+            num_seats=num_seats,
+            total_fare=750 * num_seats,
+            status=booking_status
+        ))
+    db.commit()
+
+    capacity = settings.DEFAULT_TRIP_CAPACITY
+    assert inventory.get_availability(db, *TRIP)["seats_available"] == capacity - 7
+    inventory.reserve_seats(db, *TRIP, 1)
+    db.commit()
+    assert inventory.get_availability(db, *TRIP)["seats_available"] == capacity - 8
+    with pytest.raises(SeatsUnavailableError):
+        inventory.reserve_seats(db, *TRIP, capacity - 7)
@@ -0,0 +1,200 @@
+"""Circuit breaker and LLM guard state changes, driven by the fake chat model."""
+import asyncio
+import time
+
+import pytest
+
+from app.services.fake_llm import FakeChatModel, FakeLLMError
+from app.services.llm_resilience import CircuitBreaker, LLMGuard, LLMUnavailableError
+
+
+def make_guard(threshold=2, reset=0.05, concurrency=1, call_timeout=1.0, queue_timeout=1.0):
+    return LLMGuard(
+        max_concurrency=concurrency,
+        call_timeout=call_timeout,
+        queue_timeout=queue_timeout,
+        breaker=CircuitBreaker(threshold, reset)
+    )
+
+
+def ask(model):
+    return lambda: model.ainvoke("Which buses go to Sylhet?")
+
+
+def test_breaker_opens_after_threshold_and_closes_after_successful_trial():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # Only one trial at a time
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_failed_trial_reopens_the_circuit():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.times_opened == 2
+    assert not breaker.allow()
+
+
+def test_guard_opens_on_fake_model_errors_and_recovers():
+    async def scenario():
+        guard = make_guard(threshold=2)
+        failing = FakeChatModel(latency_ms=0, error_rate=1.0)
+        for _ in range(2):
+            with pytest.raises(LLMUnavailableError) as failed:
+                await guard.call(ask(failing))
+            assert failed.value.reason == "error"
+            assert isinstance(failed.value.__cause__, FakeLLMError)
+        assert guard.breaker.state == CircuitBreaker.OPEN
+
+        with pytest.raises(LLMUnavailableError) as rejected:
+            await guard.call(ask(failing))
+        assert rejected.value.reason == "circuit_open"
+
+        await asyncio.sleep(0.06)
+        healthy = FakeChatModel(latency_ms=0, error_rate=0.0)
+        await guard.call(ask(healthy))
+        assert guard.breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_slow_fake_model_times_out_and_counts_as_failure():
+    async def scenario():
+        guard = make_guard(threshold=1, call_timeout=0.05)
+        slow = FakeChatModel(latency_ms=500)
+        with pytest.raises(LLMUnavailableError) as timed_out:
+            await guard.call(ask(slow))
+        assert timed_out.value.reason == "timeout"
+        assert guard.breaker.state == CircuitBreaker.OPEN
+        assert guard.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_trial_call_releases_the_trial():
+    async def scenario():
+        guard = make_guard(threshold=1)
+        guard.breaker.record_failure()
+        await asyncio.sleep(0.06)
+
+        # The half-open trial is cancelled mid-call, as an agent timeout or a disconnect would
+        slow = FakeChatModel(latency_ms=500)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(guard.call(ask(slow)), 0.05)
+        assert guard.breaker.state == CircuitBreaker.HALF_OPEN
+        assert guard.in_flight == 0
+
+        # A new trial is allowed and closes the circuit
+        await guard.call(ask(FakeChatModel(latency_ms=0)))
+        assert guard.breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_trial_cancelled_while_queued_for_a_slot_releases_the_trial():
+    async def scenario():
+        guard = make_guard(threshold=1, concurrency=1)
+        # Occupy the only slot with a call that started while the circuit was closed
+        running = asyncio.create_task(guard.call(ask(FakeChatModel(latency_ms=300))))
+        await asyncio.sleep(0.01)
+
+        guard.breaker.record_failure()
+        await asyncio.sleep(0.06)
+        queued = asyncio.create_task(guard.call(ask(FakeChatModel(latency_ms=0))))
+        await asyncio.sleep(0.01)
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+        assert guard.breaker.allow()
+        guard.breaker.release_trial()
+        await running
+
+    asyncio.run(scenario())
+
+
+def test_saturated_guard_rejects_after_queue_timeout():
+    async def scenario():
+        guard = make_guard(concurrency=1, queue_timeout=0.05)
+        running = asyncio.create_task(guard.call(ask(FakeChatModel(latency_ms=200))))
+        await asyncio.sleep(0.01)
+        with pytest.raises(LLMUnavailableError) as saturated:
+            await guard.call(ask(FakeChatModel(latency_ms=0)))
+        assert saturated.value.reason == "saturated"
+        await running
+
+    asyncio.run(scenario())
+
+
+def test_provider_errors_get_the_retrieval_only_fallback(monkeypatch):
+    from app.services import rag_service as rag_module
+    from app.services.cache import LRUCacheBackend, RAGCache
+
+    documents = [{
+        "page_content": "Green Line runs Dhaka to Sylhet",
+        "metadata": {"type": "route", "provider": "Green Line", "from": "Dhaka", "to": "Sylhet",
+                     "min_price": 700, "max_price": 900},
+    }]
+
+    class OfflineRAGService(rag_module.RAGService):
+        def _initialize_embeddings(self):
+            return None
+
+        def _initialize_vector_store(self):
+            return None
+
+        def _initialize_llm(self):
+            return FakeChatModel(latency_ms=0, error_rate=1.0)
+
+        def _search(self, query, k):
+            return documents
+
+    monkeypatch.setattr(rag_module, "get_llm_guard", lambda: make_guard(threshold=5))
+    monkeypatch.setattr(rag_module, "get_rag_cache", lambda: RAGCache(LRUCacheBackend(100), ttl=60))
+    service = OfflineRAGService()
+
+    # Below the breaker threshold, so the failure is the provider's, not an open circuit
+    result = asyncio.run(service.get_answer("Which buses go to Sylhet?"))
+    assert result["degraded"] is True
+    assert "Green Line: Dhaka to Sylhet" in result["answer"]
+    assert service.llm_guard.breaker.state == CircuitBreaker.CLOSED
+    assert service.llm_guard.breaker.failures == 1
+
+
+def test_waiter_cancelled_as_its_slot_frees_up_gives_the_slot_back():
+    async def scenario():
+        guard = make_guard(concurrency=1)
+        await guard._semaphore.acquire()
+        queued = asyncio.create_task(guard.call(ask(FakeChatModel(latency_ms=0))))
+        await asyncio.sleep(0.01)
+
+        # The slot is handed to the waiter and the waiter is cancelled in the same loop turn
+        guard._semaphore.release()
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        await asyncio.sleep(0)
+
+        # The full cap is available again
+        await asyncio.wait_for(guard._semaphore.acquire(), 0.1)
+        assert guard._semaphore.locked()
+        guard._semaphore.release()
+        assert guard.in_flight == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,53 @@
+"""Queue-based logging: bounded enqueue, record preparation and sampling."""
+import json
+import logging
+import queue
+import sys
+
+from app.core.logging import BoundedQueueHandler, JsonFormatter, SamplingFilter
+
+
+def make_record(level=logging.INFO, name="app.services.bus_service", msg="searched %s", args=("Dhaka",), exc_info=None):
+    return logging.LogRecord(name, level, "bus_service.py", 10, msg, args, exc_info)
+
+
+def test_full_queue_drops_records_and_reports_them_later():
+    log_queue = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(log_queue)
+    for _ in range(5):
+        handler.emit(make_record())
+    assert handler.dropped == 3
+
+    log_queue.get_nowait()
+    log_queue.get_nowait()
+    handler.emit(make_record(msg="next", args=()))
+    notice = log_queue.get_nowait()
+    assert notice.levelno == logging.WARNING
+    assert "dropped 3 log records" in notice.getMessage()
+    assert log_queue.get_nowait().getMessage() == "next"
+
+
+def test_prepared_record_keeps_the_traceback_for_the_json_formatter():
+    try:
+        raise RuntimeError("database is down")
+    except RuntimeError:
+        record = make_record(level=logging.ERROR, msg="failed for %s", exc_info=sys.exc_info())
+
+    prepared = BoundedQueueHandler(queue.Queue()).prepare(record)
+    assert prepared.exc_info is None
+    assert prepared.args is None
+
+    entry = json.loads(JsonFormatter().format(prepared))
+    assert entry["message"] == "failed for Dhaka"
+    assert "RuntimeError: database is down" in entry["exception"]
+    assert "Traceback" not in entry["message"]
+    # The caller's record is left untouched
+    assert record.exc_info is not None
+
+
+def test_sampling_only_thins_out_low_levels_of_configured_sources():
+    sampler = SamplingFilter({"app.services": 0.0})
+    assert not sampler.filter(make_record())
+    assert sampler.filter(make_record(level=logging.WARNING))
+    assert sampler.filter(make_record(name="app.api.endpoints.bookings"))
+    assert sampler.sampled_out == 1
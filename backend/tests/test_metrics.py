@@ -0,0 +1,60 @@
+"""Metrics registry exposition and per-route request metrics."""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.metrics import Counter, Histogram, MetricsRegistry, http_requests_total
+from app.middleware.metrics import MetricsMiddleware
+
+
+def test_counter_and_histogram_render_in_text_format():
+    registry = MetricsRegistry()
+    requests = registry.register(Counter("requests_total", "Requests", ("route",)))
+    latency = registry.register(Histogram("latency_seconds", "Latency", buckets=(0.1, 1.0)))
+    requests.inc(route="/a")
+    requests.inc(2, route='/b"quoted"')
+    for value in (0.05, 0.5, 0.5, 5.0):
+        latency.observe(value)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE requests_total counter" in lines
+    assert 'requests_total{route="/a"} 1' in lines
+    assert 'requests_total{route="/b\\"quoted\\""} 2' in lines
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="1"} 3' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+    assert "latency_seconds_sum 6.05" in lines
+    assert "latency_seconds_count 4" in lines
+
+
+def test_broken_collector_does_not_break_the_scrape():
+    registry = MetricsRegistry()
+    registry.register(Counter("ok_total", "Still rendered")).inc()
+    registry.register_collector(lambda: 1 / 0)
+    registry.register_collector(lambda: [("queue_depth", "gauge", "Depth", [({}, 3)])])
+
+    lines = registry.render().splitlines()
+    assert "ok_total 1" in lines
+    assert "queue_depth 3" in lines
+
+
+def test_requests_are_labelled_with_the_route_template():
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def item(item_id: int):
+        return {"id": item_id}
+
+    app.add_middleware(MetricsMiddleware)
+    client = TestClient(app)
+
+    def count(route, status):
+        samples = http_requests_total.collect()[0][3]
+        return sum(value for labels, value in samples if labels["route"] == route and labels["status"] == status)
+
+    before_item, before_unmatched = count("/items/{item_id}", "200"), count("unmatched", "404")
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/nowhere")
+    assert count("/items/{item_id}", "200") == before_item + 2
+    assert count("unmatched", "404") == before_unmatched + 1
@@ -0,0 +1,58 @@
+"""Route occupancy aggregates kept in step with booking writes."""
+from datetime import date
+
+from app.services.occupancy_service import OccupancyService
+
+BOOKING = {
+    "customer_name": "Rahim Uddin",
+    "customer_email": "rahim@example.com",
+    "customer_phone": "+8801712345678",
+    "from_district": "Dhaka",
+    "to_district": "Sylhet",
+    "provider": "Green Line",
+    "travel_date": "2025-02-01",
+    "num_seats": 2,
+    "dropping_point": "Kadamtali",
+}
+
+
+def snapshot(db):
+    db.expire_all()
+    return {
+        (row.provider, row.from_district, row.to_district, row.travel_date): (row.seats_sold, row.bookings_count, row.revenue)
+        for row in OccupancyService().get_occupancy(db)
+    }
+
+
+def test_booking_lifecycle_keeps_aggregates_equal_to_a_rebuild(client, db):
+    confirmed = client.post("/api/v1/bookings", json=BOOKING).json()
+    client.post("/api/v1/bookings/bulk", json={"bookings": [
+        {**BOOKING, "num_seats": 1},
+        {**BOOKING, "to_district": "Bogura", "provider": "Hanif", "dropping_point": "Satmatha"},
+    ]})
+    confirmed_hold = client.post("/api/v1/bookings/holds", json=BOOKING).json()
+    client.post(f"/api/v1/bookings/{confirmed_hold['id']}/confirm")
+    cancelled_hold = client.post("/api/v1/bookings/holds", json=BOOKING).json()
+    client.delete(f"/api/v1/bookings/{cancelled_hold['id']}")
+    client.delete(f"/api/v1/bookings/{confirmed['id']}")
+    # Cancelling twice must not subtract twice
+    client.delete(f"/api/v1/bookings/{confirmed['id']}")
+
+    incremental = snapshot(db)
+    # The bulk passenger and the confirmed hold remain on the Sylhet trip
+    assert incremental[("Green Line", "Dhaka", "Sylhet", date(2025, 2, 1))] == (3, 2, 2250)
+
+    OccupancyService().rebuild(db)
+    assert snapshot(db) == incremental
+
+
+def test_revenue_by_provider_sums_trips(client, db):
+    client.post("/api/v1/bookings", json=BOOKING)
+    client.post("/api/v1/bookings", json={**BOOKING, "travel_date": "2025-02-02", "num_seats": 1})
+    client.post("/api/v1/bookings", json={**BOOKING, "to_district": "Bogura", "provider": "Hanif", "dropping_point": "Satmatha"})
+
+    revenue = OccupancyService().get_revenue_by_provider(db)
+    assert revenue == [
+        {"provider": "Green Line", "seats_sold": 3, "bookings_count": 2, "revenue": 2250},
+        {"provider": "Hanif", "seats_sold": 2, "bookings_count": 1, "revenue": 1200},
+    ]
@@ -0,0 +1,61 @@
+"""ONNX embedding backend: model selection, pooling and normalization."""
+import numpy as np
+import pytest
+
+from app.services.embeddings import create_embeddings
+
+tokenizers = pytest.importorskip("tokenizers")
+pytest.importorskip("onnxruntime")
+
+from app.services.onnx_embeddings import OnnxEmbeddings  # noqa: E402
+
+VOCAB = {"[PAD]": 0, "[UNK]": 1, "bus": 2, "to": 3, "sylhet": 4}
+
+
+class TokenSession:
+    """Stands in for the transformer: token id i becomes the vector (i, 1)."""
+
+    def run(self, outputs, feeds):
+        ids = feeds["input_ids"].astype(np.float32)
+        return [np.stack([ids, np.ones_like(ids)], axis=-1)]
+
+
+def word_level_embeddings(batch_size=32):
+    tokenizer = tokenizers.Tokenizer(tokenizers.models.WordLevel(VOCAB, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = tokenizers.pre_tokenizers.Whitespace()
+    tokenizer.enable_padding(pad_id=0, pad_token="[PAD]")
+    embeddings = OnnxEmbeddings.__new__(OnnxEmbeddings)
+    embeddings.tokenizer = tokenizer
+    embeddings.session = TokenSession()
+    embeddings.input_names = {"input_ids", "attention_mask"}
+    embeddings.batch_size = batch_size
+    return embeddings
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="Unknown EMBEDDING_BACKEND 'tensorflow'"):
+        create_embeddings("tensorflow")
+
+
+def test_missing_export_points_at_the_export_script(tmp_path):
+    with pytest.raises(FileNotFoundError, match="export_onnx_embeddings.py"):
+        OnnxEmbeddings(str(tmp_path))
+
+
+def test_mean_pools_real_tokens_and_normalizes():
+    embeddings = word_level_embeddings()
+    query = np.array(embeddings.embed_query("bus to"))
+
+    # Mean of (2, 1) and (3, 1), then unit length
+    expected = np.array([2.5, 1.0]) / np.linalg.norm([2.5, 1.0])
+    assert np.allclose(query, expected)
+
+
+def test_padding_does_not_change_a_document_vector():
+    embeddings = word_level_embeddings(batch_size=2)
+    documents = embeddings.embed_documents(["sylhet", "bus to sylhet", "bus"])
+
+    assert len(documents) == 3
+    assert np.allclose(documents[0], embeddings.embed_query("sylhet"))
+    assert np.allclose(documents[2], embeddings.embed_query("bus"))
+    assert np.allclose(np.linalg.norm(documents, axis=1), 1.0)
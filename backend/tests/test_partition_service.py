@@ -0,0 +1,31 @@
+"""Monthly bookings partitions: window arithmetic and non-PostgreSQL behaviour."""
+from datetime import date
+
+import pytest
+
+from app.services.partition_service import PARTITION_NAME, PartitionService, add_months
+
+
+@pytest.mark.parametrize("day, months, expected", [
+    (date(2025, 1, 31), 0, date(2025, 1, 1)),
+    (date(2025, 1, 31), 1, date(2025, 2, 1)),
+    (date(2025, 11, 15), 3, date(2026, 2, 1)),
+    (date(2025, 3, 1), -3, date(2024, 12, 1)),
+    (date(2025, 3, 1), -15, date(2023, 12, 1)),
+])
+def test_add_months(day, months, expected):
+    assert add_months(day, months) == expected
+
+
+def test_partition_names_parse_to_their_month():
+    match = PARTITION_NAME.match("bookings_p2025_02")
+    assert (int(match.group(1)), int(match.group(2))) == (2025, 2)
+    assert PARTITION_NAME.match("bookings_default") is None
+    assert PARTITION_NAME.match("bookings_unpartitioned") is None
+
+
+def test_maintenance_is_a_no_op_without_postgresql():
+    service = PartitionService()
+    assert not service.is_supported()
+    assert service.ensure_partitions(3) == []
+    assert service.apply_retention(12, "drop") == []
@@ -0,0 +1,42 @@
+"""Route validation and fares from the in-memory pricing index."""
+import json
+import os
+
+import pytest
+
+from app.services.pricing_service import InvalidRouteError, PricingService
+from tests.conftest import NETWORK
+
+
+def test_quote_uses_the_dropping_point_fare(pricing):
+    assert pricing.quote("Green Line", "Dhaka", "Sylhet", "Kadamtali", 3) == 2250
+
+
+def test_quote_without_dropping_point_uses_the_cheapest(pricing):
+    assert pricing.quote("Green Line", "Dhaka", "Sylhet", None, 2) == 1400
+
+
+@pytest.mark.parametrize("provider, from_district, to_district, dropping_point", [
+    ("Shohagh", "Dhaka", "Sylhet", None),
+    ("Green Line", "Rangpur", "Sylhet", None),
+    ("Green Line", "Dhaka", "Bogura", None),
+    ("Green Line", "Sylhet", "Sylhet", None),
+    ("Green Line", "Dhaka", "Sylhet", "Satmatha"),
+])
+def test_routes_not_offered_are_rejected(pricing, provider, from_district, to_district, dropping_point):
+    with pytest.raises(InvalidRouteError):
+        pricing.quote(provider, from_district, to_district, dropping_point, 1)
+
+
+def test_index_reloads_when_data_changes(pricing, tmp_path):
+    data = json.loads(json.dumps(NETWORK))
+    data["districts"][1]["dropping_points"][0]["price"] = 800
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+    # Changes are only picked up after the check interval
+    assert pricing.get_fare("Green Line", "Sylhet", "Kadamtali") == 750
+    pricing._last_check -= PricingService.RELOAD_CHECK_INTERVAL
+    assert pricing.get_fare("Green Line", "Sylhet", "Kadamtali") == 800
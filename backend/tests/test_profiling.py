@@ -0,0 +1,61 @@
+"""Sampling profiler and the opt-in per-request profiling middleware."""
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.middleware.profiling import ProfilingMiddleware
+from app.utils.profiler import SamplingProfiler
+
+
+def busy_loop(seconds):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += 1
+    return total
+
+
+def test_profiler_samples_busy_threads_and_skips_parked_ones(tmp_path):
+    parked = threading.Event()
+    waiter = threading.Thread(target=parked.wait, name="parked-thread", daemon=True)
+    waiter.start()
+
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    busy_loop(0.1)
+    profiler.stop()
+    parked.set()
+
+    assert profiler.sample_count > 0
+    assert any("busy_loop (test_profiling.py" in stack for stack in profiler.samples)
+    assert not any(stack.startswith("parked-thread") for stack in profiler.samples)
+
+    path = tmp_path / "profile.collapsed"
+    profiler.write_collapsed(str(path))
+    stack, count = path.read_text(encoding="utf-8").splitlines()[0].rsplit(" ", 1)
+    assert int(count) >= 1
+
+
+def test_only_requests_with_the_token_are_profiled(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_TOKEN", "secret")
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+    app = FastAPI()
+
+    @app.get("/work/{n}")
+    def work(n: int):
+        return {"total": busy_loop(n / 1000)}
+
+    app.add_middleware(ProfilingMiddleware)
+    client = TestClient(app)
+
+    assert "x-profile-file" not in client.get("/work/1").headers
+    assert "x-profile-file" not in client.get("/work/1", headers={"X-Profile": "wrong"}).headers
+
+    profiled = client.get("/work/50", headers={"X-Profile": "secret"})
+    name = profiled.headers["x-profile-file"]
+    assert "GET_work_n" in name
+    assert (tmp_path / name).exists()
+    assert "x-profile-file" in client.get("/work/1", params={"__profile": "secret"}).headers
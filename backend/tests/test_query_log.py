@@ -0,0 +1,52 @@
+"""Query log scrubbing and sampled JSON lines records."""
+import json
+import time
+
+import pytest
+
+from app.core.query_log import QueryLog, scrub
+from app.utils.jsonl import JsonlWriter
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("my name is rahim karim", "my name is <name>"),
+    ("My name is Rahim Uddin, I need a bus to Sylhet", "My name is <name>, I need a bus to Sylhet"),
+    ("This is Rahim Uddin. Any buses tomorrow?", "This is <name>. Any buses tomorrow?"),
+    ("hi im rahim", "hi im <name>"),
+    ("I'm Karim from Bogura!", "I'm <name>!"),
+    ("Myself Rahim, want to cancel", "Myself <name>, want to cancel"),
+    ("call me at 01712345678", "call me <name>"),
+])
+def test_self_introductions_are_dropped_regardless_of_case(text, expected):
+    assert scrub(text) == expected
+
+
+def test_contact_details_are_replaced_but_dates_kept():
+    text = "Booking for rahim@example.com, phone +8801712 345678, card 4111 1111 1111 1111 on 2025-02-01"
+    assert scrub(text) == "Booking for <email>, phone <phone>, card <number> on 2025-02-01"
+
+
+def test_questions_without_personal_data_are_kept():
+    text = "Which buses go from Dhaka to Sylhet under 800 taka?"
+    assert scrub(text) == text
+
+
+def test_record_writes_a_scrubbed_line(tmp_path):
+    path = tmp_path / "queries.jsonl"
+    writer = JsonlWriter(str(path))
+    log = QueryLog(enabled=True, sample_rate=1.0, writer=writer)
+    log.record("chat", time.time(), 200, query="my name is rahim karim", answer_chars=42)
+    writer.close()
+
+    record = json.loads(path.read_text(encoding="utf-8"))
+    assert record["kind"] == "chat"
+    assert record["query"] == "my name is <name>"
+    assert record["answer_chars"] == 42
+
+
+def test_disabled_log_records_nothing(tmp_path):
+    path = tmp_path / "queries.jsonl"
+    writer = JsonlWriter(str(path))
+    QueryLog(enabled=False, sample_rate=1.0, writer=writer).record("chat", time.time(), 200, query="hello")
+    writer.close()
+    assert not path.exists()
@@ -0,0 +1,27 @@
+"""Routers and subsystems loaded by each serving role."""
+import pytest
+
+from app.core.roles import ROLE_ROUTERS, role_needs_rag, role_routers, role_runs_booking_jobs, validate_role
+
+
+def test_all_serves_every_router_of_the_split_roles():
+    split_routers = {name for role, routers in ROLE_ROUTERS.items() if role != "all" for name in routers}
+    assert set(role_routers("all")) == split_routers
+
+
+def test_bookings_role_skips_the_rag_stack_but_owns_the_jobs():
+    assert role_routers("bookings") == ("bookings", "analytics")
+    assert not role_needs_rag("bookings")
+    assert role_runs_booking_jobs("bookings")
+
+
+@pytest.mark.parametrize("role", ["chat", "catalog"])
+def test_rag_roles_do_not_run_booking_jobs(role):
+    assert role_needs_rag(role)
+    assert not role_runs_booking_jobs(role)
+
+
+def test_unknown_role_is_rejected():
+    assert validate_role("chat") == "chat"
+    with pytest.raises(ValueError, match="Unknown SERVICE_ROLE 'booking'"):
+        role_routers("booking")
@@ -0,0 +1,60 @@
+"""Local tracing: nested spans, sampling and the JSONL export."""
+import json
+import time
+
+import pytest
+
+from app.core.tracing import Tracer
+from app.utils.jsonl import JsonlWriter
+
+
+def make_tracer(tmp_path, sample_rate=1.0, slow_ms=0.0):
+    writer = JsonlWriter(str(tmp_path / "traces.jsonl"))
+    return Tracer(enabled=True, sample_rate=sample_rate, slow_ms=slow_ms, writer=writer), writer
+
+
+def read_traces(tmp_path, writer):
+    writer.close()
+    path = tmp_path / "traces.jsonl"
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_nested_spans_are_exported_with_their_parents(tmp_path):
+    tracer, writer = make_tracer(tmp_path)
+    with tracer.span("http.request", root=True, path="/api/v1/chat") as root:
+        with tracer.span("rag.retrieve") as child:
+            db = tracer.start_span("db.query", operation="select")
+            tracer.finish_span(db)
+        root.set_attribute("status", 200)
+    # No trace is open here, so nothing is recorded
+    assert tracer.start_span("db.query") is None
+
+    [trace] = read_traces(tmp_path, writer)
+    spans = {s["name"]: s for s in trace["spans"]}
+    assert trace["name"] == "http.request"
+    assert spans["http.request"]["attributes"] == {"path": "/api/v1/chat", "status": 200}
+    assert spans["rag.retrieve"]["parent_id"] == root.span_id
+    assert spans["db.query"]["parent_id"] == child.span_id
+
+
+def test_errors_are_recorded_on_the_span(tmp_path):
+    tracer, writer = make_tracer(tmp_path)
+    with pytest.raises(ValueError):
+        with tracer.span("http.request", root=True):
+            raise ValueError("bad input")
+
+    [trace] = read_traces(tmp_path, writer)
+    assert trace["error"] == "ValueError: bad input"
+
+
+def test_slow_traces_are_kept_even_when_not_sampled(tmp_path):
+    tracer, writer = make_tracer(tmp_path, sample_rate=0.0, slow_ms=20)
+    with tracer.span("fast", root=True):
+        pass
+    with tracer.span("slow", root=True):
+        time.sleep(0.03)
+
+    assert [trace["name"] for trace in read_traces(tmp_path, writer)] == ["slow"]
+    assert tracer.stats()["traces_discarded"] == 1
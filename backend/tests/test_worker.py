@@ -0,0 +1,10 @@
+"""Once-per-deployment job ownership across pre-forked workers."""
+import pytest
+
+from app.core import worker
+
+
+@pytest.mark.parametrize("worker_id, primary", [(None, True), (0, True), (1, False), (3, False)])
+def test_only_worker_zero_or_a_single_process_is_primary(monkeypatch, worker_id, primary):
+    monkeypatch.setattr(worker, "current_worker_id", worker_id)
+    assert worker.is_primary_worker() is primary
@@ -98,9 +98,12 @@ export interface Booking {
 export interface BookingListParams {
   customer_email?: string;
   customer_phone?: string;
+  limit?: number;
+  cursor?: string;
 }
 
 export interface BookingListResponse {
   bookings: Booking[];
-  total_bookings: number;
+  total_bookings: number; // Number of bookings in this page
+  next_cursor?: string | null;
 }